@@ -2,55 +2,32 @@
 # app_savate.py
 # Dashboard Luc Léger (club) - Streamlit
 # Lancer : streamlit run app_savate.py
+# Interface seulement : barème, textes, fiche PDF et stockage sont dans le paquet cbf_luc_leger.
 
 from __future__ import annotations
 
-import base64
 import os
+import time
 import uuid
-from dataclasses import dataclass, asdict
 from datetime import date, datetime
-from io import BytesIO
-from typing import Dict, List
+from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 
-# PDF (ReportLab)
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
+from cbf_luc_leger import Athlete, AthleteDataset, AthleteRepository
+from cbf_luc_leger.baremes import DEFAULT_DIR, Bareme, BaremeStore
+from cbf_luc_leger.export import export_file, fiche_fields
+from cbf_luc_leger.importer import TEMPLATE_CSV, import_results
+from cbf_luc_leger.metrics import MetricsExporter, MetricsRegistry, RerunProfile
+from cbf_luc_leger.pdfcache import FicheCache
+from cbf_luc_leger.render import FAILED, RenderService
+from cbf_luc_leger.tabular import EXPORT_COLUMNS, TABLE_FORMATS, table_bytes
 
 
 # -----------------------------
-# Barème club (pédagogique)
+# Niveaux (couleurs)
 # -----------------------------
-BAREME: Dict[str, Dict[str, Dict[int, str]]] = {
-    "M": {
-        "15-19": {7: "Faible", 8: "Moyen-", 9: "Moyen", 10: "Moyen+", 11: "Bon", 12: "Tres bon", 13: "Excellent", 14: "Elite", 15: "Elite+"},
-        "20-24": {7: "Faible", 8: "Moyen-", 9: "Moyen", 10: "Bon", 11: "Tres bon", 12: "Excellent", 13: "Elite", 14: "Elite+", 15: "Elite+"},
-        "25-29": {7: "Faible", 8: "Moyen", 9: "Moyen+", 10: "Bon", 11: "Tres bon", 12: "Excellent", 13: "Elite", 14: "Elite+", 15: "Elite+"},
-        "30-34": {7: "Faible", 8: "Moyen", 9: "Bon", 10: "Tres bon", 11: "Excellent", 12: "Elite", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "35-39": {7: "Faible", 8: "Moyen+", 9: "Bon", 10: "Tres bon", 11: "Excellent", 12: "Elite", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "40-44": {7: "Moyen-", 8: "Moyen+", 9: "Bon", 10: "Tres bon", 11: "Excellent", 12: "Elite", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "45-49": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "50-54": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "55-60": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-    },
-    "F": {
-        "15-19": {7: "Moyen-", 8: "Moyen", 9: "Bon", 10: "Tres bon", 11: "Excellent", 12: "Elite", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "20-24": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "25-29": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "30-34": {7: "Moyen+", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "35-39": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "40-44": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "45-49": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "50-54": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-        "55-60": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
-    },
-}
-
 LEVEL5_COLORS = {
     "Insuffisant": "#fee2e2",
     "Moyen": "#ffedd5",
@@ -60,294 +37,75 @@ LEVEL5_COLORS = {
 }
 
 
-def clamp(n: int, lo: int, hi: int) -> int:
-    return max(lo, min(hi, n))
+# Tri de la liste : libelle -> cle de AthleteDataset.page (None = ordre de saisie).
+SORT_OPTIONS = {
+    "Saisie": None,
+    "Date du test": "date",
+    "Nom": "nom",
+    "Palier": "palier",
+    "Niveau": "niveau",
+}
+PAGE_SIZES = [25, 50, 100, 200]
+EXPORT_FORMATS = {"csv": "CSV (tableur)", "parquet": "Parquet (typé, compressé)", "arrow": "Arrow IPC (typé, compressé)"}
 
+# Intervalle de verification des saisies des autres coachs (secondes).
+SYNC_SECONDS = float(os.environ.get("CBF_SYNC_SECONDS", "5"))
 
-def age_band(age: int) -> str:
-    a = clamp(age, 15, 60)
-    start = ((a - 15) // 5) * 5 + 15
-    end = start + 4
-    return f"{start}-{end}"
+# Profilage : panneau de debug avec CBF_PROFILE=1 ou ?debug=1 ; latences exportees
+# dans CBF_METRICS_PATH (.json, ou .prom pour Prometheus) si la variable est definie.
+METRICS_PATH = os.environ.get("CBF_METRICS_PATH")
+METRICS_INTERVAL = float(os.environ.get("CBF_METRICS_INTERVAL", "30"))
+LIST_COLUMNS = {"nom": "Nom", "prenom": "Prénom", "age": "Âge", "sexe": "Sexe", "palier": "Palier", "delta_palier": "Δ Palier", "niveau": "Niveau", "centile": "Centile", "vma": "VMA (km/h)", "vo2max": "VO2max", "date_saisie": "Date de saisie"}
 
+# Fiches PDF rendues en arriere-plan : rendus simultanes au plus (threads, ou processus
+# avec CBF_RENDER_PROCESSES=1) et attente maximale avant de relancer le fragment de la fiche (secondes).
+RENDER_WORKERS = int(os.environ.get("CBF_RENDER_WORKERS", "2"))
+RENDER_PROCESSES = os.environ.get("CBF_RENDER_PROCESSES") == "1"
+RENDER_POLL_SECONDS = float(os.environ.get("CBF_RENDER_POLL_SECONDS", "0.5"))
 
-def level_raw(sex: str, age: int, palier: int) -> str:
-    sex = "M" if sex == "M" else "F"
-    band = age_band(age)
-    p = clamp(palier, 7, 15)
-    return BAREME.get(sex, {}).get(band, {}).get(p, "-")
 
+# -----------------------------
+# Stockage
+# -----------------------------
+@st.cache_resource
+def get_repository() -> AthleteRepository:
+    return AthleteRepository(os.environ.get("CBF_DB_PATH", "cbf_luc_leger.db"))
 
-def to_level5(raw: str) -> str:
-    if raw == "Faible":
-        return "Insuffisant"
-    if raw in ("Moyen-", "Moyen", "Moyen+"):
-        return "Moyen"
-    if raw == "Bon":
-        return "Bon"
-    if raw == "Tres bon":
-        return "Très Bon"
-    if raw in ("Excellent", "Elite", "Elite+"):
-        return "Excellent"
-    return "-"
 
+@st.cache_resource
+def get_dataset() -> AthleteDataset:
+    return AthleteDataset(get_repository())
 
-def level_for(sex: str, age: int, palier: int) -> str:
-    return to_level5(level_raw(sex, age, palier))
 
+@st.cache_resource
+def get_bareme_store() -> BaremeStore:
+    return BaremeStore(os.environ.get("CBF_BAREMES_DIR", DEFAULT_DIR))
 
-# -----------------------------
-# Analyse (textes)
-# -----------------------------
-def interpret_for_assaut(level5: str) -> Dict[str, str]:
-    if level5 == "Insuffisant":
-        return {
-            "Synthese": "Endurance insuffisante pour soutenir plusieurs reprises a intensite assaut.",
-            "Point de vigilance": "Baisse rapide de lucidite (distance, garde) des la 1re-2e reprise.",
-            "Priorite de travail": "Construire une base aerobie et stabiliser la technique a faible intensite.",
-        }
-    if level5 == "Moyen":
-        return {
-            "Synthese": "Base cardio correcte pour l'entrainement, limite sur des assauts enchaines.",
-            "Point de vigilance": "Degradation en fin de reprise: deplacements moins frequents, relances plus rares.",
-            "Priorite de travail": "Developper l'intermittent et la tolerance aux changements de rythme.",
-        }
-    if level5 == "Bon":
-        return {
-            "Synthese": "Bon niveau pour l'assaut: volume de travail stable et capacite a relancer.",
-            "Point de vigilance": "Risque principal: surcharge si recuperation et progressivite sont negligees.",
-            "Priorite de travail": "Specifique savate (intermittent + déplacements + relances structurées).",
-        }
-    if level5 == "Très Bon":
-        return {
-            "Synthese": "Très bon moteur: enchainement de reprises et relances frequentes possibles.",
-            "Point de vigilance": "Risque: partir trop vite (sur-regime) plutot qu'une limite cardio.",
-            "Priorite de travail": "Affutage, qualite des relances, lactique court en controle, tactique.",
-        }
-    if level5 == "Excellent":
-        return {
-            "Synthese": "Excellent moteur cardio: pression et repetition d'efforts a haute frequence possibles.",
-            "Point de vigilance": "Risque: surcharge (tendons, mollets) si volumes et intensites mal pilotes.",
-            "Priorite de travail": "Qualite > volume, spécificité assaut, récupération premium.",
-        }
-    return {"Synthese": "Niveau non determine.", "Point de vigilance": "-", "Priorite de travail": "-"}
-
-
-def age_specific_notes(age: int) -> Dict[str, str]:
-    if age <= 19:
-        return {
-            "Titre": "Spécificité 15-19 ans",
-            "Note": "Priorité a la progressivite: technique propre, déplacements, developpement aérobie. Éviter la surcharge lactique, privilégier des formats courts et ludiques.",
-        }
-    if age <= 34:
-        return {
-            "Titre": "Spécificité 20-34 ans",
-            "Note": "Fenêtre idéale pour développer la VMA et la tolérance a l'intensité. Monter progressivement la densité (intermittent, circuits spécifiques assaut).",
-        }
-    if age <= 44:
-        return {
-            "Titre": "Spécificité 35-44 ans",
-            "Note": "Accent sur la récupération et la régularité. Maintenir la VMA via intermittents courts et renforcer l'économie des déplacements.",
-        }
-    return {
-        "Titre": "Spécificité 45-60 ans",
-        "Note": "Priorité: prévention (tendons, mollets, ischios), échauffement long, montée en charge progressive. Intermittent court maîtrisé et endurance fondamentale régulière.",
-    }
-
-
-def suggested_work(level5: str) -> List[Dict[str, str]]:
-    base = [
-        {"Application": "Endurance fondamentale", "Detail": "20 a 45 min en aisance respiratoire, 1 a 2 fois par semaine."},
-        {"Application": "Technique basse intensité", "Detail": "Rounds techniques (shadow, cibles) sans fatigue excessive."},
-    ]
-    intermittent = [
-        {"Application": "Intermittent 30/30", "Detail": "2 x (6 a 10 répétitions) a intensité élevée, récupération 3 a 4 min entre blocs."},
-        {"Application": "Intermittent 15/15", "Detail": "2 x (10 a 20 répétitions), axe relance et déplacements."},
-        {"Application": "Intermittent spécifique assaut", "Detail": "6 x (1 min assaut actif / 1 min léger) avec consignes tactiques."},
-        {"Application": "Déplacements", "Detail": "Ateliers d'appuis (avant/arrière, latéral, pivots), 2 a 3 blocs de 4 min."},
-        {"Application": "Relances", "Detail": "10 a 15 s explosif / 45 a 50 s récup, 8 a 12 répétitions."},
-    ]
-    recovery = [{"Application": "Récupération", "Detail": "Marche, mobilité, sommeil, hydratation, 1 a 2 jours faciles par semaine."}]
-
-    if level5 == "Insuffisant":
-        return base + [intermittent[0]] + recovery
-    if level5 == "Moyen":
-        return base + intermittent[:2] + recovery
-    if level5 == "Bon":
-        return base + intermittent + recovery
-    if level5 == "Très Bon":
-        return intermittent[2:] + [{"Application": "Lactique court", "Detail": "4 a 6 x (30 a 45 s dur / 2 a 3 min récup) en contrôle."}] + recovery
-    if level5 == "Excellent":
-        return intermittent[2:] + [{"Application": "Qualité > volume", "Detail": "Séances plus courtes, intensité ciblée, exigence forte sur la récupération."}] + recovery
-    return []
 
+@st.cache_resource
+def get_fiche_cache() -> FicheCache:
+    return FicheCache(os.environ.get("CBF_PDF_CACHE_DIR", os.path.join(".cache", "fiches")))
 
-# -----------------------------
-# PDF
-# -----------------------------
-def _wrap_text(c: canvas.Canvas, text: str, x: float, y: float, max_width: float, leading: float = 12) -> float:
-    if not text:
-        return y
-    words = text.split()
-    line = ""
-    for w in words:
-        test = (line + " " + w).strip()
-        if c.stringWidth(test, "Helvetica", 10) <= max_width:
-            line = test
-        else:
-            c.drawString(x, y, line)
-            y -= leading
-            line = w
-    if line:
-        c.drawString(x, y, line)
-        y -= leading
-    return y
-
-
-def build_pdf_fiche(
-    *,
-    nom: str,
-    prenom: str,
-    date_saisie: str,
-    age: int,
-    sexe: str,
-    palier: int,
-    niveau: str,
-    interpretation: Dict[str, str],
-    age_note: Dict[str, str],
-    travail: List[Dict[str, str]],
-    logo_path: str = "Logo Rond.png",
-) -> bytes:
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
-    width, height = A4
-    margin = 18 * mm
-    y = height - margin
-
-    if os.path.exists(logo_path):
-        try:
-            img = ImageReader(logo_path)
-            c.drawImage(img, margin, y - 18 * mm, width=18 * mm, height=18 * mm, mask="auto")
-        except Exception:
-            pass
-
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(margin + 22 * mm, y - 6 * mm, "Fiche individuelle - Test Luc Leger")
-    c.setFont("Helvetica", 10)
-    c.drawString(margin + 22 * mm, y - 13 * mm, "CBF Montmorency - Synthese d'evaluation")
-    y -= 26 * mm
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(margin, y, "Informations tireur")
-    y -= 8 * mm
-    c.setFont("Helvetica", 10)
-    lignes = [
-        f"Nom: {nom}",
-        f"Prenom: {prenom}",
-        f"Date de saisie: {date_saisie}",
-        f"Age: {age}",
-        f"Sexe: {'Masculin' if sexe == 'M' else 'Feminin'}",
-        f"Palier atteint: {palier}",
-        f"Niveau correspondant: {niveau}",
-    ]
-    for l in lignes:
-        c.drawString(margin, y, l)
-        y -= 5 * mm
-    y -= 4 * mm
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(margin, y, "Analyse - Interpretation assaut")
-    y -= 7 * mm
-
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(margin, y, "Synthese")
-    y -= 5 * mm
-    c.setFont("Helvetica", 10)
-    y = _wrap_text(c, interpretation.get("Synthese", ""), margin, y, width - 2 * margin)
-    y -= 2 * mm
-
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(margin, y, "Point de vigilance")
-    y -= 5 * mm
-    c.setFont("Helvetica", 10)
-    y = _wrap_text(c, interpretation.get("Point de vigilance", ""), margin, y, width - 2 * margin)
-    y -= 2 * mm
-
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(margin, y, "Priorite de travail")
-    y -= 5 * mm
-    c.setFont("Helvetica", 10)
-    y = _wrap_text(c, interpretation.get("Priorite de travail", ""), margin, y, width - 2 * margin)
-    y -= 4 * mm
-
-    if y < 70 * mm:
-        c.showPage()
-        y = height - margin
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(margin, y, "Analyse - Specificite age")
-    y -= 7 * mm
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(margin, y, age_note.get("Titre", ""))
-    y -= 5 * mm
-    c.setFont("Helvetica", 10)
-    y = _wrap_text(c, age_note.get("Note", ""), margin, y, width - 2 * margin)
-    y -= 4 * mm
-
-    if y < 70 * mm:
-        c.showPage()
-        y = height - margin
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(margin, y, "Travail specifique (recommandations)")
-    y -= 7 * mm
-
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(margin, y, "Application")
-    c.drawString(margin + 70 * mm, y, "Detail")
-    y -= 4 * mm
-    c.line(margin, y, width - margin, y)
-    y -= 5 * mm
-
-    c.setFont("Helvetica", 10)
-    for row in travail:
-        if y < 25 * mm:
-            c.showPage()
-            y = height - margin
-            c.setFont("Helvetica-Bold", 10)
-            c.drawString(margin, y, "Application")
-            c.drawString(margin + 70 * mm, y, "Detail")
-            y -= 4 * mm
-            c.line(margin, y, width - margin, y)
-            y -= 5 * mm
-            c.setFont("Helvetica", 10)
-
-        app = str(row.get("Application", ""))
-        det = str(row.get("Detail", ""))
-
-        c.drawString(margin, y, app[:45])
-        y = _wrap_text(c, det, margin + 70 * mm, y, width - margin - (margin + 70 * mm))
-        y -= 2 * mm
-
-    c.setFont("Helvetica", 8)
-    c.drawString(margin, 12 * mm, f"Genere le {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    c.showPage()
-    c.save()
-    return buf.getvalue()
 
+@st.cache_resource
+def get_metrics() -> MetricsRegistry:
+    return MetricsRegistry()
 
-# -----------------------------
-# Model
-# -----------------------------
-@dataclass
-class Athlete:
-    id: str
-    nom: str
-    prenom: str
-    date_saisie: str
-    age: int
-    sexe: str
-    palier: int
+
+@st.cache_resource
+def get_render_service() -> RenderService:
+    metrics = get_metrics()
+    return RenderService(
+        get_fiche_cache(),
+        max_workers=RENDER_WORKERS,
+        processes=RENDER_PROCESSES,
+        observe=lambda seconds: metrics.observe("pdf_fiche", seconds),
+    )
+
+
+@st.cache_resource
+def get_metrics_exporter() -> MetricsExporter | None:
+    return MetricsExporter(get_metrics(), METRICS_PATH, METRICS_INTERVAL) if METRICS_PATH else None
 
 
 # -----------------------------
@@ -355,6 +113,10 @@ class Athlete:
 # -----------------------------
 st.set_page_config(page_title="Dashboard Luc Leger - CBF", layout="wide")
 
+debug = os.environ.get("CBF_PROFILE") == "1" or st.query_params.get("debug") == "1"
+metrics = get_metrics()
+profile = RerunProfile(metrics, enabled=debug or METRICS_PATH is not None)
+
 st.markdown(
     """
 <style>
@@ -425,33 +187,56 @@ with col_title:
         unsafe_allow_html=True,
     )
 
-if "athletes" not in st.session_state:
-    st.session_state.athletes: List[Athlete] = []
+dataset = get_dataset()
+render_service = get_render_service()
 
-df = (
-    pd.DataFrame([asdict(a) for a in st.session_state.athletes])
-    if st.session_state.athletes
-    else pd.DataFrame(columns=["id", "nom", "prenom", "date_saisie", "age", "sexe", "palier"])
-)
+# Resultats ajoutes par d'autres sessions ou processus depuis le dernier passage.
+with profile.phase("refresh") as p:
+    p.rows = dataset.refresh()
+st.session_state.seen_version = dataset.version
 
-total = len(df)
-nb_m = int((df["sexe"] == "M").sum()) if total else 0
-nb_f = int((df["sexe"] == "F").sum()) if total else 0
-avg_palier = float(df["palier"].mean()) if total else None
-avg_palier_str = f"{avg_palier:.1f}" if avg_palier is not None else "-"
 
-k1, k2, k3, k4 = st.columns(4)
-k1.markdown(f"<div class='kpi'><div style='color:#0f172a;font-weight:900;'>Participants</div><div style='font-size:26px;font-weight:900;'>{total}</div></div>", unsafe_allow_html=True)
-k2.markdown(f"<div class='kpi'><div style='color:#0f172a;font-weight:900;'>Masculin</div><div style='font-size:26px;font-weight:900;'>{nb_m}</div></div>", unsafe_allow_html=True)
-k3.markdown(f"<div class='kpi'><div style='color:#0f172a;font-weight:900;'>Féminin</div><div style='font-size:26px;font-weight:900;'>{nb_f}</div></div>", unsafe_allow_html=True)
-k4.markdown(f"<div class='kpi'><div style='color:#0f172a;font-weight:900;'>Palier moyen</div><div style='font-size:26px;font-weight:900;'>{avg_palier_str}</div></div>", unsafe_allow_html=True)
+@st.fragment(run_every=SYNC_SECONDS)
+def sync_with_other_coaches() -> None:
+    """Relance la page quand un autre coach a ajoute des resultats."""
+    dataset.refresh()
+    if dataset.version != st.session_state.get("seen_version"):
+        st.rerun(scope="app")
 
-st.write("")
 
-left, right = st.columns([1, 2], gap="large")
+sync_with_other_coaches()
 
-# ---- Saisie
-with left:
+
+def fragment_done(fp: RerunProfile, name: str) -> None:
+    """Fin d'un fragment : s'il a ete relance seul, sa duree est enregistree (et affichee en mode debug)."""
+    if fp is not profile:
+        elapsed = fp.finish(f"fragment_{name}")
+        if debug:
+            st.caption(f"Fragment {name} relancé seul en {elapsed * 1000:.1f} ms")
+
+
+# Chaque panneau est un fragment : ses widgets ne relancent que lui. Un rerun complet
+# (nouveau resultat, changement de bareme) les redessine tous, mais leurs lectures
+# (KPI, pages, analyses) sont en cache par version du jeu de donnees.
+@st.fragment
+def kpi_strip() -> None:
+    """Les quatre indicateurs (compteurs tenus a jour par le jeu de donnees)."""
+    fp = profile.scope()
+    with fp.phase("kpis"):
+        total, nb_m, nb_f, avg_palier = dataset.kpis()
+    avg_palier_str = f"{avg_palier:.1f}" if avg_palier is not None else "-"
+
+    k1, k2, k3, k4 = st.columns(4)
+    k1.markdown(f"<div class='kpi'><div style='color:#0f172a;font-weight:900;'>Participants</div><div style='font-size:26px;font-weight:900;'>{total}</div></div>", unsafe_allow_html=True)
+    k2.markdown(f"<div class='kpi'><div style='color:#0f172a;font-weight:900;'>Masculin</div><div style='font-size:26px;font-weight:900;'>{nb_m}</div></div>", unsafe_allow_html=True)
+    k3.markdown(f"<div class='kpi'><div style='color:#0f172a;font-weight:900;'>Féminin</div><div style='font-size:26px;font-weight:900;'>{nb_f}</div></div>", unsafe_allow_html=True)
+    k4.markdown(f"<div class='kpi'><div style='color:#0f172a;font-weight:900;'>Palier moyen</div><div style='font-size:26px;font-weight:900;'>{avg_palier_str}</div></div>", unsafe_allow_html=True)
+    fragment_done(fp, "kpis")
+
+
+@st.fragment
+def entry_form() -> None:
+    """Saisie et import ; un ajout relance toute la page (KPI, liste et analyse en dependent)."""
     st.markdown("<div class='section'>", unsafe_allow_html=True)
     st.markdown("<div class='section-header saisie'>Saisie d'un résultat</div>", unsafe_allow_html=True)
     st.markdown("<div class='section-body'>", unsafe_allow_html=True)
@@ -462,10 +247,9 @@ with left:
     sexe = st.selectbox("Sexe", options=["M", "F"], format_func=lambda x: "Masculin" if x == "M" else "Féminin")
     palier = st.number_input("Palier atteint", min_value=7, max_value=15, value=7, step=1)
 
-    if st.button("Évaluer", use_container_width=True, type="primary"):
+    if st.button("Évaluer", width="stretch", type="primary"):
         if prenom.strip():
-            st.session_state.athletes.insert(
-                0,
+            dataset.append(
                 Athlete(
                     id=str(uuid.uuid4()),
                     nom=nom.strip(),
@@ -481,177 +265,378 @@ with left:
         else:
             st.error("Le prénom est requis.")
 
+    with st.expander("Import d'un fichier (CSV / Excel)"):
+        st.caption("Colonnes : nom, prenom, age, sexe (M/F), palier, date_saisie (optionnelle).")
+        fichier = st.file_uploader("Fichier de résultats", type=["csv", "xlsx"], label_visibility="collapsed")
+        col_import, col_modele = st.columns(2)
+        with col_modele:
+            st.download_button("Modèle CSV", data=TEMPLATE_CSV, file_name="modele_luc_leger.csv", mime="text/csv", width="stretch")
+        with col_import:
+            if st.button("Importer", width="stretch", disabled=fichier is None):
+                try:
+                    st.session_state.import_report = import_results(fichier, fichier.name, dataset)
+                    st.rerun()
+                except (ValueError, ImportError) as e:
+                    st.error(str(e))
+
+        report = st.session_state.get("import_report")
+        if report is not None:
+            st.success(f"{report.inserted} résultat(s) importé(s), {report.rejected} ligne(s) rejetée(s).")
+            if report.errors:
+                st.dataframe(pd.DataFrame(report.errors, columns=["Ligne", "Erreur"]), width="stretch", hide_index=True)
+                if report.rejected > len(report.errors):
+                    st.caption(f"{len(report.errors)} premières erreurs affichées.")
+
     st.markdown("</div></div>", unsafe_allow_html=True)
 
-# ---- Liste + Analyse
-with right:
+
+@st.fragment
+def list_panel(bareme: Bareme) -> None:
+    """Recherche, tri, pagination et exports : une frappe dans la recherche ne relance que ce fragment."""
+    fp = profile.scope()
     st.markdown("<div class='section'>", unsafe_allow_html=True)
     st.markdown("<div class='section-header liste'>Liste des tireurs</div>", unsafe_allow_html=True)
     st.markdown("<div class='section-body'>", unsafe_allow_html=True)
 
     col_search, col_export = st.columns([4, 1], vertical_alignment="center")
     with col_search:
-        query = st.text_input("Recherche", placeholder="Filtrer : prénom, âge, sexe, palier...", label_visibility="collapsed")
-
-    if total:
-        view = df.copy()
-        if query.strip():
-            q = query.strip().lower()
-            mask = (
-                view["prenom"].astype(str).str.lower().str.contains(q)
-                | view["nom"].astype(str).str.lower().str.contains(q)
-                | view["age"].astype(str).str.contains(q)
-                | view["sexe"].astype(str).str.lower().str.contains(q)
-                | view["palier"].astype(str).str.contains(q)
-            )
-            view = view[mask]
+        query = st.text_input("Recherche", placeholder="Filtrer : prénom, âge, sexe, palier... (ex: palier>=11 sexe:F)", label_visibility="collapsed")
+    latest_only = st.toggle("Dernier test par tireur")
+
+    if not len(dataset):
+        st.info("Ajoute au moins un tireur pour afficher la liste et l'analyse.")
+        st.markdown("</div></div>", unsafe_allow_html=True)
+        return
+
+    with fp.phase("search") as p:
+        ids = dataset.select(query, latest_only=latest_only)
+        n_view = len(dataset) if ids is None else len(ids)
+        p.rows = n_view
+
+    with col_export:
+        with st.popover("Exporter", width="stretch"):
+            table_format = st.radio("Format du fichier", list(EXPORT_FORMATS), format_func=EXPORT_FORMATS.get)
+
+            def export_table() -> bytes:
+                # Construit au clic seulement, par blocs ; mesure versee au registre.
+                t0 = time.perf_counter()
+                rows = dataset.rows(ids, bareme)
+                if table_format == "csv":
+                    data = table_bytes(rows[list(LIST_COLUMNS)].rename(columns=LIST_COLUMNS), table_format)
+                else:
+                    data = table_bytes(rows[EXPORT_COLUMNS], table_format)
+                metrics.observe(f"export_{table_format}", time.perf_counter() - t0)
+                return data
 
-        view["niveau"] = view.apply(lambda r: level_for(str(r["sexe"]), int(r["age"]), int(r["palier"])), axis=1)
+            extension, mime = TABLE_FORMATS[table_format]
+            st.download_button(
+                "Télécharger",
+                data=export_table,
+                file_name=f"luc-leger_cbf_{date.today().isoformat()}{extension}",
+                mime=mime,
+                on_click="ignore",
+                width="stretch",
+            )
 
-        view_display = view[["nom", "prenom", "age", "sexe", "palier", "niveau", "date_saisie"]].rename(
-            columns={"nom": "Nom", "prenom": "Prénom", "age": "Âge", "sexe": "Sexe", "palier": "Palier", "niveau": "Niveau", "date_saisie": "Date de saisie"}
+    # Pagination cote serveur : seule la page affichee est envoyee au navigateur.
+    col_sort, col_desc, col_size, col_page = st.columns([2, 1, 1, 1], vertical_alignment="bottom")
+    with col_sort:
+        sort_label = st.selectbox("Trier par", list(SORT_OPTIONS))
+    with col_desc:
+        descending = st.toggle("Décroissant", value=True)
+    with col_size:
+        page_size = st.selectbox("Lignes", PAGE_SIZES, index=1)
+    n_pages = max(1, -(-n_view // page_size))
+    with col_page:
+        # Cle liee au filtre : retour a la page 1 quand la recherche change.
+        page_num = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1, key=f"page:{query}:{latest_only}:{page_size}")
+
+    with fp.phase("page") as p:
+        page_frame, _ = dataset.page(ids, sort=SORT_OPTIONS[sort_label], descending=descending, page=int(page_num) - 1, page_size=page_size, bareme=bareme)
+        p.rows = len(page_frame)
+    # Inclut la serialisation Arrow de la page par Streamlit.
+    with fp.phase("render_table", rows=len(page_frame)):
+        event = st.dataframe(
+            page_frame[list(LIST_COLUMNS)].rename(columns=LIST_COLUMNS),
+            width="stretch",
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=f"liste:{query}:{latest_only}:{sort_label}:{descending}:{page_size}:{int(page_num)}:{bareme.sha256}",
         )
-
-        with col_export:
-            csv_bytes = view_display.to_csv(index=False).encode("utf-8")
+    # La selection est gardee par id : elle survit au changement de page ou de tri.
+    # L'analyse est un autre fragment : seule une nouvelle selection relance la page.
+    if event.selection.rows:
+        picked = str(page_frame["id"].iloc[event.selection.rows[0]])
+        if picked != st.session_state.get("selected_id"):
+            st.session_state.selected_id = picked
+            st.rerun(scope="app")
+    st.caption(f"{n_view} résultat(s) - page {int(page_num)}/{n_pages} - cliquer une ligne pour l'analyser")
+
+    with st.expander("Export groupé des fiches PDF"):
+        col_periode, col_format = st.columns(2)
+        with col_periode:
+            periode = st.date_input("Période (optionnel)", value=(), format="YYYY-MM-DD")
+        with col_format:
+            export_format = st.radio("Format", ["ZIP (une fiche par tireur)", "PDF unique (club)"], horizontal=True)
+
+        if st.button("Générer les fiches", width="stretch"):
+            rows = dataset.rows(ids, bareme)
+            if len(periode) == 2:
+                rows = dataset.search(query, latest_only=latest_only, period=periode, bareme=bareme)
+            if len(rows) == 0:
+                st.warning("Aucun tireur sur cette période.")
+            else:
+                bar = st.progress(0.0, text="Génération des fiches...")
+
+                def progress(done: int, n: int) -> None:
+                    bar.progress(done / n, text=f"{done}/{n} fiches")
+
+                merged = export_format.startswith("PDF")
+                suffix = ".pdf" if merged else ".zip"
+                workers = int(os.environ.get("CBF_EXPORT_WORKERS", "0")) or None
+                path = export_file(rows.to_dict("records"), merged=merged, max_workers=workers, progress=progress, bareme=bareme)
+                previous = st.session_state.get("export_path")
+                if previous and os.path.exists(previous):
+                    os.remove(previous)
+                st.session_state.export_path = path
+                st.session_state.export_name = f"fiches_luc_leger_{date.today().isoformat()}{suffix}"
+
+        export_path = st.session_state.get("export_path")
+        if export_path and os.path.exists(export_path):
+            export_name = st.session_state.export_name
             st.download_button(
-                "Exporter CSV",
-                data=csv_bytes,
-                file_name=f"luc-leger_cbf_{date.today().isoformat()}.csv",
-                mime="text/csv",
-                use_container_width=True,
+                f"Télécharger {export_name}",
+                data=lambda: Path(export_path).read_bytes(),
+                file_name=export_name,
+                mime="application/pdf" if export_name.endswith(".pdf") else "application/zip",
+                on_click="ignore",
+                width="stretch",
             )
 
-        st.dataframe(view_display, use_container_width=True, hide_index=True)
-        st.markdown("</div></div>", unsafe_allow_html=True)
+    st.markdown("</div></div>", unsafe_allow_html=True)
+    fragment_done(fp, "liste")
+
+
+@st.fragment
+def fiche_pdf(selected: dict, bareme: Bareme, filename: str) -> None:
+    """Fiche PDF du tireur : rendue seulement a la demande, sur le pool de rendu.
+
+    Tant que le rendu est en cours, le fragment l'attend au plus RENDER_POLL_SECONDS puis
+    se relance seul (jamais toute la page) ; une fiche deja rendue est lue dans le cache.
+    """
+    fp = profile.scope()
+    fields = fiche_fields(selected, "Logo Rond.png", bareme)
+    slot = st.empty()
+    job = render_service.find(**fields)
+    if job is None and slot.button("Préparer la fiche PDF", type="primary", width="stretch"):
+        job = render_service.submit(**fields)
+    if job is not None and not job.wait(RENDER_POLL_SECONDS):
+        slot.button(f"Fiche PDF {job.status}… (actualiser)", width="stretch")
+        # Relance du seul fragment ; pendant un rerun complet, c'est le bouton qui relance la consultation.
+        if fp is not profile:
+            st.rerun(scope="fragment")
+    elif job is not None and job.status == FAILED:
+        slot.error(f"Échec du rendu de la fiche : {job.error}")
+    elif job is not None:
+        slot.download_button(
+            "Télécharger la fiche PDF",
+            data=job.result(),
+            file_name=filename,
+            mime="application/pdf",
+            on_click="ignore",
+            type="primary",
+            width="stretch",
+        )
+    fragment_done(fp, "fiche")
+
+
+@st.fragment
+def analysis_panel(bareme: Bareme) -> None:
+    """Analyse et fiche PDF du tireur selectionne."""
+    if not len(dataset):
+        return
+    fp = profile.scope()
+    st.markdown("<div class='section'>", unsafe_allow_html=True)
+    st.markdown("<div class='section-header analyse'>Analyse (tireur sélectionné)</div>", unsafe_allow_html=True)
+    st.markdown("<div class='section-body'>", unsafe_allow_html=True)
 
-        st.write("")
-
-        # Analyse
-        st.markdown("<div class='section'>", unsafe_allow_html=True)
-        st.markdown("<div class='section-header analyse'>Analyse (tireur sélectionné)</div>", unsafe_allow_html=True)
-        st.markdown("<div class='section-body'>", unsafe_allow_html=True)
-
-        if len(view) > 0:
-            selected_row = view.iloc[0]
-            sel_nom = str(selected_row["nom"])
-            sel_prenom = str(selected_row["prenom"])
-            sel_date = str(selected_row.get("date_saisie", ""))
-            sel_age = int(selected_row["age"])
-            sel_sexe = str(selected_row["sexe"])
-            sel_palier = int(selected_row["palier"])
-
-            lvl5 = level_for(sel_sexe, sel_age, sel_palier)
-            band = age_band(sel_age)
-
-            interpretation = interpret_for_assaut(lvl5)
-            age_note = age_specific_notes(sel_age)
-            travail = suggested_work(lvl5)
-
-            col_info, col_level = st.columns([4, 1], vertical_alignment="top")
-            with col_info:
-                st.markdown(
-                    f"""
+    selected_id = st.session_state.get("selected_id")
+    if dataset.row_of(selected_id) is None:
+        # Sans selection : le dernier resultat saisi.
+        latest, _ = dataset.page(descending=True, page_size=1, bareme=bareme)
+        selected_id = str(latest["id"].iloc[0])
+    selected = dataset.record(selected_id) if selected_id else None
+
+    if selected is not None:
+        sel_nom = str(selected["nom"])
+        sel_prenom = str(selected["prenom"])
+        sel_age = selected["age"]
+        sel_sexe = str(selected["sexe"])
+        sel_palier = selected["palier"]
+        sel_tireur = str(selected["tireur_id"])
+
+        with fp.phase("analysis"):
+            analysis = dataset.analysis(selected_id, bareme)
+        lvl5 = analysis.niveau
+        band = analysis.tranche
+        interpretation = analysis.interpretation
+        age_note = analysis.age_note
+        travail = analysis.travail
+
+        col_info, col_level = st.columns([4, 1], vertical_alignment="top")
+        with col_info:
+            st.markdown(
+                f"""
 <div style="display:flex; flex-wrap:wrap; gap:8px; align-items:center;">
   <span class="pill">{sel_nom} {sel_prenom}</span>
   <span class="pill">{sel_age} ans</span>
   <span class="pill">Tranche {band}</span>
   <span class="pill">Sexe {'Masculin' if sel_sexe=='M' else 'Féminin'}</span>
   <span class="pill">Palier {sel_palier}</span>
+  <span class="pill">VMA {analysis.mesures.vma:.1f} km/h</span>
 </div>
 """,
-                    unsafe_allow_html=True,
-                )
+                unsafe_allow_html=True,
+            )
 
-            with col_level:
-                pill_bg = LEVEL5_COLORS.get(lvl5, "#e5e7eb")
-                st.markdown(
-                    f"""
+        with col_level:
+            pill_bg = LEVEL5_COLORS.get(lvl5, "#e5e7eb")
+            st.markdown(
+                f"""
 <div style="display:flex; justify-content:flex-end;">
   <span class="pill" style="background:{pill_bg};">Niveau: {lvl5}</span>
 </div>
 """,
-                    unsafe_allow_html=True,
-                )
+                unsafe_allow_html=True,
+            )
 
-            tab1, tab2, tab3 = st.tabs(["Interprétation assaut", "Spécificité âge", "Travail spécifique"])
+        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["Interprétation assaut", "Spécificité âge", "Travail spécifique", "Mesures", "Historique", "Club"])
 
-            with tab1:
-                c1, c2, c3 = st.columns(3)
+        with tab1:
+            c1, c2, c3 = st.columns(3)
 
-                c1.markdown("<div class='section'><div class='section-header analyse'>Synthèse</div><div class='section-body'>", unsafe_allow_html=True)
-                c1.write(interpretation["Synthese"])
-                c1.markdown("</div></div>", unsafe_allow_html=True)
+            c1.markdown("<div class='section'><div class='section-header analyse'>Synthèse</div><div class='section-body'>", unsafe_allow_html=True)
+            c1.write(interpretation["Synthese"])
+            c1.markdown("</div></div>", unsafe_allow_html=True)
 
-                c2.markdown("<div class='section'><div class='section-header liste'>Point de vigilance</div><div class='section-body'>", unsafe_allow_html=True)
-                c2.write(interpretation["Point de vigilance"])
-                c2.markdown("</div></div>", unsafe_allow_html=True)
+            c2.markdown("<div class='section'><div class='section-header liste'>Point de vigilance</div><div class='section-body'>", unsafe_allow_html=True)
+            c2.write(interpretation["Point de vigilance"])
+            c2.markdown("</div></div>", unsafe_allow_html=True)
 
-                c3.markdown("<div class='section'><div class='section-header saisie'>Priorité de travail</div><div class='section-body'>", unsafe_allow_html=True)
-                c3.write(interpretation["Priorite de travail"])
-                c3.markdown("</div></div>", unsafe_allow_html=True)
+            c3.markdown("<div class='section'><div class='section-header saisie'>Priorité de travail</div><div class='section-body'>", unsafe_allow_html=True)
+            c3.write(interpretation["Priorite de travail"])
+            c3.markdown("</div></div>", unsafe_allow_html=True)
 
-            with tab2:
-                st.write(f"**{age_note['Titre']}**")
-                st.write(age_note["Note"])
+        with tab2:
+            st.write(f"**{age_note['Titre']}**")
+            st.write(age_note["Note"])
 
-            with tab3:
-                if not travail:
-                    st.info("Aucune recommandation disponible.")
-                else:
-                    st.dataframe(pd.DataFrame(travail)[["Application", "Detail"]], use_container_width=True, hide_index=True)
-
-            # ---- Bouton PDF hors des onglets, même proportion que le badge Niveau
-            st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
-
-            col_left, col_pdf = st.columns([4, 1], vertical_alignment="center")
-            with col_pdf:
-                pdf_bytes = build_pdf_fiche(
-                    nom=sel_nom,
-                    prenom=sel_prenom,
-                    date_saisie=sel_date,
-                    age=sel_age,
-                    sexe=sel_sexe,
-                    palier=sel_palier,
-                    niveau=lvl5,
-                    interpretation=interpretation,
-                    age_note=age_note,
-                    travail=travail,
-                    logo_path="Logo Rond.png",
-                )
-
-                b64 = base64.b64encode(pdf_bytes).decode("utf-8")
-                filename = (
-                    f"fiche_luc_leger_{sel_nom}_{sel_prenom}_{date.today().isoformat()}".replace(" ", "_") + ".pdf"
-                )
-
-                st.markdown(
-                    f"""
-<div style="display:flex; justify-content:flex-end;">
-  <a href="data:application/pdf;base64,{b64}" download="{filename}"
-     style="
-        display:inline-block;
-        padding:10px 14px;
-        border-radius:10px;
-        background:#0f172a;
-        color:white;
-        text-decoration:none;
-        font-weight:800;
-        font-size:13px;
-        border:1px solid #1f2937;
-        white-space:nowrap;
-     ">
-     Télécharger la fiche PDF
-  </a>
-</div>
-""",
-                    unsafe_allow_html=True,
-                )
+        with tab3:
+            if not travail:
+                st.info("Aucune recommandation disponible.")
+            else:
+                st.dataframe(pd.DataFrame(travail)[["Application", "Detail"]], width="stretch", hide_index=True)
 
-        st.markdown("</div></div>", unsafe_allow_html=True)
+        with tab4:
+            st.dataframe(
+                pd.DataFrame(list(analysis.mesures.resume().items()), columns=["Mesure", "Valeur"]),
+                width="stretch",
+                hide_index=True,
+            )
+            st.caption("Estimations : VO2max par l'équation de Léger (jeunes avant 18 ans), VMA = VO2max / 3,5.")
+
+        with tab5:
+            with fp.phase("history") as p:
+                historique = dataset.history_of(sel_tireur, bareme)
+                p.rows = len(historique)
+            if len(historique) > 1:
+                st.line_chart(historique.set_index("date_test")["palier"], height=180)
+            st.dataframe(
+                historique[["date_saisie", "age", "palier", "delta_palier", "vma", "niveau", "delta_niveau"]].rename(
+                    columns={"date_saisie": "Date", "age": "Âge", "palier": "Palier", "delta_palier": "Δ Palier", "vma": "VMA (km/h)", "niveau": "Niveau", "delta_niveau": "Δ Niveau"}
+                ),
+                width="stretch",
+                hide_index=True,
+            )
 
-    else:
-        st.info("Ajoute au moins un tireur pour afficher la liste et l'analyse.")
-        st.markdown("</div></div>", unsafe_allow_html=True)
+        with tab6:
+            # Lu sur l'histogramme tenu a jour par le jeu de donnees : aucun parcours des resultats.
+            with fp.phase("club"):
+                rank, cohort_size = dataset.cohort(selected_id)
+                levels, paliers = dataset.club_tables(bareme)
+            st.markdown(
+                f"**Centile dans la cohorte {sel_sexe} {band}** : {rank:.0f}e "
+                f"({cohort_size} résultat(s) ; part des résultats de la cohorte sous ce palier, ex aequo comptés pour moitié)"
+            )
+            scope = st.radio("Sexe", ["Tous", "M", "F"], horizontal=True, key="club_sexe")
+            if scope != "Tous":
+                levels, paliers = levels[levels["sexe"] == scope], paliers[paliers["sexe"] == scope]
+            col_levels, col_paliers = st.columns(2)
+            with col_levels:
+                st.caption("Niveaux par tranche d'âge")
+                by_band = levels.groupby(["tranche", "niveau"], sort=False)["effectif"].sum().unstack()
+                st.bar_chart(by_band[list(LEVEL5_COLORS)], height=220)
+            with col_paliers:
+                st.caption(f"Paliers de la cohorte {sel_sexe} {band}")
+                cohort = paliers[(paliers["sexe"] == sel_sexe) & (paliers["tranche"] == band)]
+                st.bar_chart(cohort.set_index("palier")["effectif"], height=220)
+
+        # ---- Bouton PDF hors des onglets, même proportion que le badge Niveau
+        st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
+
+        col_left, col_pdf = st.columns([4, 1], vertical_alignment="center")
+        with col_pdf:
+            filename = (
+                f"fiche_luc_leger_{sel_nom}_{sel_prenom}_{date.today().isoformat()}".replace(" ", "_") + ".pdf"
+            )
+            fiche_pdf(selected, bareme, filename)
+
+    st.markdown("</div></div>", unsafe_allow_html=True)
+    fragment_done(fp, "analyse")
+
+
+kpi_strip()
+
+st.write("")
+
+left, right = st.columns([1, 2], gap="large")
+
+# ---- Saisie
+with left:
+    entry_form()
+
+# ---- Liste + Analyse
+with right:
+    # Bareme hors des fragments : en changer relance toute la page.
+    # Baremes du repertoire, relus seulement si un fichier a change ; choix garde pour la seance.
+    store = get_bareme_store()
+    baremes = store.available()
+    if st.session_state.get("bareme") not in baremes:
+        st.session_state.pop("bareme", None)
+    bareme = baremes[st.selectbox("Barème de la séance", list(baremes), key="bareme")]
+    for name, error in store.errors.items():
+        st.warning(f"Barème {name} ignoré : {error}")
+
+    list_panel(bareme)
+    st.write("")
+    analysis_panel(bareme)
+
+st.caption(f"Barème {bareme.label} - Luc Leger (15-60 ans, paliers 7-15). Outil d'aide a la decision pour l'entrainement en Savate.")
+
+# ---- Profilage
+elapsed = profile.finish()
+if debug:
+    with st.expander(f"Profilage : rerun en {elapsed * 1000:.1f} ms", expanded=False):
+        st.dataframe(
+            pd.DataFrame([(name, seconds * 1000, rows) for name, seconds, rows in profile.phases], columns=["Phase", "ms", "Lignes"]).astype({"Lignes": "Int64"}),
+            width="stretch",
+            hide_index=True,
+        )
+        snapshot = pd.DataFrame.from_dict(metrics.snapshot(), orient="index")
+        st.caption("Fenêtre glissante, toutes sessions (ms)")
+        st.dataframe((snapshot[["p50", "p95", "p99", "max"]] * 1000).assign(n=snapshot["count"]), width="stretch")
 
-st.caption("Barème club - Luc Leger (15-60 ans, paliers 7-15). Outil d'aide a la decision pour l'entrainement en Savate.")
+exporter = get_metrics_exporter()
+if exporter is not None:
+    exporter.maybe_write()
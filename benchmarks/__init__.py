@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+# benchmarks
+# Mesures de performance des chemins critiques du dashboard.
+# Lancer : python -m benchmarks --sizes 1000 10000 --out bench.json
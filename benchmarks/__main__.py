@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# benchmarks/__main__.py
+# Lancer : python -m benchmarks [--sizes 1000 10000 100000] [--out bench.json] [--baseline baseline.json]
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.synthetic import generate_athletes
+from cbf_luc_leger import AthleteDataset, AthleteRepository
+from cbf_luc_leger.baremes import BUILTIN, BaremeStore, score_many
+from cbf_luc_leger.export import fiche_fields, write_zip
+from cbf_luc_leger.fiche import build_pdf_fiche
+from cbf_luc_leger.physio import metrics_arrays
+from cbf_luc_leger.render import RenderService
+from cbf_luc_leger.scoring import level_for, levels_for
+from cbf_luc_leger.tabular import EXPORT_COLUMNS, table_bytes
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+SCALAR_SAMPLE = 10_000
+PDF_BATCH = 50
+QUERIES = ["lina", "dup", "palier>=12 sexe:F", "nom:mar", "22"]
+
+# Import a froid du coeur (bareme, textes, fiche) : ni numpy, ni pandas, ni ReportLab.
+IMPORT_BUDGET_MS = 50.0
+CORE_IMPORT = "import cbf_luc_leger; from cbf_luc_leger import age_band, level_for, interpret_for_assaut, build_pdf_fiche"
+HEAVY_MODULES = ("numpy", "pandas", "reportlab", "streamlit")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Une mesure : (preparation, mesure) -> nombre d'elements traites par la mesure.
+Bench = Tuple[Callable[[], object], Callable[[object], int]]
+
+
+def _measure(setup: Callable[[], object], run: Callable[[object], int], repeat: int) -> Dict[str, float]:
+    """Meilleur temps sur `repeat` essais, puis un essai separe sous tracemalloc pour le pic memoire
+    (le suivi des allocations fausserait les temps)."""
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        state = setup()
+        t0 = time.perf_counter()
+        items = run(state)
+        best = min(best, time.perf_counter() - t0)
+
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "seconds": best,
+        "items": items,
+        "items_per_second": items / best if best > 0 else float("inf"),
+        "peak_mb": peak / 1e6,
+    }
+
+
+def _benches(n: int, workdir: str) -> Dict[str, Bench]:
+    df = generate_athletes(n)
+    sexes, ages, paliers = df["sexe"].to_numpy(), df["age"].to_numpy(), df["palier"].to_numpy()
+    rows = list(df.itertuples(index=False, name=None))
+
+    db_path = os.path.join(workdir, f"bench_{n}.db")
+    repo = AthleteRepository(db_path)
+    repo.add_many(rows)
+    dataset = AthleteDataset(repo)
+    view = dataset.frame()
+    records = view.head(PDF_BATCH).to_dict("records")
+    baremes = [BUILTIN, BaremeStore().load(os.path.join(ROOT, "baremes", "club.toml"))]
+
+    def insert(_: object) -> int:
+        path = os.path.join(workdir, f"insert_{n}_{time.perf_counter_ns()}.db")
+        return AthleteRepository(path).add_many(rows)
+
+    def scalar_levels(_: object) -> int:
+        k = min(n, SCALAR_SAMPLE)
+        for s, a, p in zip(sexes[:k], ages[:k], paliers[:k]):
+            level_for(s, a, p)
+        return k
+
+    def searches(_: object) -> int:
+        for q in QUERIES:
+            dataset.search(q)
+        return len(QUERIES)
+
+    def pages(_: object) -> int:
+        for key in (None, "date", "nom", "palier", "niveau"):
+            dataset.page(sort=key, page=1, page_size=50)
+        return 5
+
+    def kpis(_: object) -> int:
+        # Chemin de kpi_strip : compteurs en memoire de ClubAnalytics, sans requete SQL.
+        dataset.kpis()
+        return n
+
+    def percentiles(_: object) -> int:
+        return len(dataset.analytics.percentiles(sexes, ages, paliers))
+
+    def csv_export(_: object) -> int:
+        table_bytes(view[["nom", "prenom", "age", "sexe", "palier", "niveau", "date_saisie"]], "csv")
+        return n
+
+    def parquet_export(_: object) -> int:
+        table_bytes(view[EXPORT_COLUMNS], "parquet")
+        return n
+
+    def single_pdf(_: object) -> int:
+        build_pdf_fiche(**fiche_fields(records[0]))
+        return 1
+
+    def batch_pdf(_: object) -> int:
+        return write_zip(records, io.BytesIO())
+
+    def service_pdf(service: RenderService) -> int:
+        # Sans cache : chaque fiche est rendue, au plus DEFAULT_WORKERS a la fois.
+        jobs = [service.submit(**fiche_fields(row)) for row in records]
+        for job in jobs:
+            job.result()
+        service.shutdown()
+        return len(jobs)
+
+    return {
+        "insert": (lambda: None, insert),
+        "levels_vectorized": (lambda: None, lambda _: len(levels_for(sexes, ages, paliers))),
+        "levels_scalar": (lambda: None, scalar_levels),
+        "metrics_vectorized": (lambda: None, lambda _: len(metrics_arrays(ages, paliers)["vma"])),
+        "levels_baremes": (lambda: None, lambda _: score_many(baremes, sexes, ages, paliers).size),
+        "dataset_load": (lambda: None, lambda _: len(AthleteDataset(repo))),
+        "frame_build": (lambda: AthleteDataset(repo), lambda ds: len(ds.frame())),
+        "search": (lambda: None, searches),
+        "page": (lambda: None, pages),
+        "kpis": (lambda: None, kpis),
+        "percentiles": (lambda: None, percentiles),
+        "csv_export": (lambda: None, csv_export),
+        "parquet_export": (lambda: None, parquet_export),
+        "pdf_single": (lambda: None, single_pdf),
+        "pdf_batch": (lambda: None, batch_pdf),
+        "pdf_service": (RenderService, service_pdf),
+    }
+
+
+def measure_core_import(repeat: int) -> Dict:
+    """Meilleur temps d'import du coeur dans un interpreteur neuf, et modules lourds charges au passage."""
+    code = (
+        f"import sys, time; t = time.perf_counter(); {CORE_IMPORT}; "
+        f"print(time.perf_counter() - t); print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    best = float("inf")
+    heavy: List[str] = []
+    for _ in range(max(repeat, 3)):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout.split("\n")
+        best = min(best, float(out[0]))
+        heavy = out[1].split()
+    return {"seconds": best, "items": 1, "items_per_second": 1 / best, "peak_mb": 0.0, "heavy_modules": heavy}
+
+
+def run(sizes: List[int], repeat: int, only: Optional[List[str]]) -> Dict:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    if not only or "import_core" in only:
+        m = measure_core_import(repeat)
+        results["import_core"] = {"cold": m}
+        print(f"{'import_core':<18} {'cold':>11}  {m['seconds'] * 1000:10.2f} ms  heavy modules: {', '.join(m['heavy_modules']) or '-'}")
+    with tempfile.TemporaryDirectory(prefix="cbf_bench_") as workdir:
+        for n in sizes:
+            for name, (setup, fn) in _benches(n, workdir).items():
+                if only and name not in only:
+                    continue
+                m = _measure(setup, fn, repeat)
+                results.setdefault(name, {})[str(n)] = m
+                print(f"{name:<18} n={n:>9,}  {m['seconds'] * 1000:10.2f} ms  {m['items_per_second']:14,.0f} /s  {m['peak_mb']:8.1f} MB")
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Mesures plus lentes que la reference au-dela de `tolerance` (0.25 = +25 %)."""
+    regressions = []
+    for name, by_size in current["results"].items():
+        for size, m in by_size.items():
+            ref = baseline.get("results", {}).get(name, {}).get(size)
+            if not ref:
+                continue
+            ratio = m["seconds"] / ref["seconds"] if ref["seconds"] else 1.0
+            flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+            print(f"{name:<18} {size:>11}  x{ratio:5.2f} vs reference{flag}")
+            if flag:
+                regressions.append(f"{name}@{size}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks du dashboard Luc Leger.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="tailles de population (ex: 1000 10000 100000 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions par mesure (meilleur temps retenu)")
+    parser.add_argument("--only", nargs="+", help="noms des mesures a lancer")
+    parser.add_argument("--out", help="fichier JSON de resultats")
+    parser.add_argument("--baseline", help="fichier JSON de reference a comparer")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="ralentissement tolere avant de signaler une regression")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS, help="budget d'import a froid du coeur")
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.repeat, args.only)
+    status = 0
+    core = current["results"].get("import_core", {}).get("cold")
+    if core and (core["seconds"] * 1000 > args.import_budget_ms or core["heavy_modules"]):
+        print(f"Budget d'import depasse : {core['seconds'] * 1000:.1f} ms (budget {args.import_budget_ms:.0f} ms), modules lourds : {core['heavy_modules']}")
+        status = 1
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
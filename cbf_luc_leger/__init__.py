@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger
+# Coeur du dashboard Luc Léger (club), importable sans Streamlit.
+#
+# Les noms publics sont charges a la demande : `import cbf_luc_leger` n'importe ni
+# pandas, ni numpy, ni ReportLab ; chaque sous-module n'est charge qu'au premier acces.
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "Athlete": "cbf_luc_leger.models",
+    "AthleteDataset": "cbf_luc_leger.dataset",
+    "AthleteRepository": "cbf_luc_leger.storage",
+    "ClubAnalytics": "cbf_luc_leger.analytics",
+    "age_band": "cbf_luc_leger.scoring",
+    "level_for": "cbf_luc_leger.scoring",
+    "levels_for": "cbf_luc_leger.scoring",
+    "interpret_for_assaut": "cbf_luc_leger.analyse",
+    "age_specific_notes": "cbf_luc_leger.analyse",
+    "suggested_work": "cbf_luc_leger.analyse",
+    "Analysis": "cbf_luc_leger.analyse",
+    "analysis_for": "cbf_luc_leger.analyse",
+    "ReportMatrix": "cbf_luc_leger.analyse",
+    "report_matrix": "cbf_luc_leger.analyse",
+    "Mesures": "cbf_luc_leger.physio",
+    "mesures_for": "cbf_luc_leger.physio",
+    "metrics_arrays": "cbf_luc_leger.physio",
+    "build_pdf_fiche": "cbf_luc_leger.fiche",
+    "RenderService": "cbf_luc_leger.render",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted([*globals(), *_EXPORTS])
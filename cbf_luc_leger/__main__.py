@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/__main__.py
+# Lancer : python -m cbf_luc_leger evaluate resultats.csv --out rapport/
+
+import sys
+
+from cbf_luc_leger.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
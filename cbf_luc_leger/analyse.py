@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/analyse.py
+# Textes d'analyse : interpretation assaut, specificite age, travail specifique (avec allures personnelles).
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from cbf_luc_leger.baremes import BUILTIN, Bareme
+from cbf_luc_leger.physio import INTERMITTENTS, Mesures, mesures_for
+from cbf_luc_leger.scoring import AGE_MAX, AGE_MIN, LEVEL5_ORDER, PALIER_MAX, PALIER_MIN, age_band
+
+if TYPE_CHECKING:
+    from cbf_luc_leger.fiche import FicheBlocks
+
+
+# -----------------------------
+# Analyse (textes)
+# -----------------------------
+def interpret_for_assaut(level5: str) -> Dict[str, str]:
+    if level5 == "Insuffisant":
+        return {
+            "Synthese": "Endurance insuffisante pour soutenir plusieurs reprises a intensite assaut.",
+            "Point de vigilance": "Baisse rapide de lucidite (distance, garde) des la 1re-2e reprise.",
+            "Priorite de travail": "Construire une base aerobie et stabiliser la technique a faible intensite.",
+        }
+    if level5 == "Moyen":
+        return {
+            "Synthese": "Base cardio correcte pour l'entrainement, limite sur des assauts enchaines.",
+            "Point de vigilance": "Degradation en fin de reprise: deplacements moins frequents, relances plus rares.",
+            "Priorite de travail": "Developper l'intermittent et la tolerance aux changements de rythme.",
+        }
+    if level5 == "Bon":
+        return {
+            "Synthese": "Bon niveau pour l'assaut: volume de travail stable et capacite a relancer.",
+            "Point de vigilance": "Risque principal: surcharge si recuperation et progressivite sont negligees.",
+            "Priorite de travail": "Specifique savate (intermittent + déplacements + relances structurées).",
+        }
+    if level5 == "Très Bon":
+        return {
+            "Synthese": "Très bon moteur: enchainement de reprises et relances frequentes possibles.",
+            "Point de vigilance": "Risque: partir trop vite (sur-regime) plutot qu'une limite cardio.",
+            "Priorite de travail": "Affutage, qualite des relances, lactique court en controle, tactique.",
+        }
+    if level5 == "Excellent":
+        return {
+            "Synthese": "Excellent moteur cardio: pression et repetition d'efforts a haute frequence possibles.",
+            "Point de vigilance": "Risque: surcharge (tendons, mollets) si volumes et intensites mal pilotes.",
+            "Priorite de travail": "Qualite > volume, spécificité assaut, récupération premium.",
+        }
+    return {"Synthese": "Niveau non determine.", "Point de vigilance": "-", "Priorite de travail": "-"}
+
+
+def age_specific_notes(age: int) -> Dict[str, str]:
+    if age <= 19:
+        return {
+            "Titre": "Spécificité 15-19 ans",
+            "Note": "Priorité a la progressivite: technique propre, déplacements, developpement aérobie. Éviter la surcharge lactique, privilégier des formats courts et ludiques.",
+        }
+    if age <= 34:
+        return {
+            "Titre": "Spécificité 20-34 ans",
+            "Note": "Fenêtre idéale pour développer la VMA et la tolérance a l'intensité. Monter progressivement la densité (intermittent, circuits spécifiques assaut).",
+        }
+    if age <= 44:
+        return {
+            "Titre": "Spécificité 35-44 ans",
+            "Note": "Accent sur la récupération et la régularité. Maintenir la VMA via intermittents courts et renforcer l'économie des déplacements.",
+        }
+    return {
+        "Titre": "Spécificité 45-60 ans",
+        "Note": "Priorité: prévention (tendons, mollets, ischios), échauffement long, montée en charge progressive. Intermittent court maîtrisé et endurance fondamentale régulière.",
+    }
+
+
+def suggested_work(level5: str) -> List[Dict[str, str]]:
+    base = [
+        {"Application": "Endurance fondamentale", "Detail": "20 a 45 min en aisance respiratoire, 1 a 2 fois par semaine."},
+        {"Application": "Technique basse intensité", "Detail": "Rounds techniques (shadow, cibles) sans fatigue excessive."},
+    ]
+    intermittent = [
+        {"Application": "Intermittent 30/30", "Detail": "2 x (6 a 10 répétitions) a intensité élevée, récupération 3 a 4 min entre blocs."},
+        {"Application": "Intermittent 15/15", "Detail": "2 x (10 a 20 répétitions), axe relance et déplacements."},
+        {"Application": "Intermittent spécifique assaut", "Detail": "6 x (1 min assaut actif / 1 min léger) avec consignes tactiques."},
+        {"Application": "Déplacements", "Detail": "Ateliers d'appuis (avant/arrière, latéral, pivots), 2 a 3 blocs de 4 min."},
+        {"Application": "Relances", "Detail": "10 a 15 s explosif / 45 a 50 s récup, 8 a 12 répétitions."},
+    ]
+    recovery = [{"Application": "Récupération", "Detail": "Marche, mobilité, sommeil, hydratation, 1 a 2 jours faciles par semaine."}]
+
+    if level5 == "Insuffisant":
+        return base + [intermittent[0]] + recovery
+    if level5 == "Moyen":
+        return base + intermittent[:2] + recovery
+    if level5 == "Bon":
+        return base + intermittent + recovery
+    if level5 == "Très Bon":
+        return intermittent[2:] + [{"Application": "Lactique court", "Detail": "4 a 6 x (30 a 45 s dur / 2 a 3 min récup) en contrôle."}] + recovery
+    if level5 == "Excellent":
+        return intermittent[2:] + [{"Application": "Qualité > volume", "Detail": "Séances plus courtes, intensité ciblée, exigence forte sur la récupération."}] + recovery
+    return []
+
+
+def personal_work(travail: List[Dict[str, str]], mesures: Mesures) -> List[Dict[str, str]]:
+    """Recommandations avec l'allure et la distance par effort du tireur pour les intermittents 30/30 et 15/15."""
+    out = []
+    for row in travail:
+        fmt = row["Application"].removeprefix("Intermittent ")
+        if fmt in INTERMITTENTS:
+            seconds, _ = INTERMITTENTS[fmt]
+            row = {**row, "Detail": f"{row['Detail']} Allure {mesures.allures[fmt]:.1f} km/h, soit {mesures.distance(fmt)} m par {seconds} s."}
+        out.append(row)
+    return out
+
+
+# -----------------------------
+# Analyse complete d'un resultat
+# -----------------------------
+@dataclass(frozen=True)
+class Analysis:
+    """Tout ce que le panneau d'analyse et la fiche affichent pour un resultat.
+
+    Instances partagees (matrice des analyses) : ne pas modifier les dictionnaires et listes.
+    """
+
+    niveau: str
+    tranche: str
+    interpretation: Dict[str, str]
+    age_note: Dict[str, str]
+    travail: List[Dict[str, str]]
+    mesures: Mesures
+
+
+def build_analysis(sexe: str, age: int, palier: int, bareme: Optional[Bareme] = None) -> Analysis:
+    """Calcule l'analyse d'un resultat (sans cache ; voir `analysis_for`)."""
+    niveau = (bareme or BUILTIN).level_for(sexe, age, palier)
+    mesures = mesures_for(age, palier)
+    return Analysis(
+        niveau=niveau,
+        tranche=age_band(age),
+        interpretation=interpret_for_assaut(niveau),
+        age_note=age_specific_notes(age),
+        travail=personal_work(suggested_work(niveau), mesures),
+        mesures=mesures,
+    )
+
+
+_AGES = range(AGE_MIN, AGE_MAX + 1)
+_PALIERS = range(PALIER_MIN, PALIER_MAX + 1)
+
+
+class ReportMatrix:
+    """Les 2 x 46 x 9 = 828 analyses possibles d'un bareme, calculees une fois et lues par indice.
+
+    Les textes sont partages entre les cases (une interpretation par niveau, une note par
+    age...). Lecture seule : une matrice par bareme et par processus, commune a toutes les
+    sessions. Les fiches PDF y trouvent aussi leurs paragraphes deja coupes (`blocks`).
+    """
+
+    def __init__(self, bareme: Optional[Bareme] = None) -> None:
+        self.bareme = bareme or BUILTIN
+        interpretations = {level: interpret_for_assaut(level) for level in LEVEL5_ORDER}
+        work = {level: suggested_work(level) for level in LEVEL5_ORDER}
+        notes = [age_specific_notes(age) for age in _AGES]
+        mesures = [[mesures_for(age, palier) for palier in _PALIERS] for age in _AGES]
+        personal: Dict[Tuple[str, int, int], List[Dict[str, str]]] = {}
+        analyses = []
+        for sexe in ("M", "F"):
+            for ai, age in enumerate(_AGES):
+                for pi, palier in enumerate(_PALIERS):
+                    niveau = self.bareme.level_for(sexe, age, palier)
+                    key = (niveau, ai, pi)
+                    if key not in personal:
+                        personal[key] = personal_work(work[niveau], mesures[ai][pi])
+                    analyses.append(
+                        Analysis(
+                            niveau=niveau,
+                            tranche=age_band(age),
+                            interpretation=interpretations[niveau],
+                            age_note=notes[ai],
+                            travail=personal[key],
+                            mesures=mesures[ai][pi],
+                        )
+                    )
+        self._analyses: Tuple[Analysis, ...] = tuple(analyses)
+        self._blocks: List[Optional[FicheBlocks]] = [None] * len(analyses)
+
+    def __len__(self) -> int:
+        return len(self._analyses)
+
+    @staticmethod
+    def index(sexe: str, age: int, palier: int) -> Optional[int]:
+        """Case de (sexe, age, palier), None hors du domaine (ages 15-60, paliers 7-15)."""
+        if not (AGE_MIN <= age <= AGE_MAX and PALIER_MIN <= palier <= PALIER_MAX):
+            return None
+        s = 0 if sexe == "M" else 1
+        return (s * len(_AGES) + int(age) - AGE_MIN) * len(_PALIERS) + int(palier) - PALIER_MIN
+
+    def get(self, sexe: str, age: int, palier: int) -> Optional[Analysis]:
+        i = self.index(sexe, age, palier)
+        return None if i is None else self._analyses[i]
+
+    def blocks(self, sexe: str, age: int, palier: int) -> Optional[FicheBlocks]:
+        """Paragraphes de la fiche deja coupes en lignes, calcules au premier rendu de la case."""
+        i = self.index(sexe, age, palier)
+        if i is None:
+            return None
+        blocks = self._blocks[i]
+        if blocks is None:
+            from cbf_luc_leger.fiche import layout_blocks
+
+            a = self._analyses[i]
+            blocks = self._blocks[i] = layout_blocks(a.interpretation, a.age_note, a.travail)
+        return blocks
+
+
+@lru_cache(maxsize=None)
+def report_matrix(bareme: Bareme = BUILTIN) -> ReportMatrix:
+    """Matrice des analyses de `bareme`, construite au premier appel (quelques ms) puis partagee."""
+    return ReportMatrix(bareme)
+
+
+def analysis_for(sexe: str, age: int, palier: int, bareme: Optional[Bareme] = None) -> Analysis:
+    """Analyse d'un resultat : lecture dans la matrice du bareme (integre par defaut) ; calcul direct hors domaine."""
+    analysis = report_matrix(bareme or BUILTIN).get(sexe, age, palier)
+    return analysis if analysis is not None else build_analysis(sexe, age, palier, bareme)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/analytics.py
+# Statistiques du club tenues a jour a chaque ajout : effectifs, distribution des niveaux, centiles par cohorte.
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cbf_luc_leger.baremes import BUILTIN, Bareme, _indices
+from cbf_luc_leger.columns import SEXES
+from cbf_luc_leger.scoring import _N_BANDS, _N_PALIERS, AGE_MIN, LEVEL5_ORDER, PALIER_MIN, age_band
+
+BAND_LABELS = [age_band(AGE_MIN + 5 * b) for b in range(_N_BANDS)]
+_PALIERS = np.arange(PALIER_MIN, PALIER_MIN + _N_PALIERS)
+
+
+class ClubAnalytics:
+    """Histogramme (sexe, tranche d'age, palier) des resultats, mis a jour en O(k) par lot de k.
+
+    Tout le reste en derive sans reparcourir les resultats (180 cases) :
+      - `kpis()` : effectifs par sexe et palier moyen ;
+      - `level_counts(bareme)` : histogramme (sexe, tranche, niveau) pour n'importe quel
+        bareme, le niveau ne dependant que de la case ;
+      - `percentiles()` : rang du palier dans la cohorte sexe x tranche, lu sur les
+        effectifs cumules (paliers strictement inferieurs + moitie des ex aequo).
+    """
+
+    def __init__(self) -> None:
+        self.counts = np.zeros((2, _N_BANDS, _N_PALIERS), dtype=np.int64)
+        self._below: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return int(self.counts.sum())
+
+    def add(self, sexes, ages, paliers) -> None:
+        """Ajoute des resultats ; `sexes` en "M"/"F" ou en codes (0 = M, 1 = F)."""
+        np.add.at(self.counts, _indices(sexes, ages, paliers), 1)
+        self._below = None
+
+    def remove(self, sexes, ages, paliers) -> None:
+        """Retire des resultats ajoutes auparavant."""
+        np.subtract.at(self.counts, _indices(sexes, ages, paliers), 1)
+        self._below = None
+
+    def kpis(self) -> Tuple[int, int, int, Optional[float]]:
+        """(total, masculin, feminin, palier moyen)."""
+        by_sex = self.counts.sum(axis=(1, 2))
+        n = int(by_sex.sum())
+        mean = float(self.counts.sum(axis=(0, 1)) @ _PALIERS) / n if n else None
+        return n, int(by_sex[0]), int(by_sex[1]), mean
+
+    def level_counts(self, bareme: Optional[Bareme] = None) -> np.ndarray:
+        """Effectifs (sexe, tranche, niveau) selon `bareme` (integre par defaut)."""
+        table = (bareme or BUILTIN).table().astype(np.intp)
+        out = np.zeros((2, _N_BANDS, len(LEVEL5_ORDER)), dtype=np.int64)
+        s, b = np.indices(table.shape)[:2]
+        np.add.at(out, (s, b, table), self.counts)
+        return out
+
+    def percentiles(self, sexes, ages, paliers) -> np.ndarray:
+        """Centile (0-100) de chaque palier dans sa cohorte sexe x tranche, vectorise ; NaN si cohorte vide."""
+        if self._below is None:
+            cumulative = np.cumsum(self.counts, axis=2)
+            self._below = np.concatenate([np.zeros((2, _N_BANDS, 1), dtype=np.int64), cumulative], axis=2)
+        s, b, p = _indices(sexes, ages, paliers)
+        below, equal, size = self._below[s, b, p], self.counts[s, b, p], self._below[s, b, -1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(size > 0, 100.0 * (below + equal / 2) / size, np.nan)
+
+    def cohort_size(self, sex: str, age: int) -> int:
+        s, b, _ = _indices([sex], [age], [PALIER_MIN])
+        return int(self.counts[s[0], b[0]].sum())
+
+    def level_table(self, bareme: Optional[Bareme] = None) -> pd.DataFrame:
+        """Format long : sexe, tranche, niveau, effectif (toutes les cases, effectifs nuls compris)."""
+        counts = self.level_counts(bareme)
+        index = pd.MultiIndex.from_product([SEXES, BAND_LABELS, LEVEL5_ORDER], names=["sexe", "tranche", "niveau"])
+        return pd.DataFrame({"effectif": counts.ravel()}, index=index).reset_index()
+
+    def palier_table(self) -> pd.DataFrame:
+        """Format long : sexe, tranche, palier, effectif."""
+        index = pd.MultiIndex.from_product([SEXES, BAND_LABELS, _PALIERS], names=["sexe", "tranche", "palier"])
+        return pd.DataFrame({"effectif": self.counts.ravel()}, index=index).reset_index()
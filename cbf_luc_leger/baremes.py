@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/baremes.py
+# Baremes externes (JSON / TOML) : validation, compilation en table dense, cache par empreinte.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from cbf_luc_leger.scoring import (
+    _LEVEL_CODES,
+    _N_BANDS,
+    _N_PALIERS,
+    AGE_MAX,
+    AGE_MIN,
+    LEVEL5_ORDER,
+    PALIER_MAX,
+    PALIER_MIN,
+    clamp,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_DIR = "baremes"
+BUILTIN_NAME = "club (intégré)"
+
+# Correspondance par defaut des libelles du bareme vers les 5 niveaux (celle de to_level5).
+DEFAULT_NIVEAUX = {
+    "Faible": "Insuffisant",
+    "Moyen-": "Moyen",
+    "Moyen": "Moyen",
+    "Moyen+": "Moyen",
+    "Bon": "Bon",
+    "Tres bon": "Très Bon",
+    "Excellent": "Excellent",
+    "Elite": "Excellent",
+    "Elite+": "Excellent",
+}
+
+_SEXES = ("M", "F")
+_SLOTS = [AGE_MIN + 5 * i for i in range(_N_BANDS)]
+
+
+@dataclass(frozen=True)
+class Bareme:
+    """Bareme compile : `codes[(sexe * tranches + tranche) * paliers + palier]` = indice dans LEVEL5_ORDER.
+
+    Deux baremes de meme contenu (meme empreinte) sont egaux, quel que soit leur fichier.
+    """
+
+    name: str = field(compare=False)
+    version: str = field(compare=False)
+    sha256: str
+    codes: bytes = field(repr=False, compare=False)
+    source: Optional[str] = field(default=None, compare=False)
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} ({self.version})" if self.version else self.name
+
+    def table(self) -> np.ndarray:
+        """Vue numpy (2, tranches, paliers) en lecture seule."""
+        import numpy as np
+
+        return np.frombuffer(self.codes, dtype=np.int8).reshape(2, _N_BANDS, _N_PALIERS)
+
+    def level_codes(self, sexes, ages, paliers) -> np.ndarray:
+        """Codes niveau, vectorise ; `sexes` en "M"/"F" ou en codes entiers (0 = M, 1 = F)."""
+        return self.table()[_indices(sexes, ages, paliers)]
+
+    def level_for(self, sex: str, age: int, palier: int) -> str:
+        s = 0 if sex == "M" else 1
+        b = (clamp(age, AGE_MIN, AGE_MAX) - AGE_MIN) // 5
+        p = clamp(palier, PALIER_MIN, PALIER_MAX) - PALIER_MIN
+        return LEVEL5_ORDER[self.codes[(s * _N_BANDS + b) * _N_PALIERS + p]]
+
+
+def _indices(sexes, ages, paliers) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    import numpy as np
+
+    sexes = np.asarray(sexes)
+    s = (sexes != "M").astype(np.intp) if sexes.dtype.kind in "OUS" else sexes.astype(np.intp)
+    b = (np.clip(np.asarray(ages, dtype=np.int64), AGE_MIN, AGE_MAX) - AGE_MIN) // 5
+    p = np.clip(np.asarray(paliers, dtype=np.int64), PALIER_MIN, PALIER_MAX) - PALIER_MIN
+    return s, b, p
+
+
+def score_many(baremes: Sequence[Bareme], sexes, ages, paliers) -> np.ndarray:
+    """Codes niveau (len(baremes), n) : une seule indexation sur les tables empilees."""
+    import numpy as np
+
+    tables = np.stack([b.table() for b in baremes])
+    s, b, p = _indices(sexes, ages, paliers)
+    return tables[:, s, b, p]
+
+
+BUILTIN = Bareme(
+    name=BUILTIN_NAME,
+    version="",
+    sha256=hashlib.sha256(_LEVEL_CODES).hexdigest(),
+    codes=_LEVEL_CODES,
+)
+
+
+# -----------------------------
+# Lecture et validation
+# -----------------------------
+def _band_range(key: str) -> Tuple[int, int]:
+    lo, _, hi = key.partition("-")
+    return int(lo), int(hi)
+
+
+def compile_bareme(data: Dict[str, Any], source: Optional[str] = None) -> Bareme:
+    """Valide un bareme (dict issu du JSON / TOML) et le compile.
+
+    Format : `nom`, `version`, `niveaux` (libelle -> un des 5 niveaux, optionnel) et
+    `bareme.<sexe>.<tranche>.<palier> = libelle`, pour les sexes M et F, des tranches
+    "debut-fin" alignees sur 5 ans qui couvrent 15-60 ans sans chevauchement, et
+    chaque palier de 7 a 15. Leve ValueError avec la liste des problemes.
+    """
+    where = f"{source}: " if source else ""
+    if not isinstance(data, dict):
+        raise ValueError(where + f"bareme invalide : table attendue, pas {type(data).__name__}")
+    errors: List[str] = []
+    name = data.get("nom")
+    version = data.get("version", "")
+    if not isinstance(name, str) or not name.strip():
+        errors.append("champ 'nom' manquant")
+    if not isinstance(version, (str, int, float)):
+        errors.append("champ 'version' : texte ou nombre attendu")
+        version = ""
+    custom = data.get("niveaux", {})
+    if not isinstance(custom, dict):
+        errors.append("niveaux : table libelle -> niveau attendue")
+        custom = {}
+    niveaux = {**DEFAULT_NIVEAUX, **{level: level for level in LEVEL5_ORDER[:-1]}, **custom}
+    for raw, level in niveaux.items():
+        if level not in LEVEL5_ORDER[:-1]:
+            errors.append(f"niveaux.{raw}: '{level}' n'est pas un des niveaux {LEVEL5_ORDER[:-1]}")
+
+    grid = data.get("bareme")
+    codes = bytearray(len(_LEVEL_CODES))
+    if not isinstance(grid, dict):
+        errors.append("table 'bareme' manquante")
+        grid = {}
+    for extra in set(grid) - set(_SEXES):
+        errors.append(f"bareme.{extra}: sexe inconnu (M ou F)")
+    for si, sex in enumerate(_SEXES):
+        bands = grid.get(sex)
+        if not isinstance(bands, dict):
+            errors.append(f"bareme.{sex} manquant")
+            continue
+        owner: Dict[int, str] = {}
+        for key, paliers in bands.items():
+            try:
+                lo, hi = _band_range(key)
+            except ValueError:
+                errors.append(f"bareme.{sex}.{key}: tranche illisible (attendu 'debut-fin')")
+                continue
+            slots = [s for s in _SLOTS if lo <= s <= hi]
+            if lo not in _SLOTS or not slots or ((hi - lo + 1) % 5 and hi != AGE_MAX):
+                errors.append(f"bareme.{sex}.{key}: tranche non alignee sur 5 ans depuis {AGE_MIN}")
+                continue
+            for slot in slots:
+                if slot in owner:
+                    errors.append(f"bareme.{sex}.{key}: chevauche la tranche {owner[slot]}")
+                owner[slot] = key
+            if not isinstance(paliers, dict):
+                errors.append(f"bareme.{sex}.{key}: table palier -> libelle attendue")
+                continue
+            unreadable = [p for p in paliers if not str(p).isdecimal()]
+            if unreadable:
+                errors.append(f"bareme.{sex}.{key}: paliers illisibles {unreadable}")
+            given = {int(p): raw for p, raw in paliers.items() if str(p).isdecimal()}
+            missing = [p for p in range(PALIER_MIN, PALIER_MAX + 1) if p not in given]
+            if missing:
+                errors.append(f"bareme.{sex}.{key}: paliers manquants {missing}")
+            for p, raw in given.items():
+                if not PALIER_MIN <= p <= PALIER_MAX:
+                    errors.append(f"bareme.{sex}.{key}.{p}: palier hors {PALIER_MIN}-{PALIER_MAX}")
+                    continue
+                if not isinstance(raw, str) or raw not in niveaux:
+                    errors.append(f"bareme.{sex}.{key}.{p}: libelle inconnu '{raw}'")
+                    continue
+                code = LEVEL5_ORDER.index(niveaux[raw])
+                for slot in slots:
+                    codes[(si * _N_BANDS + _SLOTS.index(slot)) * _N_PALIERS + p - PALIER_MIN] = code
+        uncovered = [s for s in _SLOTS if s not in owner]
+        if uncovered:
+            errors.append(f"bareme.{sex}: ages non couverts a partir de {uncovered}")
+
+    if errors:
+        raise ValueError(where + "bareme invalide : " + " ; ".join(errors[:10]) + (" ..." if len(errors) > 10 else ""))
+    codes = bytes(codes)
+    return Bareme(name=name.strip(), version=str(version), sha256=hashlib.sha256(codes).hexdigest(), codes=codes, source=source)
+
+
+def _parse(path: str, content: bytes) -> Dict[str, Any]:
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError as e:  # Python < 3.11
+            raise ImportError("Les baremes TOML necessitent Python 3.11 (tomllib).") from e
+        return tomllib.loads(content.decode("utf-8"))
+    return json.loads(content.decode("utf-8"))
+
+
+class BaremeStore:
+    """Baremes d'un repertoire, recharges seulement quand la date de modification d'un fichier change.
+
+    Le contenu est hache (SHA-256) : un fichier touche mais inchange, ou deux fichiers
+    identiques, reutilisent la meme table compilee.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._by_path: Dict[str, Tuple[int, Bareme]] = {}
+        self._by_hash: Dict[str, Bareme] = {}
+        self.errors: Dict[str, str] = {}
+
+    def load(self, path: str) -> Bareme:
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._by_path.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            bareme = self._by_hash.get(digest)
+        if bareme is None:
+            try:
+                data = _parse(path, content)
+            except ValueError as e:
+                raise ValueError(f"{path}: fichier illisible : {e}") from e
+            bareme = compile_bareme(data, source=path)
+            with self._lock:
+                self._by_hash[digest] = bareme
+        with self._lock:
+            self._by_path[path] = (mtime, bareme)
+        return bareme
+
+    def available(self) -> Dict[str, Bareme]:
+        """{libelle: bareme}, le bareme integre en premier ; les fichiers invalides sont notes dans `errors`."""
+        found = {BUILTIN.label: BUILTIN}
+        errors: Dict[str, str] = {}
+        if os.path.isdir(self.directory):
+            for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+                if not entry.name.endswith((".json", ".toml")):
+                    continue
+                try:
+                    bareme = self.load(entry.path)
+                except (OSError, ValueError, ImportError) as e:
+                    errors[entry.name] = str(e)
+                    continue
+                found[bareme.label] = bareme
+        self.errors = errors
+        return found
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/cli.py
+# Evaluation en ligne de commande : python -m cbf_luc_leger evaluate resultats.csv --out rapport/
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from cbf_luc_leger.baremes import BUILTIN, BaremeStore
+from cbf_luc_leger.export import FICHE_ROW_FIELDS, fiche_filename, iter_fiches
+from cbf_luc_leger.importer import CHUNK_ROWS, ImportReport, read_chunks, validate_chunk
+from cbf_luc_leger.physio import METRIC_COLUMNS, add_metrics
+from cbf_luc_leger.scoring import AGE_MAX, AGE_MIN, LEVEL5_ORDER, age_band
+from cbf_luc_leger.tabular import TABLE_FORMATS, TableWriter
+
+OUTPUT_COLUMNS = ["ligne", "nom", "prenom", "date_saisie", "age", "sexe", "palier", "tranche", "niveau", *METRIC_COLUMNS]
+
+
+def evaluate(
+    source: str,
+    out_dir: str,
+    *,
+    fmt: str = "csv",
+    fiches: bool = False,
+    workers: Optional[int] = None,
+    chunksize: int = CHUNK_ROWS,
+    logo_path: str = "Logo Rond.png",
+    bareme_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Lit `source` par blocs, calcule tranche, niveau et mesures (VMA, VO2max...), ecrit la table enrichie (et les fiches) dans `out_dir`.
+
+    `bareme_path` : fichier JSON / TOML de bareme (bareme integre par defaut).
+    """
+    import numpy as np
+
+    bareme = BaremeStore().load(bareme_path) if bareme_path else BUILTIN
+    labels = np.array(LEVEL5_ORDER, dtype=object)
+    os.makedirs(out_dir, exist_ok=True)
+    bands = np.array([age_band(a) for a in range(AGE_MIN, AGE_MAX + 1, 5)], dtype=object)
+    report = ImportReport()
+    writer = TableWriter(os.path.join(out_dir, f"resultats{TABLE_FORMATS[fmt][0]}"), fmt, columns=OUTPUT_COLUMNS)
+    counts = {"lignes": 0, "valides": 0, "fiches": 0}
+    t0 = time.perf_counter()
+
+    def enriched() -> Iterator[Dict[str, Any]]:
+        with open(source, "rb") as f:
+            for line, chunk in read_chunks(f, source, chunksize):
+                counts["lignes"] += len(chunk)
+                valid = validate_chunk(chunk, line, report, with_ids=False).drop(columns="id")
+                ages = valid["age"].to_numpy()
+                valid.insert(0, "ligne", valid.index)
+                valid["tranche"] = bands[(np.clip(ages, AGE_MIN, AGE_MAX) - AGE_MIN) // 5]
+                valid["niveau"] = labels[bareme.level_codes(valid["sexe"].to_numpy(), ages, valid["palier"].to_numpy())]
+                valid = add_metrics(valid)
+                writer.write(valid[OUTPUT_COLUMNS])
+                counts["valides"] += len(valid)
+                if fiches:
+                    yield from valid[list(FICHE_ROW_FIELDS)].to_dict("records")
+
+    try:
+        if fiches:
+            fiche_dir = os.path.join(out_dir, "fiches")
+            os.makedirs(fiche_dir, exist_ok=True)
+            for i, row, pdf in iter_fiches(enriched(), logo_path=logo_path, max_workers=workers, bareme=bareme):
+                with open(os.path.join(fiche_dir, fiche_filename(i, row)), "wb") as f:
+                    f.write(pdf)
+                counts["fiches"] += 1
+        else:
+            for _ in enriched():
+                pass
+    finally:
+        writer.close()
+
+    if report.errors:
+        with open(os.path.join(out_dir, "rejets.csv"), "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["ligne", "erreur"])
+            w.writerows(report.errors)
+
+    elapsed = time.perf_counter() - t0
+    return {
+        **counts,
+        "rejetees": report.rejected,
+        "secondes": elapsed,
+        "lignes_par_seconde": counts["lignes"] / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cbf_luc_leger", description="Outils Luc Leger sans interface.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ev = sub.add_parser("evaluate", help="calcule les niveaux d'un fichier de resultats (CSV ou Excel)")
+    ev.add_argument("source", help="fichier CSV ou XLSX (colonnes nom, prenom, age, sexe, palier, date_saisie)")
+    ev.add_argument("--out", required=True, help="repertoire de sortie")
+    ev.add_argument("--format", choices=list(TABLE_FORMATS), default="csv", help="format de la table enrichie")
+    ev.add_argument("--fiches", action="store_true", help="genere aussi une fiche PDF par resultat")
+    ev.add_argument("--workers", type=int, default=None, help="processus de rendu des fiches (defaut : un par coeur)")
+    ev.add_argument("--chunksize", type=int, default=CHUNK_ROWS, help="lignes lues par bloc")
+    ev.add_argument("--logo", default="Logo Rond.png", help="logo des fiches")
+    ev.add_argument("--bareme", default=None, help="fichier de bareme JSON ou TOML (defaut : bareme integre)")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = evaluate(
+            args.source,
+            args.out,
+            fmt=args.format,
+            fiches=args.fiches,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            logo_path=args.logo,
+            bareme_path=args.bareme,
+        )
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+
+    print(
+        f"{stats['lignes']} lignes lues, {stats['valides']} valides, {stats['rejetees']} rejetees"
+        + (f", {stats['fiches']} fiches" if args.fiches else "")
+        + f" en {stats['secondes']:.2f} s ({stats['lignes_par_seconde']:,.0f} lignes/s)"
+    )
+    return 1 if stats["rejetees"] else 0
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/columns.py
+# Encodages compacts des colonnes du jeu en memoire (noms, sexe, UUID, dates).
+
+from __future__ import annotations
+
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SEXES = ["M", "F"]
+SEXE_CODES = {s: i for i, s in enumerate(SEXES)}
+
+UUID_DTYPE = np.dtype("V16")
+
+# Octet -> deux caracteres hexadecimaux (et l'inverse) ; positions des chiffres dans la forme 8-4-4-4-12.
+_HEX = np.frombuffer(b"".join(f"{i:02x}".encode() for i in range(256)), dtype=np.uint8).reshape(256, 2)
+_NIBBLE = np.zeros(256, dtype=np.uint8)
+_IS_HEX = np.zeros(256, dtype=bool)
+for _i, _c in enumerate(b"0123456789abcdef"):
+    _NIBBLE[_c] = _NIBBLE[ord(chr(_c).upper())] = _i
+    _IS_HEX[_c] = _IS_HEX[ord(chr(_c).upper())] = True
+_UUID_DIGITS = np.r_[0:8, 9:13, 14:18, 19:23, 24:36]
+_UUID_DASHES = [8, 13, 18, 23]
+
+
+class StringPool:
+    """Chaines internees : chaque valeur distincte est stockee une fois, les colonnes gardent un code int32."""
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, int] = {}
+        self._values: List[str] = []
+        self._array = np.empty(0, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def encode(self, values: np.ndarray) -> np.ndarray:
+        local, uniques = pd.factorize(values)
+        codes = self._codes
+        mapped = np.empty(len(uniques), dtype=np.int32)
+        for i, v in enumerate(uniques):
+            code = codes.get(v)
+            if code is None:
+                code = codes[v] = len(self._values)
+                self._values.append(v)
+            mapped[i] = code
+        return mapped[local]
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Tableau `object` des chaines (memes objets que le pool, aucune copie de texte)."""
+        if len(self._array) != len(self._values):
+            self._array = np.asarray(self._values, dtype=object)
+        return self._array[codes]
+
+    def value(self, code: int) -> str:
+        return self._values[code]
+
+    def code(self, value: str) -> Optional[int]:
+        """Code de `value`, None si la chaine n'a jamais ete vue."""
+        return self._codes.get(value)
+
+
+def uuid_bytes(values: Iterable[str]) -> np.ndarray:
+    """Identifiants texte -> tableau de 16 octets par UUID.
+
+    La forme canonique 8-4-4-4-12 est convertie en tableaux ; les autres formes
+    acceptees par `uuid.UUID` (accolades, sans tirets...) passent par celui-ci.
+    Leve ValueError sur un identifiant qui n'est pas un UUID.
+    """
+    values = values if isinstance(values, np.ndarray) else np.asarray(list(values), dtype=object)
+    n = len(values)
+    try:
+        # Un octet de plus que la forme canonique : les chaines trop longues ne sont pas tronquees.
+        text = np.asarray(values, dtype="S37").view(np.uint8).reshape(n, 37)
+    except (UnicodeEncodeError, TypeError, ValueError):
+        text = np.zeros((n, 37), dtype=np.uint8)
+    digits = text[:, _UUID_DIGITS]
+    canonical = (text[:, 36] == 0) & (text[:, _UUID_DASHES] == ord("-")).all(axis=1) & _IS_HEX[digits].all(axis=1)
+    nibbles = _NIBBLE[digits].reshape(n, 16, 2)
+    raw = np.ascontiguousarray(nibbles[:, :, 0] << 4 | nibbles[:, :, 1])
+    for i in np.flatnonzero(~canonical).tolist():
+        raw[i] = np.frombuffer(_parse_uuid(values[i]), dtype=np.uint8)
+    return raw.view(UUID_DTYPE).ravel()
+
+
+def _parse_uuid(value: object) -> bytes:
+    try:
+        return uuid.UUID(str(value)).bytes
+    except ValueError:
+        raise ValueError(f"identifiant de resultat invalide (UUID attendu) : {value!r}") from None
+
+
+def uuid_strings(raw: np.ndarray) -> np.ndarray:
+    """Inverse de `uuid_bytes`, vectorise : tableau `object` de chaines 'xxxxxxxx-xxxx-...'."""
+    n = len(raw)
+    digits = _HEX[np.ascontiguousarray(raw).view(np.uint8).reshape(n, 16)].reshape(n, 32)
+    text = np.full((n, 36), ord("-"), dtype=np.uint8)
+    text[:, _UUID_DIGITS] = digits
+    return text.astype(np.uint32).view("U36").ravel().astype(object)
+
+
+def uuid_string(raw: np.void) -> str:
+    return str(uuid.UUID(bytes=raw.tobytes()))
+
+
+def uuid_key(raw: np.ndarray) -> np.ndarray:
+    """8 premiers octets de chaque UUID en uint64 (cle de recherche, collisions a verifier)."""
+    return np.ascontiguousarray(raw).view(np.uint8).reshape(len(raw), 16)[:, :8].copy().view(">u8").ravel().astype(np.uint64)
+
+
+def date_strings(epoch: np.ndarray) -> np.ndarray:
+    """Secondes epoch -> chaines au format de saisie ("%Y-%m-%d %H:%M", voir DATE_FORMAT), vectorise."""
+    # Les resultats d'une seance partagent la meme minute : chaque valeur distincte n'est formatee qu'une fois.
+    minutes, inverse = np.unique(epoch // 60, return_inverse=True)
+    text = np.datetime_as_string((minutes * 60).astype("datetime64[s]").astype("datetime64[m]"))
+    text.view(np.uint32).reshape(-1, text.dtype.itemsize // 4)[:, 10] = ord(" ")  # 2026-09-15T18:30 -> 2026-09-15 18:30
+    return text.astype(object)[inverse.ravel()]
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/dataset.py
+# Jeu de resultats en colonnes, en memoire, alimente par ajouts successifs.
+
+from __future__ import annotations
+
+import calendar
+import threading
+import uuid
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cbf_luc_leger.analyse import Analysis, analysis_for
+from cbf_luc_leger.analytics import ClubAnalytics
+from cbf_luc_leger.baremes import BUILTIN, Bareme
+from cbf_luc_leger.columns import SEXE_CODES, SEXES, UUID_DTYPE, StringPool, date_strings, uuid_bytes, uuid_key, uuid_string, uuid_strings
+from cbf_luc_leger.history import History
+from cbf_luc_leger.models import RESULT_COLUMNS, Athlete, from_epoch
+from cbf_luc_leger.physio import metrics_arrays
+from cbf_luc_leger.scoring import LEVEL5_ORDER, level_codes
+from cbf_luc_leger.search import SearchIndex, fold
+from cbf_luc_leger.sorting import SortIndex
+from cbf_luc_leger.storage import AthleteRepository
+
+# Environ 40 octets par resultat : UUID binaires, noms et tireurs en codes vers un
+# StringPool, sexe en code (SEXES), date de saisie reconstruite depuis date_test.
+# Avec le pool, les index de recherche, de tri et l'historique : environ 530 octets.
+_DTYPES = {
+    "id": UUID_DTYPE,
+    "nom": np.int32,
+    "prenom": np.int32,
+    "age": np.int8,
+    "sexe": np.int8,
+    "palier": np.int8,
+    "tireur_id": np.int32,
+    "date_test": np.int64,
+    "niveau": np.int8,
+}
+
+# Colonnes lues depuis le depot (date_saisie se deduit de date_test).
+_LOADED_COLUMNS = [name for name in RESULT_COLUMNS if name != "date_saisie"]
+
+# Cles de tri de `page()` ; sans cle, ordre de saisie (plus recent en premier).
+SORT_KEYS = ("date", "nom", "palier", "niveau")
+_UNSCORED = LEVEL5_ORDER.index("-")
+
+
+class AthleteDataset:
+    """Colonnes typees en ajout seul, partagees par toutes les sessions.
+
+    Les lignes sont lues depuis le depot par `refresh()` (rowid croissant) ; le
+    niveau n'est calcule que pour les lignes ajoutees. `version` augmente a
+    chaque ajout : tant qu'elle ne bouge pas, `frame()` renvoie le meme DataFrame
+    (a ne pas modifier par l'appelant). L'index du DataFrame est l'identifiant de
+    ligne, celui que renvoie `SearchIndex.search` ; `history` relie les tests d'un
+    meme tireur (colonnes `delta_palier` / `delta_niveau` par rapport au test precedent).
+    `sort_indexes` garde un ordre par cle de `SORT_KEYS`, utilise par `page()`.
+
+    Plusieurs coachs (sessions, voire processus) ecrivent dans le meme depot : chaque
+    `refresh()` ne lit que les lignes posterieures au dernier rowid connu, et les
+    index, compteurs de `kpis()` et pages se mettent a jour en O(delta).
+    `record()` / `analysis()` retrouvent un resultat par son `id` (recherche
+    dichotomique sur les 8 premiers octets de l'UUID).
+
+    Les methodes de lecture acceptent un `bareme` (bareme integre par defaut) : ses
+    codes niveau et son ordre de tri sont calcules une fois, puis completes a chaque ajout.
+    """
+
+    def __init__(self, repository: AthleteRepository, capacity: int = 1024) -> None:
+        self.repository = repository
+        self.version = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self._cols: Dict[str, np.ndarray] = {name: np.empty(capacity, dtype=dt) for name, dt in _DTYPES.items()}
+        self._frames: Dict[str, Tuple[int, pd.DataFrame]] = {}
+        self._levels: Dict[str, Tuple[np.ndarray, SortIndex]] = {}
+        self.index = SearchIndex()
+        self.history = History()
+        self.sort_indexes = {
+            "date": SortIndex(np.int64),
+            "nom": SortIndex(np.bytes_),
+            "palier": SortIndex(np.int8),
+            "niveau": SortIndex(np.int8),
+        }
+        self._strings = StringPool()
+        self._id_index = SortIndex(np.uint64)
+        self._last_rowid = 0
+        self.analytics = ClubAnalytics()
+        self.refresh()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, athlete: Athlete) -> None:
+        self.repository.add(athlete)
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Ajoute les lignes ecrites dans le depot depuis le dernier appel. Renvoie leur nombre."""
+        with self._lock:
+            new = self.repository.frame_since(self._last_rowid, columns=_LOADED_COLUMNS)
+            if len(new):
+                self._extend({name: new[name].to_numpy() for name in _LOADED_COLUMNS})
+                self._last_rowid = int(new["rowid"].iloc[-1])
+            return len(new)
+
+    def _extend(self, values: Dict[str, np.ndarray]) -> None:
+        n = len(values["id"])
+        start, end = self._size, self._size + n
+        if end > len(self._cols["id"]):
+            capacity = max(end, 2 * len(self._cols["id"]))
+            for name, col in self._cols.items():
+                grown = np.empty(capacity, dtype=col.dtype)
+                grown[:start] = col[:start]
+                self._cols[name] = grown
+        cols = self._cols
+        ids = uuid_bytes(values["id"])
+        cols["id"][start:end] = ids
+        nom = cols["nom"][start:end] = self._strings.encode(values["nom"])
+        prenom = cols["prenom"][start:end] = self._strings.encode(values["prenom"])
+        cols["tireur_id"][start:end] = self._strings.encode(values["tireur_id"])
+        cols["sexe"][start:end] = [SEXE_CODES[s] for s in values["sexe"]]
+        for name in ("age", "palier", "date_test"):
+            cols[name][start:end] = values[name]
+        self._id_index.add(start, uuid_key(ids))
+        codes = level_codes(values["sexe"], values["age"], values["palier"])
+        self._cols["niveau"][start:end] = codes
+        self.index.add_many(nom, prenom, values["age"], values["sexe"], values["palier"], self._strings)
+        for row_id, tireur, date_test in zip(range(start, end), cols["tireur_id"][start:end].tolist(), values["date_test"].tolist()):
+            self.history.add(row_id, tireur, date_test)
+        self.sort_indexes["date"].add(start, values["date_test"])
+        self.sort_indexes["nom"].add(start, self._sort_names(nom, prenom))
+        self.sort_indexes["palier"].add(start, values["palier"])
+        self.sort_indexes["niveau"].add(start, codes)
+        self.analytics.add(cols["sexe"][start:end], values["age"], values["palier"])
+        self._size = end
+        self.version += 1
+
+    def _sort_names(self, nom: np.ndarray, prenom: np.ndarray) -> List[bytes]:
+        """Cles de tri par nom (UTF-8 de "nom\\x00prenom" sans accents), une conversion par chaine distincte du lot."""
+        folded: Dict[int, bytes] = {}
+
+        def key(code: int) -> bytes:
+            value = folded.get(code)
+            if value is None:
+                value = folded[code] = fold(self._strings.value(code)).encode()
+            return value
+
+        return [key(n) + b"\x00" + key(p) for n, p in zip(nom.tolist(), prenom.tolist())]
+
+    def row_of(self, athlete_id: Optional[str]) -> Optional[int]:
+        """Identifiant de ligne du resultat `athlete_id` (None s'il est inconnu)."""
+        with self._lock:
+            return self._row_of(athlete_id)
+
+    def _row_of(self, athlete_id: Optional[str]) -> Optional[int]:
+        try:
+            raw = uuid.UUID(athlete_id).bytes
+        except (TypeError, ValueError, AttributeError):
+            return None
+        for row in self._id_index.find(int.from_bytes(raw[:8], "big")):
+            if self._cols["id"][row].tobytes() == raw:
+                return int(row)
+        return None
+
+    def record(self, athlete_id: str) -> Optional[Dict[str, Any]]:
+        """Colonnes de `RESULT_COLUMNS` du resultat `athlete_id`, decodees depuis les colonnes."""
+        with self._lock:
+            return self._record(athlete_id)
+
+    def _record(self, athlete_id: str) -> Optional[Dict[str, Any]]:
+        row = self._row_of(athlete_id)
+        if row is None:
+            return None
+        cols, strings = self._cols, self._strings
+        date_test = int(cols["date_test"][row])
+        return {
+            "id": uuid_string(cols["id"][row]),
+            "nom": strings.value(cols["nom"][row]),
+            "prenom": strings.value(cols["prenom"][row]),
+            "date_saisie": from_epoch(date_test),
+            "age": int(cols["age"][row]),
+            "sexe": SEXES[cols["sexe"][row]],
+            "palier": int(cols["palier"][row]),
+            "tireur_id": strings.value(cols["tireur_id"][row]),
+            "date_test": date_test,
+        }
+
+    def analysis(self, athlete_id: str, bareme: Optional[Bareme] = None) -> Optional[Analysis]:
+        """Analyse du resultat `athlete_id`, lue dans la matrice des analyses du bareme."""
+        rec = self.record(athlete_id)
+        return None if rec is None else analysis_for(rec["sexe"], rec["age"], rec["palier"], bareme)
+
+    def _level_index(self, bareme: Optional[Bareme]) -> Tuple[np.ndarray, SortIndex]:
+        """Codes niveau de toutes les lignes selon `bareme` et leur ordre de tri (a appeler sous verrou)."""
+        if bareme is None or bareme == BUILTIN:
+            return self._cols["niveau"], self.sort_indexes["niveau"]
+        codes, order = self._levels.get(bareme.sha256, (np.empty(0, dtype=np.int8), None))
+        if order is None:
+            order = SortIndex(np.int8)
+        done, n = len(order), self._size
+        if done < n:
+            cols = self._cols
+            new = bareme.level_codes(cols["sexe"][done:n], cols["age"][done:n], cols["palier"][done:n])
+            codes = np.concatenate([codes[:done], new])
+            order.add(done, new)
+            self._levels[bareme.sha256] = (codes, order)
+        return codes, order
+
+    def kpis(self) -> Tuple[int, int, int, Optional[float]]:
+        """(total, masculin, feminin, palier moyen), comme `AthleteRepository.kpis` mais sans requete."""
+        with self._lock:
+            return self.analytics.kpis()
+
+    def club_tables(self, bareme: Optional[Bareme] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Distributions du club (format long) : (sexe, tranche, niveau) et (sexe, tranche, palier)."""
+        with self._lock:
+            return self.analytics.level_table(bareme), self.analytics.palier_table()
+
+    def cohort(self, athlete_id: str) -> Optional[Tuple[float, int]]:
+        """(centile du palier, effectif) du resultat dans sa cohorte sexe x tranche d'age."""
+        with self._lock:
+            row = self._row_of(athlete_id)
+            if row is None:
+                return None
+            cols = self._cols
+            sexe, age, palier = cols["sexe"][row : row + 1], cols["age"][row : row + 1], cols["palier"][row : row + 1]
+            return float(self.analytics.percentiles(sexe, age, palier)[0]), self.analytics.cohort_size(SEXES[sexe[0]], int(age[0]))
+
+    def frame(self, bareme: Optional[Bareme] = None) -> pd.DataFrame:
+        """Resultats les plus recents en premier, avec la colonne `niveau` (categorielle)."""
+        with self._lock:
+            return self._current_frame(bareme)
+
+    def search(
+        self, query: str, latest_only: bool = False, period: Optional[Tuple[date, date]] = None, bareme: Optional[Bareme] = None
+    ) -> pd.DataFrame:
+        """Lignes de `frame()` qui correspondent a la requete (voir `select`)."""
+        return self.rows(self.select(query, latest_only=latest_only, period=period), bareme)
+
+    def rows(self, ids: Optional[np.ndarray], bareme: Optional[Bareme] = None) -> pd.DataFrame:
+        """Lignes `ids` de `frame()` (toutes si None), plus recentes en premier."""
+        with self._lock:
+            frame = self._current_frame(bareme)
+            return frame if ids is None else frame.loc[ids[::-1]]
+
+    def select(self, query: str, latest_only: bool = False, period: Optional[Tuple[date, date]] = None) -> Optional[np.ndarray]:
+        """Identifiants (croissants) des lignes qui correspondent a la requete, None pour toutes.
+
+        `latest_only` ne garde que le dernier test de chaque tireur ; `period` (bornes
+        incluses) filtre sur la date du test.
+        """
+        with self._lock:
+            ids: Optional[np.ndarray] = None
+            if query.strip():
+                ids = self.index.search(query)
+            if latest_only:
+                latest = np.sort(self.history.latest())
+                ids = latest if ids is None else np.intersect1d(ids, latest, assume_unique=True)
+            if period is not None:
+                start, end = period
+                in_period = self.sort_indexes["date"].between(
+                    calendar.timegm(start.timetuple()), calendar.timegm(end.timetuple()) + 86399
+                )
+                ids = np.sort(in_period) if ids is None else np.intersect1d(ids, in_period, assume_unique=True)
+            return ids
+
+    def page(
+        self,
+        ids: Optional[np.ndarray] = None,
+        sort: Optional[str] = None,
+        descending: bool = True,
+        page: int = 0,
+        page_size: int = 50,
+        bareme: Optional[Bareme] = None,
+    ) -> Tuple[pd.DataFrame, int]:
+        """Page `page` (a partir de 0) des lignes `ids` (toutes si None) triees par `sort`, et leur nombre.
+
+        L'ordre vient de `sort_indexes` (aucun tri a la demande) et seul le DataFrame de
+        la page est construit : le cout ne depend pas de la taille du jeu.
+        """
+        with self._lock:
+            levels, level_order = self._level_index(bareme)
+            if sort is None:
+                order = np.arange(self._size, dtype=np.int64) if ids is None else ids
+                order = order[::-1] if descending else order
+            else:
+                if sort == "niveau":
+                    # Non note en dernier, que l'ordre soit croissant ou decroissant.
+                    order = level_order.order(ids, descending=descending, last=_UNSCORED)
+                else:
+                    order = self.sort_indexes[sort].order(ids, descending=descending)
+            start = max(0, page) * page_size
+            ids = order[start : start + page_size]
+            return self._frame_at(ids, self.history.prev_at(ids), levels), len(order)
+
+    def history_of(self, tireur_id: str, bareme: Optional[Bareme] = None) -> pd.DataFrame:
+        """Tests du tireur, du plus ancien au plus recent (seules ses lignes sont construites)."""
+        with self._lock:
+            tireur = self._strings.code(tireur_id)
+            ids = np.asarray([] if tireur is None else self.history.tests_of(tireur), dtype=np.int64)
+            return self._frame_at(ids, self.history.prev_at(ids), self._level_index(bareme)[0])
+
+    def _current_frame(self, bareme: Optional[Bareme] = None) -> pd.DataFrame:
+        key = (bareme or BUILTIN).sha256
+        cached = self._frames.get(key)
+        if cached is None or cached[0] != self.version:
+            n = self._size
+            ids = np.arange(n - 1, -1, -1)
+            cached = self._frames[key] = (self.version, self._frame_at(ids, self.history.prev_array(n)[::-1], self._level_index(bareme)[0]))
+        return cached[1]
+
+    def _frame_at(self, ids: np.ndarray, prev: np.ndarray, levels: np.ndarray) -> pd.DataFrame:
+        """DataFrame des lignes `ids` (dans cet ordre) ; `prev[i]` est le test precedent de `ids[i]`,
+        `levels` les codes niveau de toutes les lignes."""
+        cols, strings = self._cols, self._strings
+        date_test = cols["date_test"][ids]
+        data = {
+            "id": uuid_strings(cols["id"][ids]),
+            "nom": strings.decode(cols["nom"][ids]),
+            "prenom": strings.decode(cols["prenom"][ids]),
+            "date_saisie": date_strings(date_test),
+            "age": cols["age"][ids],
+            "sexe": pd.Categorical.from_codes(cols["sexe"][ids], categories=SEXES),
+            "palier": cols["palier"][ids],
+            "tireur_id": strings.decode(cols["tireur_id"][ids]),
+            "date_test": date_test.astype("datetime64[s]"),
+        }
+        data.update(metrics_arrays(data["age"], data["palier"]))
+        data["centile"] = self.analytics.percentiles(cols["sexe"][ids], data["age"], data["palier"]).round(0)
+        codes = levels[ids]
+        data["niveau"] = pd.Categorical.from_codes(codes, categories=LEVEL5_ORDER)
+
+        has_prev = prev >= 0
+        prev = np.where(has_prev, prev, 0)
+        prev_codes = levels[prev]
+        delta_palier = pd.array(data["palier"].astype(np.int16) - cols["palier"][prev], dtype="Int16")
+        delta_palier[~has_prev] = pd.NA
+        delta_niveau = pd.array(codes.astype(np.int16) - prev_codes, dtype="Int16")
+        delta_niveau[~has_prev | (codes == _UNSCORED) | (prev_codes == _UNSCORED)] = pd.NA
+        data["delta_palier"] = delta_palier
+        data["delta_niveau"] = delta_niveau
+        return pd.DataFrame(data, index=ids)
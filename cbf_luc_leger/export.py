@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/export.py
+# Export groupe des fiches d'une seance : ZIP (une fiche par tireur) ou PDF club unique.
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from cbf_luc_leger.analyse import analysis_for, report_matrix
+from cbf_luc_leger.baremes import BUILTIN, Bareme
+from cbf_luc_leger.fiche import build_pdf_fiche, draw_fiche
+
+ProgressFn = Callable[[int, int], None]
+
+FICHE_ROW_FIELDS = ("nom", "prenom", "date_saisie", "age", "sexe", "palier")
+
+
+def fiche_fields(row: Dict[str, Any], logo_path: str = "Logo Rond.png", bareme: Optional[Bareme] = None) -> Dict[str, Any]:
+    """Arguments complets de `draw_fiche` pour un resultat (nom, prenom, date_saisie, age, sexe, palier).
+
+    Analyse et paragraphes deja coupes sont lus dans la matrice des analyses du bareme.
+    """
+    age, sexe, palier = int(row["age"]), str(row["sexe"]), int(row["palier"])
+    analysis = analysis_for(sexe, age, palier, bareme)
+    return {
+        "nom": str(row["nom"]),
+        "prenom": str(row["prenom"]),
+        "date_saisie": str(row["date_saisie"]),
+        "age": age,
+        "sexe": sexe,
+        "palier": palier,
+        "niveau": analysis.niveau,
+        "interpretation": analysis.interpretation,
+        "age_note": analysis.age_note,
+        "travail": analysis.travail,
+        "mesures": analysis.mesures.resume(),
+        "blocks": report_matrix(bareme or BUILTIN).blocks(sexe, age, palier),
+        "logo_path": logo_path,
+    }
+
+
+def fiche_filename(index: int, row: Dict[str, Any]) -> str:
+    stem = f"{index + 1:04d}_fiche_luc_leger_{row['nom']}_{row['prenom']}_{str(row['date_saisie'])[:10]}"
+    return stem.replace(" ", "_").replace("/", "-") + ".pdf"
+
+
+def _render_row(row: Dict[str, Any], logo_path: str, bareme: Optional[Bareme] = None) -> bytes:
+    return build_pdf_fiche(**fiche_fields(row, logo_path, bareme))
+
+
+def iter_fiches(
+    rows: Iterable[Dict[str, Any]],
+    *,
+    logo_path: str = "Logo Rond.png",
+    max_workers: Optional[int] = None,
+    bareme: Optional[Bareme] = None,
+) -> Iterator[Tuple[int, Dict[str, Any], bytes]]:
+    """(index, ligne, pdf) dans l'ordre de `rows` (qui peut etre un generateur).
+
+    Le rendu est reparti sur un pool de processus ; au plus `2 * max_workers`
+    fiches sont en vol a la fois, la memoire ne depend donc pas de la taille de la seance.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1:
+        for i, row in enumerate(rows):
+            yield i, row, _render_row(row, logo_path, bareme)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        pending: Deque[Tuple[int, Dict[str, Any], Future]] = deque()
+        todo = enumerate(rows)
+        for i, row in todo:
+            pending.append((i, row, pool.submit(_render_row, row, logo_path, bareme)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            i, row, fut = pending.popleft()
+            yield i, row, fut.result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append((nxt[0], nxt[1], pool.submit(_render_row, nxt[1], logo_path, bareme)))
+
+
+def write_zip(
+    rows: Iterable[Dict[str, Any]],
+    out: BinaryIO,
+    *,
+    logo_path: str = "Logo Rond.png",
+    max_workers: Optional[int] = None,
+    progress: Optional[ProgressFn] = None,
+    bareme: Optional[Bareme] = None,
+) -> int:
+    """Ecrit une fiche par tireur dans l'archive `out` au fil du rendu. Renvoie le nombre de fiches."""
+    rows = [{k: row[k] for k in FICHE_ROW_FIELDS} for row in rows]
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(rows)))
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for done, (i, row, pdf) in enumerate(iter_fiches(rows, logo_path=logo_path, max_workers=workers, bareme=bareme), start=1):
+            zf.writestr(fiche_filename(i, row), pdf)
+            if progress:
+                progress(done, len(rows))
+    return len(rows)
+
+
+def write_merged_pdf(
+    rows: Iterable[Dict[str, Any]],
+    out: BinaryIO,
+    *,
+    logo_path: str = "Logo Rond.png",
+    progress: Optional[ProgressFn] = None,
+    bareme: Optional[Bareme] = None,
+) -> int:
+    """Toutes les fiches dans un seul PDF club (un canvas ReportLab, rendu dans le processus courant)."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    rows = list(rows)
+    c = canvas.Canvas(out, pagesize=A4)
+    for done, row in enumerate(rows, start=1):
+        draw_fiche(c, **fiche_fields(row, logo_path, bareme))
+        if progress:
+            progress(done, len(rows))
+    c.save()
+    return len(rows)
+
+
+def export_file(
+    rows: Iterable[Dict[str, Any]],
+    *,
+    merged: bool = False,
+    logo_path: str = "Logo Rond.png",
+    max_workers: Optional[int] = None,
+    progress: Optional[ProgressFn] = None,
+    bareme: Optional[Bareme] = None,
+) -> str:
+    """Ecrit l'export (PDF club si `merged`, ZIP sinon) dans un fichier temporaire et renvoie son chemin.
+
+    Le fichier appartient a l'appelant. En cas d'erreur, ou d'interruption (rerun
+    Streamlit), il est supprime : pas de fichier partiel orphelin.
+    """
+    tmp = tempfile.NamedTemporaryFile(prefix="cbf_fiches_", suffix=".pdf" if merged else ".zip", delete=False)
+    try:
+        with tmp:
+            if merged:
+                write_merged_pdf(rows, tmp, logo_path=logo_path, progress=progress, bareme=bareme)
+            else:
+                write_zip(rows, tmp, logo_path=logo_path, max_workers=max_workers, progress=progress, bareme=bareme)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    return tmp.name
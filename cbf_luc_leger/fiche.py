@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/fiche.py
+# Fiche individuelle PDF (ReportLab).
+
+from __future__ import annotations
+
+import hashlib
+import os
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from cbf_luc_leger.layout import wrap_lines
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen import canvas
+
+# ReportLab n'est importe qu'au premier rendu : importer ce module ne coute rien.
+
+
+@dataclass(frozen=True)
+class FicheBlocks:
+    """Paragraphes d'une fiche deja coupes en lignes (Helvetica 10, largeurs de draw_fiche)."""
+
+    synthese: Tuple[str, ...]
+    vigilance: Tuple[str, ...]
+    priorite: Tuple[str, ...]
+    age_note: Tuple[str, ...]
+    travail: Tuple[Tuple[str, ...], ...]
+
+
+def layout_blocks(interpretation: Dict[str, str], age_note: Dict[str, str], travail: Sequence[Dict[str, str]]) -> FicheBlocks:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+
+    # Memes largeurs que draw_fiche : marges de 18 mm, colonne "Detail" a 70 mm de la marge.
+    margin = 18 * mm
+    text_width = A4[0] - 2 * margin
+    detail_width = A4[0] - margin - (margin + 70 * mm)
+
+    def wrap(text: str, width: float = text_width) -> Tuple[str, ...]:
+        return wrap_lines(text, "Helvetica", 10, width) if text else ()
+
+    return FicheBlocks(
+        synthese=wrap(interpretation.get("Synthese", "")),
+        vigilance=wrap(interpretation.get("Point de vigilance", "")),
+        priorite=wrap(interpretation.get("Priorite de travail", "")),
+        age_note=wrap(age_note.get("Note", "")),
+        travail=tuple(wrap(str(row.get("Detail", "")), detail_width) for row in travail),
+    )
+
+
+# -----------------------------
+# En-tete (logo + titre), prepare une fois
+# -----------------------------
+# Chemin rapide : le logo est decode et compresse une fois par processus, puis inscrit
+# tel quel dans chaque document. L'inscription de l'image passe par des details internes
+# de ReportLab (PDFImageXObject, Canvas._doc), verifies pour ces versions majeures ;
+# ailleurs, ou si ces details ont change (AttributeError...), l'en-tete passe par
+# `drawImage` (API publique, logo reencode a chaque document).
+_FAST_LOGO_MAJORS = ("4", "5")
+
+
+@lru_cache(maxsize=None)
+def _fast_logo() -> bool:
+    import reportlab
+
+    return reportlab.Version.split(".")[0] in _FAST_LOGO_MAJORS
+
+
+@dataclass(frozen=True)
+class _Logo:
+    """Logo decode et deja compresse (Flate, sans ASCII85) : pixels et masque alpha."""
+
+    name: str
+    width: int
+    height: int
+    color_space: str
+    data: bytes
+    alpha: Optional[bytes]
+
+
+@lru_cache(maxsize=4)
+def _logo_reader(path: str, mtime_ns: int):
+    """ImageReader du logo, garde d'une fiche a l'autre (chemin public)."""
+    from reportlab.lib.utils import ImageReader
+
+    return ImageReader(path)
+
+
+@lru_cache(maxsize=4)
+def _load_logo(path: str, mtime_ns: int) -> _Logo:
+    """Pixels et masque alpha decodes avec Pillow, comme ImageReader pour `mask="auto"`."""
+    from PIL import Image
+
+    with Image.open(path) as im:
+        alpha = None
+        if im.mode == "P" and "transparency" in im.info:
+            im = im.convert("RGBA")
+        if im.mode in ("LA", "RGBA"):
+            alpha = im.getchannel("A").tobytes()
+            im = im.convert(im.mode[:-1])
+        elif im.mode not in ("L", "RGB", "CMYK"):
+            im = im.convert("RGB")
+        rgb = im.tobytes()
+        width, height = im.size
+        mode = im.mode
+    return _Logo(
+        name="logo" + hashlib.md5(rgb + (alpha or b"")).hexdigest()[:16],
+        width=width,
+        height=height,
+        color_space={"RGB": "DeviceRGB", "L": "DeviceGray", "CMYK": "DeviceCMYK"}[mode],
+        data=zlib.compress(rgb, 9),
+        alpha=zlib.compress(alpha, 9) if alpha else None,
+    )
+
+
+def _image_xobject(name: str, width: int, height: int, color_space: str, data: bytes):
+    from reportlab.pdfbase.pdfdoc import PDFImageXObject
+
+    xobj = PDFImageXObject(name)
+    xobj.width, xobj.height = width, height
+    xobj.colorSpace = color_space
+    xobj.bitsPerComponent = 8
+    xobj.streamContent = data
+    xobj._filters = ("FlateDecode",)
+    return xobj
+
+
+def _register_logo(c: canvas.Canvas, logo: _Logo) -> None:
+    """Inscrit le logo dans le document de `c` (une fois), sous le nom `logo.name`.
+
+    Les objets PDF sont propres a chaque document, mais ne font que pointer vers les
+    octets deja compresses : ni decodage PNG ni encodage par fiche. L'image se dessine
+    ensuite avec `c.doForm(logo.name)`, comme un formulaire.
+    """
+    from reportlab.pdfbase.pdfdoc import PDFObjectReference, xObjectName
+
+    if c.hasForm(logo.name):
+        return
+    doc = c._doc
+    image = _image_xobject(logo.name, logo.width, logo.height, logo.color_space, logo.data)
+    if logo.alpha is not None:
+        mask = _image_xobject(logo.name + "a", logo.width, logo.height, "DeviceGray", logo.alpha)
+        mask._decode = [0, 1]
+        doc.Reference(mask, xObjectName(mask.name))
+        image.smask = PDFObjectReference(xObjectName(mask.name))
+    doc.Reference(image, xObjectName(logo.name))
+
+
+def _header_logo(c: canvas.Canvas, logo_path: str, mtime_ns: int):
+    """Logo pret a dessiner : `_Logo` inscrit dans le document (chemin rapide), sinon ImageReader."""
+    if _fast_logo():
+        try:
+            logo = _load_logo(logo_path, mtime_ns)
+            _register_logo(c, logo)
+            return logo
+        except (AttributeError, TypeError, ImportError):
+            pass
+    return _logo_reader(logo_path, mtime_ns)
+
+
+def _draw_header(c: canvas.Canvas, logo_path: str) -> None:
+    """Logo, titre et sous-titre : un XObject de formulaire par document, rejoue sur chaque fiche."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+
+    try:
+        mtime_ns = os.stat(logo_path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    form = "entete_" + hashlib.md5(f"{logo_path}\x00{mtime_ns}".encode()).hexdigest()[:16] if mtime_ns else "entete"
+    if not c.hasForm(form):
+        try:
+            logo = _header_logo(c, logo_path, mtime_ns) if mtime_ns else None
+        except Exception:
+            logo = None
+        margin = 18 * mm
+        y = A4[1] - margin
+        c.beginForm(form)
+        if isinstance(logo, _Logo):
+            c.saveState()
+            c.translate(margin, y - 18 * mm)
+            c.scale(18 * mm, 18 * mm)
+            c.doForm(logo.name)
+            c.restoreState()
+        elif logo is not None:
+            c.drawImage(logo, margin, y - 18 * mm, width=18 * mm, height=18 * mm, mask="auto")
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(margin + 22 * mm, y - 6 * mm, "Fiche individuelle - Test Luc Leger")
+        c.setFont("Helvetica", 10)
+        c.drawString(margin + 22 * mm, y - 13 * mm, "CBF Montmorency - Synthese d'evaluation")
+        c.endForm()
+    c.doForm(form)
+
+
+# -----------------------------
+# PDF
+# -----------------------------
+def draw_fiche(
+    c: canvas.Canvas,
+    *,
+    nom: str,
+    prenom: str,
+    date_saisie: str,
+    age: int,
+    sexe: str,
+    palier: int,
+    niveau: str,
+    interpretation: Dict[str, str],
+    age_note: Dict[str, str],
+    travail: List[Dict[str, str]],
+    mesures: Optional[Dict[str, str]] = None,
+    blocks: Optional[FicheBlocks] = None,
+    logo_path: str = "Logo Rond.png",
+    reuse: bool = True,
+) -> None:
+    """Dessine une fiche sur `c` a partir d'une nouvelle page (plusieurs fiches peuvent partager un canvas).
+
+    `blocks` : textes deja coupes (matrice des analyses) ; calcules ici s'ils manquent.
+    `reuse` : le corps de fiche passe par un formulaire, ecrit une fois par document
+    pour toutes les fiches de meme analyse ; inutile pour une fiche seule.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+
+    if blocks is None:
+        blocks = layout_blocks(interpretation, age_note, travail)
+    width, height = A4
+    margin = 18 * mm
+    y = height - margin
+
+    _draw_header(c, logo_path)
+    y -= 26 * mm
+
+    # Titres fixes : rejoues avec le corps de fiche (voir _body_pages).
+    headings: List[_Op] = [("font", "Helvetica-Bold", 12), ("text", margin, y, "Informations tireur")]
+    y -= 8 * mm
+    c.setFont("Helvetica", 10)
+    lignes = [
+        f"Nom: {nom}",
+        f"Prenom: {prenom}",
+        f"Date de saisie: {date_saisie}",
+        f"Age: {age}",
+        f"Sexe: {'Masculin' if sexe == 'M' else 'Feminin'}",
+        f"Palier atteint: {palier}",
+        f"Niveau correspondant: {niveau}",
+    ]
+    for l in lignes:
+        c.drawString(margin, y, l)
+        y -= 5 * mm
+    y -= 4 * mm
+
+    if mesures:
+        headings.append(("text", margin, y, "Mesures physiologiques (estimations)"))
+        y -= 7 * mm
+        c.setFont("Helvetica", 10)
+        for label, value in mesures.items():
+            c.drawString(margin, y, f"{label}: {value}")
+            y -= 5 * mm
+        y -= 4 * mm
+
+    applications = tuple(str(row.get("Application", ""))[:45] for row in travail)
+    name, pages = _body_pages(tuple(headings), y, blocks, age_note.get("Titre", ""), applications)
+    for i, ops in enumerate(pages):
+        if i:
+            c.showPage()
+        if not reuse:
+            _replay(c, ops)
+            continue
+        form = f"{name}_{i}"
+        if not c.hasForm(form):
+            c.beginForm(form)
+            _replay(c, ops)
+            c.endForm()
+        c.doForm(form)
+
+    c.setFont("Helvetica", 8)
+    c.drawString(margin, 12 * mm, f"Genere le {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    c.showPage()
+
+
+# -----------------------------
+# Corps de fiche (analyse, travail), prepare une fois
+# -----------------------------
+# Titres, paragraphes et tableau ne dependent que de l'analyse : leur mise en page est
+# calculee une fois par contenu (operations de dessin par page), puis inscrite en
+# XObject de formulaire une fois par document et rejouee sur chaque fiche identique.
+_Op = Tuple[Any, ...]
+
+
+@lru_cache(maxsize=1024)
+def _body_pages(
+    headings: Tuple[_Op, ...], y: float, blocks: FicheBlocks, titre: str, applications: Tuple[str, ...]
+) -> Tuple[str, Tuple[Tuple[_Op, ...], ...]]:
+    """(nom de formulaire, operations de chaque page) : `headings` puis le corps de fiche qui commence a `y`."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+
+    width, height = A4
+    margin = 18 * mm
+    key = (headings, y, blocks, titre, applications)
+    pages: List[List[_Op]] = [list(headings)]
+
+    def font(name: str, size: float) -> None:
+        pages[-1].append(("font", name, size))
+
+    def text(x: float, y: float, value: str) -> None:
+        pages[-1].append(("text", x, y, value))
+
+    def lines(values: Sequence[str], x: float, y: float, leading: float = 12) -> float:
+        for value in values:
+            text(x, y, value)
+            y -= leading
+        return y
+
+    def new_page() -> float:
+        pages.append([])
+        return height - margin
+
+    def table_header(y: float) -> float:
+        font("Helvetica-Bold", 10)
+        text(margin, y, "Application")
+        text(margin + 70 * mm, y, "Detail")
+        y -= 4 * mm
+        pages[-1].append(("line", margin, y, width - margin, y))
+        return y - 5 * mm
+
+    font("Helvetica-Bold", 12)
+    text(margin, y, "Analyse - Interpretation assaut")
+    y -= 7 * mm
+    for title, block in (("Synthese", blocks.synthese), ("Point de vigilance", blocks.vigilance), ("Priorite de travail", blocks.priorite)):
+        font("Helvetica-Bold", 10)
+        text(margin, y, title)
+        y -= 5 * mm
+        font("Helvetica", 10)
+        y = lines(block, margin, y)
+        y -= 2 * mm
+    y -= 2 * mm
+
+    if y < 70 * mm:
+        y = new_page()
+
+    font("Helvetica-Bold", 12)
+    text(margin, y, "Analyse - Specificite age")
+    y -= 7 * mm
+    font("Helvetica-Bold", 10)
+    text(margin, y, titre)
+    y -= 5 * mm
+    font("Helvetica", 10)
+    y = lines(blocks.age_note, margin, y)
+    y -= 4 * mm
+
+    if y < 70 * mm:
+        y = new_page()
+
+    font("Helvetica-Bold", 12)
+    text(margin, y, "Travail specifique (recommandations)")
+    y -= 7 * mm
+    y = table_header(y)
+
+    font("Helvetica", 10)
+    for app, detail in zip(applications, blocks.travail):
+        if y < 25 * mm:
+            y = table_header(new_page())
+            font("Helvetica", 10)
+        text(margin, y, app)
+        y = lines(detail, margin + 70 * mm, y)
+        y -= 2 * mm
+
+    name = "corps_" + hashlib.md5(repr(key).encode()).hexdigest()[:16]
+    return name, tuple(tuple(ops) for ops in pages)
+
+
+def _replay(c: canvas.Canvas, ops: Sequence[_Op]) -> None:
+    for op, *args in ops:
+        if op == "font":
+            c.setFont(*args)
+        elif op == "text":
+            c.drawString(*args)
+        else:
+            c.line(*args)
+
+
+def build_pdf_fiche(
+    *,
+    nom: str,
+    prenom: str,
+    date_saisie: str,
+    age: int,
+    sexe: str,
+    palier: int,
+    niveau: str,
+    interpretation: Dict[str, str],
+    age_note: Dict[str, str],
+    travail: List[Dict[str, str]],
+    mesures: Optional[Dict[str, str]] = None,
+    blocks: Optional[FicheBlocks] = None,
+    logo_path: str = "Logo Rond.png",
+) -> bytes:
+    """Fiche seule en PDF (voir `draw_fiche`)."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4)
+    draw_fiche(
+        c,
+        nom=nom,
+        prenom=prenom,
+        date_saisie=date_saisie,
+        age=age,
+        sexe=sexe,
+        palier=palier,
+        niveau=niveau,
+        interpretation=interpretation,
+        age_note=age_note,
+        travail=travail,
+        mesures=mesures,
+        blocks=blocks,
+        logo_path=logo_path,
+        reuse=False,
+    )
+    c.save()
+    return buf.getvalue()
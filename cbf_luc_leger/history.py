@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/history.py
+# Historique des tests par tireur : chaine des tests tenue a jour a chaque ajout.
+
+from __future__ import annotations
+
+from array import array
+from typing import List
+
+import numpy as np
+
+
+class History:
+    """Tests successifs de chaque tireur (code entier), chaines dans des tableaux types.
+
+    `prev[r]` est la ligne du test precedent du meme tireur (-1 pour le premier test) et
+    `_latest[t]` la ligne du dernier test du tireur `t` : 16 octets par ligne, aucun objet
+    Python. Un ajout dans l'ordre des dates coute O(1) ; un resultat plus ancien insere
+    apres coup remonte seulement les tests plus recents du meme tireur.
+    """
+
+    def __init__(self) -> None:
+        self.prev = array("i")
+        self._dates = array("q")
+        self._latest = array("i")
+
+    def add(self, row_id: int, tireur: int, date_test: int) -> None:
+        latest = self._latest
+        if tireur >= len(latest):
+            latest.extend([-1] * (tireur + 1 - len(latest)))
+        after, before = -1, latest[tireur]
+        while before >= 0 and self._dates[before] > date_test:
+            after, before = before, self.prev[before]
+        self.prev.append(before)
+        self._dates.append(date_test)
+        if after >= 0:
+            self.prev[after] = row_id
+        else:
+            latest[tireur] = row_id
+
+    def tests_of(self, tireur: int) -> List[int]:
+        """Lignes des tests du tireur, du plus ancien au plus recent."""
+        rows: List[int] = []
+        row = self._latest[tireur] if 0 <= tireur < len(self._latest) else -1
+        while row >= 0:
+            rows.append(row)
+            row = self.prev[row]
+        return rows[::-1]
+
+    def latest(self) -> np.ndarray:
+        """Ligne du dernier test de chaque tireur."""
+        latest = np.frombuffer(self._latest, dtype=np.int32)
+        return latest[latest >= 0]
+
+    def prev_array(self, n: int) -> np.ndarray:
+        return np.frombuffer(self.prev, dtype=np.int32)[:n].copy()
+
+    def prev_at(self, ids: np.ndarray) -> np.ndarray:
+        """`prev` pour quelques lignes seulement (une page), sans copier tout le tableau."""
+        return np.frombuffer(self.prev, dtype=np.int32)[ids]
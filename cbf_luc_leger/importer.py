@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/importer.py
+# Import de resultats depuis un fichier CSV ou Excel, par blocs.
+
+from __future__ import annotations
+
+import csv
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Tuple
+
+import pandas as pd
+
+from cbf_luc_leger.dataset import AthleteDataset
+from cbf_luc_leger.models import DATE_FORMAT
+from cbf_luc_leger.scoring import AGE_MAX, AGE_MIN, PALIER_MAX, PALIER_MIN
+from cbf_luc_leger.search import fold
+
+CHUNK_ROWS = 5000
+MAX_REPORTED_ERRORS = 200
+REQUIRED_COLUMNS = ("nom", "prenom", "age", "sexe", "palier")
+
+# En-tetes acceptes (apres passage en minuscules sans accents), y compris ceux de l'export CSV.
+_HEADER_ALIASES = {"date de saisie": "date_saisie", "date": "date_saisie"}
+
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    rejected: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # les MAX_REPORTED_ERRORS premieres
+
+
+def _normalize_header(name: object) -> str:
+    key = fold(str(name)).strip()
+    return _HEADER_ALIASES.get(key, key.replace(" ", "_"))
+
+
+def _csv_chunks(source: BinaryIO, chunksize: int) -> Iterator[Tuple[int, pd.DataFrame]]:
+    head = source.read(4096)
+    source.seek(0)
+    try:
+        sep = csv.Sniffer().sniff(head.decode("utf-8-sig", errors="ignore"), delimiters=",;\t").delimiter
+    except csv.Error:
+        sep = ","
+    reader = pd.read_csv(source, sep=sep, dtype=str, keep_default_na=False, encoding="utf-8-sig", chunksize=chunksize)
+    line = 2
+    for chunk in reader:
+        yield line, chunk
+        line += len(chunk)
+
+
+def _xlsx_chunks(source: BinaryIO, chunksize: int) -> Iterator[Tuple[int, pd.DataFrame]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError("L'import Excel necessite le paquet openpyxl (pip install openpyxl).") from e
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows, ())]
+        line = 2
+        while True:
+            block = list(islice(rows, chunksize))
+            if not block:
+                break
+            yield line, pd.DataFrame(block, columns=header, dtype=object)
+            line += len(block)
+    finally:
+        wb.close()
+
+
+def read_chunks(source: BinaryIO, filename: str, chunksize: int = CHUNK_ROWS) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """(numero de ligne de la premiere ligne du bloc, bloc) ; l'en-tete est la ligne 1."""
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        chunks = _xlsx_chunks(source, chunksize)
+    else:
+        chunks = _csv_chunks(source, chunksize)
+    for line, chunk in chunks:
+        chunk.columns = [_normalize_header(c) for c in chunk.columns]
+        missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Colonnes manquantes: {', '.join(missing)}")
+        yield line, chunk
+
+
+def validate_chunk(chunk: pd.DataFrame, first_line: int, report: ImportReport, with_ids: bool = True) -> pd.DataFrame:
+    """Controles vectorises ; renvoie les lignes valides (colonnes d'Athlete, indexees par numero de
+    ligne du fichier) et note les autres dans `report`. `with_ids=False` laisse la colonne `id` vide
+    quand les lignes ne sont pas destinees a la base."""
+    lines = pd.RangeIndex(first_line, first_line + len(chunk))
+    chunk = chunk.set_axis(lines)
+
+    nom = chunk["nom"].fillna("").astype(str).str.strip()
+    prenom = chunk["prenom"].fillna("").astype(str).str.strip()
+    sexe = chunk["sexe"].fillna("").astype(str).str.strip().str.upper()
+    age = pd.to_numeric(chunk["age"], errors="coerce")
+    palier = pd.to_numeric(chunk["palier"], errors="coerce")
+    if "date_saisie" in chunk.columns:
+        # Les dates deja au format de l'application sont gardees telles quelles ; seules
+        # les autres passent par l'analyse (plus lente) des formats libres.
+        raw_date = chunk["date_saisie"].fillna("").astype(str).str.strip()
+        canonical = pd.to_datetime(raw_date, errors="coerce", format=DATE_FORMAT).notna()
+        date_saisie = raw_date.where(canonical)
+        retry = (raw_date != "") & ~canonical
+        if retry.any():
+            # ISO (2026-09-15...) ou format francais, jour en premier (15/09/2026...).
+            iso = retry & raw_date.str.match(r"\d{4}-")
+            for mask, kwargs in ((iso, {"format": "ISO8601"}), (retry & ~iso, {"format": "mixed", "dayfirst": True})):
+                if mask.any():
+                    parsed = pd.to_datetime(raw_date[mask], errors="coerce", **kwargs)
+                    date_saisie[mask] = parsed.dt.strftime(DATE_FORMAT)
+        bad_date = retry & date_saisie.isna()
+    else:
+        date_saisie = pd.Series(pd.NA, index=lines, dtype=object)
+        bad_date = pd.Series(False, index=lines)
+
+    checks = [
+        (prenom == "", "prénom manquant"),
+        (age.isna() | (age % 1 != 0) | ~age.between(AGE_MIN, AGE_MAX), f"âge hors {AGE_MIN}-{AGE_MAX}"),
+        (palier.isna() | (palier % 1 != 0) | ~palier.between(PALIER_MIN, PALIER_MAX), f"palier hors {PALIER_MIN}-{PALIER_MAX}"),
+        (~sexe.isin(["M", "F"]), "sexe différent de M/F"),
+        (bad_date, "date de saisie illisible"),
+    ]
+    bad = pd.Series(False, index=lines)
+    for mask, _ in checks:
+        bad |= mask
+    bad_lines = lines[bad.to_numpy()]
+    report.rejected += len(bad_lines)
+    for line in bad_lines[: max(0, MAX_REPORTED_ERRORS - len(report.errors))]:
+        report.errors.append((int(line), ", ".join(msg for mask, msg in checks if mask[line])))
+
+    ok = ~bad
+    n_ok = int(ok.sum())
+    now = datetime.now().strftime(DATE_FORMAT)
+    return pd.DataFrame(
+        {
+            "id": [str(uuid.uuid4()) for _ in range(n_ok)] if with_ids else [None] * n_ok,
+            "nom": nom[ok].to_numpy(),
+            "prenom": prenom[ok].to_numpy(),
+            "date_saisie": date_saisie[ok].fillna(now).to_numpy(),
+            "age": age[ok].astype(int).to_numpy(),
+            "sexe": sexe[ok].to_numpy(),
+            "palier": palier[ok].astype(int).to_numpy(),
+        },
+        index=lines[ok.to_numpy()],
+    )
+
+
+def import_results(source: BinaryIO, filename: str, dataset: AthleteDataset, chunksize: int = CHUNK_ROWS) -> ImportReport:
+    """Valide le fichier bloc par bloc et insere les lignes valides en une seule transaction.
+
+    Seul le bloc courant est en memoire pendant la lecture ; le jeu en memoire est
+    mis a jour une fois la transaction validee.
+    """
+    report = ImportReport()
+
+    def rows() -> Iterator[tuple]:
+        for line, chunk in read_chunks(source, filename, chunksize):
+            valid = validate_chunk(chunk, line, report)
+            yield from valid.itertuples(index=False, name=None)
+
+    report.inserted = dataset.repository.add_many(rows())
+    dataset.refresh()
+    return report
+
+
+# Fichier modele a remplir par le coach.
+TEMPLATE_CSV = b"nom,prenom,age,sexe,palier,date_saisie\nDupont,Lina,17,F,10,2026-09-15 18:30\n"
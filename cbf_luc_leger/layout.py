@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/layout.py
+# Mise en page du texte des fiches : largeurs de mots et coupures de lignes memorisees.
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=65536)
+def word_width(word: str, font: str, size: float) -> float:
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    return stringWidth(word, font, size)
+
+
+@lru_cache(maxsize=4096)
+def wrap_lines(text: str, font: str, size: float, max_width: float) -> Tuple[str, ...]:
+    """Lignes d'au plus `max_width` points ; un mot trop long occupe seul sa ligne.
+
+    Les polices standard n'ont pas de crenage : la largeur d'une ligne est la somme
+    des largeurs de ses mots et des espaces, ce qui permet un seul passage sur le texte.
+    """
+    space = word_width(" ", font, size)
+    lines = []
+    current = []
+    width = 0.0
+    for w in text.split():
+        ww = word_width(w, font, size)
+        if current and width + space + ww > max_width:
+            lines.append(" ".join(current))
+            current, width = [w], ww
+        elif current:
+            current.append(w)
+            width += space + ww
+        else:
+            current, width = [w], ww
+    if current:
+        lines.append(" ".join(current))
+    return tuple(lines)
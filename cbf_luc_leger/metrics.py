@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/metrics.py
+# Chronometrage des phases d'un rerun et export des latences (JSON ou texte Prometheus).
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+QUANTILES = (0.5, 0.95, 0.99)
+DEFAULT_WINDOW = 1000
+
+
+class Histogram:
+    """Fenetre glissante des `window` dernieres mesures, plus compteur et somme cumules."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MetricsRegistry:
+    """Histogrammes par phase, partages par toutes les sessions (thread-safe)."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram(self.window)
+            hist.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """{phase: {count, sum, p50, p95, p99, max}} sur la fenetre courante (secondes)."""
+        with self._lock:
+            out = {}
+            for name, hist in sorted(self._histograms.items()):
+                stats = {"count": hist.count, "sum": hist.total, "max": max(hist.samples, default=0.0)}
+                stats.update({f"p{int(q * 100)}": hist.quantile(q) for q in QUANTILES})
+                out[name] = stats
+            return out
+
+    def to_prometheus(self, prefix: str = "cbf_phase_seconds") -> str:
+        lines = [f"# HELP {prefix} Duree des phases d'un rerun (fenetre glissante).", f"# TYPE {prefix} summary"]
+        for name, stats in self.snapshot().items():
+            for q in QUANTILES:
+                lines.append(f'{prefix}{{phase="{name}",quantile="{q}"}} {stats[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f'{prefix}_sum{{phase="{name}"}} {stats["sum"]:.6f}')
+            lines.append(f'{prefix}_count{{phase="{name}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Ecrit le fichier de facon atomique : texte Prometheus si `path` finit par .prom ou .txt, JSON sinon."""
+        if path.endswith((".prom", ".txt")):
+            payload = self.to_prometheus()
+        else:
+            payload = json.dumps({"updated": time.time(), "phases": self.snapshot()}, indent=2)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+
+class MetricsExporter:
+    """Ecrit le registre dans `path` au plus une fois toutes les `interval` secondes."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 30.0) -> None:
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def maybe_write(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last < self.interval:
+                return False
+            self._last = now
+        try:
+            self.registry.write(self.path)
+        except OSError:
+            return False
+        return True
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "rows", "_start")
+
+    def __init__(self, profile: "RerunProfile", name: str, rows: Optional[int]) -> None:
+        self.profile = profile
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self) -> "_Phase":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.profile.record(self.name, time.perf_counter() - self._start, self.rows)
+
+
+class _NullPhase:
+    """Phase inactive : un seul objet partage, aucun appel d'horloge."""
+
+    __slots__ = ()
+    rows = None
+
+    def __enter__(self) -> "_NullPhase":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def __setattr__(self, name: str, value: object) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class RerunProfile:
+    """Temps et nombre de lignes de chaque phase d'un rerun.
+
+        with profile.phase("search") as p:
+            ids = dataset.select(query)
+            p.rows = len(ids)
+
+    Desactive, `phase()` renvoie un objet partage qui ne fait rien.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, enabled: bool = True) -> None:
+        self.registry = registry
+        self.enabled = enabled
+        self.phases: List[Tuple[str, float, Optional[int]]] = []
+        self.finished = False
+        self._start = time.perf_counter()
+
+    def phase(self, name: str, rows: Optional[int] = None):
+        return _Phase(self, name, rows) if self.enabled else _NULL_PHASE
+
+    def record(self, name: str, seconds: float, rows: Optional[int] = None) -> None:
+        if not self.enabled:
+            return
+        self.phases.append((name, seconds, rows))
+        if self.registry is not None:
+            self.registry.observe(name, seconds)
+
+    def scope(self) -> "RerunProfile":
+        """Profil d'un fragment : celui-ci pendant le rerun complet, un profil neuf
+        quand le fragment est relance seul (ce profil est alors deja termine)."""
+        return RerunProfile(self.registry, self.enabled) if self.finished else self
+
+    def finish(self, name: str = "rerun") -> float:
+        """Enregistre la duree totale depuis la creation du profil et la renvoie."""
+        elapsed = time.perf_counter() - self._start
+        self.record(name, elapsed)
+        self.finished = True
+        return elapsed
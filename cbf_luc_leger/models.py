@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/models.py
+# Modele de donnees d'un resultat de test.
+
+from __future__ import annotations
+
+import calendar
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+ATHLETE_COLUMNS = ["id", "nom", "prenom", "date_saisie", "age", "sexe", "palier"]
+
+# Colonnes derivees a l'insertion : identite du tireur et date du test (secondes epoch, heure locale naive).
+RESULT_COLUMNS = [*ATHLETE_COLUMNS, "tireur_id", "date_test"]
+
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+@dataclass(slots=True)
+class Athlete:
+    id: str
+    nom: str
+    prenom: str
+    date_saisie: str
+    age: int
+    sexe: str
+    palier: int
+
+
+def to_epoch(date_saisie: str) -> int:
+    return calendar.timegm(datetime.strptime(date_saisie[:16], DATE_FORMAT).timetuple())
+
+
+def from_epoch(epoch: int) -> str:
+    """Inverse de `to_epoch` (a la minute)."""
+    return time.strftime(DATE_FORMAT, time.gmtime(epoch))
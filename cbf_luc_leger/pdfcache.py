@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/pdfcache.py
+# Cache des fiches PDF, adresse par le contenu (memoire + disque, LRU borne).
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "fiches")
+
+# A incrementer a chaque changement de mise en page de build_pdf_fiche.
+FICHE_FORMAT_VERSION = 3
+
+
+def fiche_key(fields: dict) -> str:
+    """Empreinte SHA-256 des entrees d'une fiche (champs, textes, date de modification du logo).
+
+    `blocks` (paragraphes deja coupes) derive des textes : il n'entre pas dans l'empreinte.
+    """
+    fields = {k: v for k, v in fields.items() if k != "blocks"}
+    logo_path = fields.get("logo_path")
+    logo_mtime = os.path.getmtime(logo_path) if logo_path and os.path.exists(logo_path) else None
+    payload = json.dumps(
+        {"v": FICHE_FORMAT_VERSION, "logo_mtime": logo_mtime, "fields": fields},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FicheCache:
+    """LRU en memoire (`max_items` fiches) doublee d'un repertoire sur disque (`max_files` fichiers)."""
+
+    def __init__(self, directory: Optional[str] = DEFAULT_CACHE_DIR, max_items: int = 128, max_files: int = 2048) -> None:
+        self.directory = directory
+        self.max_items = max_items
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_or_render(self, render: Callable[..., bytes], **fields: Any) -> bytes:
+        key = fiche_key(fields)
+        data = self.get(key)
+        if data is None:
+            data = render(**fields)
+            self.put(key, data)
+        return data
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Fiche de cle `key` (memoire, puis disque), ou None."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self._remember(key, data)
+        if not self.directory:
+            return
+        tmp = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+            self._prune_disk()
+        except OSError:
+            pass
+
+    def _remember(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith(".pdf")]
+        if len(entries) <= self.max_files:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[: len(entries) - self.max_files]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/physio.py
+# Mesures physiologiques du test Luc Leger : vitesse du palier, VO2max estimee, VMA et allures d'intermittent.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Protocole navette 20 m (Leger et al., 1988) : 8,5 km/h au palier 1, +0,5 km/h par palier d'une minute.
+SPEED_START = 8.5
+SPEED_STEP = 0.5
+
+# Equation adulte a partir de 18 ans, equation jeunes (6-17 ans) en dessous.
+ADULT_AGE = 18
+
+# Cout energetique de la course (ml/kg/min par km/h) : VMA = VO2max / 3,5.
+RUN_COST = 3.5
+
+# Intermittents de suggested_work : format -> (duree d'effort en s, fraction de VMA).
+INTERMITTENTS: Dict[str, Tuple[int, float]] = {
+    "30/30": (30, 1.00),
+    "15/15": (15, 1.10),
+}
+
+# Colonnes ajoutees aux tables (km/h, sauf vo2max en ml/kg/min).
+METRIC_COLUMNS: List[str] = ["vitesse", "vo2max", "vma"] + [f"allure_{fmt.replace('/', '_')}" for fmt in INTERMITTENTS]
+
+
+def _stage_speed(palier):
+    return SPEED_START + SPEED_STEP * (palier - 1)
+
+
+def _vo2_adult(speed):
+    return -24.4 + 6.0 * speed
+
+
+def _vo2_young(speed, age):
+    return 31.025 + 3.238 * speed - 3.248 * age + 0.1536 * speed * age
+
+
+@dataclass(frozen=True)
+class Mesures:
+    """Mesures d'un resultat ; `allures` : format d'intermittent -> vitesse cible en km/h."""
+
+    vitesse: float
+    vo2max: float
+    vma: float
+    allures: Dict[str, float]
+
+    def distance(self, fmt: str) -> int:
+        """Distance a couvrir par effort du format `fmt`, arrondie a 5 m."""
+        seconds, _ = INTERMITTENTS[fmt]
+        return int(round(self.allures[fmt] / 3.6 * seconds / 5) * 5)
+
+    def resume(self) -> Dict[str, str]:
+        """Libelle -> valeur affichee (panneau d'analyse et fiche PDF)."""
+        lines = {
+            "Vitesse du dernier palier": f"{self.vitesse:.1f} km/h",
+            "VO2max estimee (Leger)": f"{self.vo2max:.1f} ml/kg/min",
+            "VMA estimee": f"{self.vma:.1f} km/h",
+        }
+        for fmt, (seconds, _) in INTERMITTENTS.items():
+            lines[f"Allure {fmt}"] = f"{self.allures[fmt]:.1f} km/h, soit {self.distance(fmt)} m par {seconds} s"
+        return lines
+
+
+def mesures_for(age: int, palier: int) -> Mesures:
+    """Mesures d'un resultat (calcul scalaire, sans numpy)."""
+    speed = _stage_speed(palier)
+    vo2 = _vo2_adult(speed) if age >= ADULT_AGE else _vo2_young(speed, age)
+    vma = vo2 / RUN_COST
+    return Mesures(
+        vitesse=round(speed, 1),
+        vo2max=round(vo2, 1),
+        vma=round(vma, 1),
+        allures={fmt: round(vma * share, 1) for fmt, (_, share) in INTERMITTENTS.items()},
+    )
+
+
+def metrics_arrays(ages, paliers) -> Dict[str, np.ndarray]:
+    """Colonnes METRIC_COLUMNS (au dixieme), vectorise sur des tableaux d'ages et de paliers."""
+    import numpy as np
+
+    ages = np.asarray(ages, dtype=np.float64)
+    speed = _stage_speed(np.asarray(paliers, dtype=np.float64))
+    vo2 = np.where(ages >= ADULT_AGE, _vo2_adult(speed), _vo2_young(speed, ages))
+    vma = vo2 / RUN_COST
+    values = [speed, vo2, vma] + [vma * share for _, share in INTERMITTENTS.values()]
+    return {name: np.round(v, 1) for name, v in zip(METRIC_COLUMNS, values)}
+
+
+def add_metrics(frame: pd.DataFrame) -> pd.DataFrame:
+    """Copie de `frame` (colonnes age et palier) avec les colonnes METRIC_COLUMNS."""
+    return frame.assign(**metrics_arrays(frame["age"].to_numpy(), frame["palier"].to_numpy()))
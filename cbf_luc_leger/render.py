@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/render.py
+# Rendu des fiches PDF hors du thread du script : pool borne, demandes identiques fusionnees, statut consultable.
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cbf_luc_leger.fiche import build_pdf_fiche
+from cbf_luc_leger.pdfcache import FicheCache, fiche_key
+
+DEFAULT_WORKERS = 2
+
+PENDING = "en attente"
+RUNNING = "en cours"
+DONE = "prete"
+FAILED = "echec"
+
+
+def _timed(render: Callable[..., bytes], fields: Dict[str, Any]) -> Tuple[bytes, float]:
+    t0 = time.perf_counter()
+    pdf = render(**fields)
+    return pdf, time.perf_counter() - t0
+
+
+class RenderJob:
+    """Poignee d'un rendu, partagee par toutes les demandes de la meme fiche."""
+
+    def __init__(self, key: str, future: Future) -> None:
+        self.key = key
+        self._future = future
+
+    @property
+    def status(self) -> str:
+        f = self._future
+        if f.done():
+            return FAILED if f.cancelled() or f.exception() is not None else DONE
+        return RUNNING if f.running() else PENDING
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin du rendu au plus `timeout` secondes ; True s'il est fini."""
+        return bool(wait_futures([self._future], timeout).done)
+
+    def result(self, timeout: Optional[float] = None) -> bytes:
+        """Octets du PDF ; attend au plus `timeout` secondes, releve l'erreur du rendu s'il a echoue."""
+        return self._future.result(timeout)[0]
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        if not self._future.done() or self._future.cancelled():
+            return None
+        return self._future.exception()
+
+
+class RenderService:
+    """File de rendus de fiches sur un pool de `max_workers` threads (ou processus si `processes`).
+
+    - `submit(**champs)` rend la main tout de suite avec un RenderJob ; une fiche deja
+      dans `cache` est servie sans rendu, une fiche deja en vol renvoie la meme poignee ;
+    - `find(**champs)` renvoie cette poignee sans jamais lancer de rendu (None sinon) ;
+    - le resultat est range dans `cache` des la fin du rendu ;
+    - `observe(secondes)` recoit la duree de chaque rendu (metriques).
+
+    `max_workers` borne les rendus simultanes : une rafale de PDF attend son tour dans la
+    file au lieu d'occuper tous les coeurs au detriment des reruns interactifs.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[FicheCache] = None,
+        *,
+        max_workers: int = DEFAULT_WORKERS,
+        processes: bool = False,
+        render: Callable[..., bytes] = build_pdf_fiche,
+        observe: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self._render = render
+        self._observe = observe
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, RenderJob] = {}
+        if processes:
+            ctx = multiprocessing.get_context("spawn")
+            self._pool: Executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fiche-pdf")
+
+    def find(self, **fields: Any) -> Optional[RenderJob]:
+        return self._find(fiche_key(fields))
+
+    def _find(self, key: str) -> Optional[RenderJob]:
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is not None:
+            return job
+        data = self.cache.get(key) if self.cache else None
+        if data is None:
+            return None
+        future: Future = Future()
+        future.set_result((data, 0.0))
+        return RenderJob(key, future)
+
+    def submit(self, **fields: Any) -> RenderJob:
+        key = fiche_key(fields)
+        job = self._find(key)
+        if job is not None:
+            return job
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                return job
+            job = self._jobs[key] = RenderJob(key, self._pool.submit(_timed, self._render, fields))
+        # Hors du verrou : un rendu deja termine appelle _finish tout de suite, dans ce thread.
+        job._future.add_done_callback(lambda f: self._finish(key, f))
+        return job
+
+    def _finish(self, key: str, future: Future) -> None:
+        # En cache avant de quitter la table des rendus en vol : aucune demande ne relance le rendu entre les deux.
+        if not future.cancelled() and future.exception() is None:
+            pdf, seconds = future.result()
+            if self.cache:
+                self.cache.put(key, pdf)
+            if self._observe:
+                self._observe(seconds)
+        with self._lock:
+            self._jobs.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Rendus en attente ou en cours."""
+        with self._lock:
+            return len(self._jobs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
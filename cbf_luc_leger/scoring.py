@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/scoring.py
+# Barème club et calcul du niveau (scalaire et vectorise).
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+# -----------------------------
+# Barème club (pédagogique)
+# -----------------------------
+BAREME: Dict[str, Dict[str, Dict[int, str]]] = {
+    "M": {
+        "15-19": {7: "Faible", 8: "Moyen-", 9: "Moyen", 10: "Moyen+", 11: "Bon", 12: "Tres bon", 13: "Excellent", 14: "Elite", 15: "Elite+"},
+        "20-24": {7: "Faible", 8: "Moyen-", 9: "Moyen", 10: "Bon", 11: "Tres bon", 12: "Excellent", 13: "Elite", 14: "Elite+", 15: "Elite+"},
+        "25-29": {7: "Faible", 8: "Moyen", 9: "Moyen+", 10: "Bon", 11: "Tres bon", 12: "Excellent", 13: "Elite", 14: "Elite+", 15: "Elite+"},
+        "30-34": {7: "Faible", 8: "Moyen", 9: "Bon", 10: "Tres bon", 11: "Excellent", 12: "Elite", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "35-39": {7: "Faible", 8: "Moyen+", 9: "Bon", 10: "Tres bon", 11: "Excellent", 12: "Elite", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "40-44": {7: "Moyen-", 8: "Moyen+", 9: "Bon", 10: "Tres bon", 11: "Excellent", 12: "Elite", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "45-49": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "50-54": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "55-60": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+    },
+    "F": {
+        "15-19": {7: "Moyen-", 8: "Moyen", 9: "Bon", 10: "Tres bon", 11: "Excellent", 12: "Elite", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "20-24": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "25-29": {7: "Moyen", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "30-34": {7: "Moyen+", 8: "Bon", 9: "Tres bon", 10: "Excellent", 11: "Elite", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "35-39": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "40-44": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "45-49": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "50-54": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+        "55-60": {7: "Bon", 8: "Tres bon", 9: "Excellent", 10: "Elite", 11: "Elite+", 12: "Elite+", 13: "Elite+", 14: "Elite+", 15: "Elite+"},
+    },
+}
+
+
+def clamp(n: int, lo: int, hi: int) -> int:
+    return max(lo, min(hi, n))
+
+
+def age_band(age: int) -> str:
+    a = clamp(age, 15, 60)
+    start = ((a - 15) // 5) * 5 + 15
+    end = start + 4
+    return f"{start}-{end}"
+
+
+def level_raw(sex: str, age: int, palier: int) -> str:
+    sex = "M" if sex == "M" else "F"
+    band = age_band(age)
+    p = clamp(palier, 7, 15)
+    return BAREME.get(sex, {}).get(band, {}).get(p, "-")
+
+
+def to_level5(raw: str) -> str:
+    if raw == "Faible":
+        return "Insuffisant"
+    if raw in ("Moyen-", "Moyen", "Moyen+"):
+        return "Moyen"
+    if raw == "Bon":
+        return "Bon"
+    if raw == "Tres bon":
+        return "Très Bon"
+    if raw in ("Excellent", "Elite", "Elite+"):
+        return "Excellent"
+    return "-"
+
+
+# Table dense (sexe, tranche d'age, palier) -> code niveau, compilee une fois
+# a partir de BAREME et to_level5. level_for et levels_for lisent la meme table ;
+# numpy et pandas ne sont importes qu'au premier calcul vectorise.
+AGE_MIN, AGE_MAX = 15, 60
+PALIER_MIN, PALIER_MAX = 7, 15
+LEVEL5_ORDER: List[str] = ["Insuffisant", "Moyen", "Bon", "Très Bon", "Excellent", "-"]
+
+_N_BANDS = (AGE_MAX - AGE_MIN) // 5 + 1
+_N_PALIERS = PALIER_MAX - PALIER_MIN + 1
+
+
+def _compile_levels() -> bytes:
+    return bytes(
+        LEVEL5_ORDER.index(to_level5(level_raw(sex, AGE_MIN + 5 * bi, PALIER_MIN + pi)))
+        for sex in ("M", "F")
+        for bi in range(_N_BANDS)
+        for pi in range(_N_PALIERS)
+    )
+
+
+_LEVEL_CODES = _compile_levels()
+
+
+@lru_cache(maxsize=None)
+def level_table() -> np.ndarray:
+    """Vue numpy (2, tranches, paliers) en lecture seule sur la table compilee."""
+    import numpy as np
+
+    return np.frombuffer(_LEVEL_CODES, dtype=np.int8).reshape(2, _N_BANDS, _N_PALIERS)
+
+
+def level_codes(sexes, ages, paliers) -> np.ndarray:
+    import numpy as np
+
+    s = (np.asarray(sexes, dtype=object) != "M").astype(np.intp)
+    b = (np.clip(np.asarray(ages, dtype=np.int64), AGE_MIN, AGE_MAX) - AGE_MIN) // 5
+    p = np.clip(np.asarray(paliers, dtype=np.int64), PALIER_MIN, PALIER_MAX) - PALIER_MIN
+    return level_table()[s, b, p]
+
+
+def levels_for(sexes, ages, paliers) -> pd.Categorical:
+    import pandas as pd
+
+    return pd.Categorical.from_codes(level_codes(sexes, ages, paliers), categories=LEVEL5_ORDER)
+
+
+def level_for(sex: str, age: int, palier: int) -> str:
+    s = 0 if sex == "M" else 1
+    b = (clamp(age, AGE_MIN, AGE_MAX) - AGE_MIN) // 5
+    p = clamp(palier, PALIER_MIN, PALIER_MAX) - PALIER_MIN
+    return LEVEL5_ORDER[_LEVEL_CODES[(s * _N_BANDS + b) * _N_PALIERS + p]]
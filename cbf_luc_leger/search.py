@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/search.py
+# Index de recherche des resultats (noms sans accents, n-grammes, paliers/ages).
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from array import array
+from collections import defaultdict
+from functools import partial
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from cbf_luc_leger.columns import StringPool
+
+NGRAM = 3
+NUMERIC_FIELDS = ("age", "palier")
+NAME_FIELDS = ("nom", "prenom")
+
+_TERM = re.compile(r"^(nom|prenom|sexe|age|palier)(>=|<=|:|=|>|<)(.+)$")
+_COMPARE = {
+    ":": lambda v, n: v == n,
+    "=": lambda v, n: v == n,
+    ">": lambda v, n: v > n,
+    "<": lambda v, n: v < n,
+    ">=": lambda v, n: v >= n,
+    "<=": lambda v, n: v <= n,
+}
+
+
+def fold(text: str) -> str:
+    """Minuscules sans accents ("Éloïse" -> "eloise")."""
+    return "".join(c for c in unicodedata.normalize("NFKD", str(text)) if not unicodedata.combining(c)).lower()
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        self.ids = array("i")
+
+
+class SearchIndex:
+    """Index incremental : chaque ajout recoit l'identifiant de ligne suivant (0, 1, 2...).
+
+    Requete : termes separes par des espaces, tous obligatoires.
+    - terme libre : contenu dans le nom ou le prenom, l'age, le palier ou le sexe ;
+    - `nom:dup`, `prenom:li` : prefixe d'un des mots du champ ;
+    - `sexe:F`, `age:22`, `palier>=11`, `age<30`... : valeur exacte ou comparaison.
+
+    Listes de lignes en `array("i")` (4 octets par entree) ; les noms sans accents sont
+    mis bout a bout en UTF-8 ("nom\\x00prenom") dans un seul tampon, `_offsets` en delimite chaque ligne.
+    """
+
+    def __init__(self) -> None:
+        self._size = 0
+        self._text = bytearray()
+        self._offsets = array("q", [0])
+        self._grams: Dict[str, array] = defaultdict(partial(array, "i"))
+        self._tries = {field: _TrieNode() for field in NAME_FIELDS}
+        self._buckets: Dict[str, Dict] = {field: defaultdict(partial(array, "i")) for field in (*NUMERIC_FIELDS, "sexe")}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_many(self, nom: np.ndarray, prenom: np.ndarray, ages, sexes, paliers, strings: StringPool) -> None:
+        """Ajoute un lot de lignes ; `nom` / `prenom` sont des codes de `strings`.
+
+        Nom sans accents, n-grammes et mots ne sont calcules qu'une fois par chaine
+        distincte du lot, puis les lignes sont versees en bloc dans chaque liste.
+        """
+        start, n = self._size, len(nom)
+        if not n:
+            return
+        rows = np.arange(start, start + n, dtype=np.int32)
+        names = [np.unique(codes, return_inverse=True) for codes in (nom, prenom)]
+        folded = {code: fold(strings.value(code)) for distinct, _ in names for code in distinct.tolist()}
+
+        encoded = {code: name.encode() for code, name in folded.items()}
+        self._text += b"".join(chain.from_iterable((encoded[a], b"\x00", encoded[b]) for a, b in zip(nom.tolist(), prenom.tolist())))
+        lengths = np.fromiter((len(encoded[a]) + 1 + len(encoded[b]) for a, b in zip(nom.tolist(), prenom.tolist())), dtype=np.int64, count=n)
+        self._offsets.frombytes((np.cumsum(lengths) + self._offsets[-1]).tobytes())
+
+        # Un n-gramme present dans le nom et le prenom d'une ligne n'y est compte qu'une fois.
+        gram_ids: Dict[str, int] = {}
+        sources = []
+        for distinct, code_of in names:
+            code_grams = [[gram_ids.setdefault(gram, len(gram_ids)) for gram in _grams(folded[code])] for code in distinct.tolist()]
+            sources.append((code_of.ravel(), code_grams))
+        grams = list(gram_ids)
+        for gram, ids in _postings(rows, *sources):
+            self._grams[grams[gram]].frombytes(ids.tobytes())
+
+        for field, (distinct, code_of) in zip(NAME_FIELDS, names):
+            nodes: List[_TrieNode] = []
+            node_ids: Dict[int, int] = {}
+            code_nodes = []
+            for code in distinct.tolist():
+                reached: Set[int] = set()
+                for token in set(folded[code].split()):
+                    node = self._tries[field]
+                    for ch in token:
+                        node = node.children.setdefault(ch, _TrieNode())
+                        if id(node) not in node_ids:
+                            node_ids[id(node)] = len(nodes)
+                            nodes.append(node)
+                        reached.add(node_ids[id(node)])
+                code_nodes.append(list(reached))
+            for node, ids in _postings(rows, (code_of.ravel(), code_nodes)):
+                nodes[node].ids.frombytes(ids.tobytes())
+
+        for field, values in (("age", ages), ("palier", paliers), ("sexe", sexes)):
+            distinct, value_of = np.unique(np.asarray(values), return_inverse=True)
+            keys = [fold(v) if field == "sexe" else int(v) for v in distinct.tolist()]
+            for key, ids in _postings(rows, (value_of.ravel(), [[i] for i in range(len(keys))])):
+                self._buckets[field][keys[key]].frombytes(ids.tobytes())
+        self._size += n
+
+    def search(self, query: str) -> np.ndarray:
+        """Identifiants de lignes (croissants) qui satisfont tous les termes."""
+        result: Optional[np.ndarray] = None
+        for term in fold(query).split():
+            ids = self._match(term)
+            result = ids if result is None else _intersect(result, ids)
+            if not len(result):
+                break
+        if result is None:
+            return np.arange(self._size, dtype=np.int64)
+        return result.astype(np.int64, copy=False)
+
+    def _match(self, term: str) -> np.ndarray:
+        m = _TERM.match(term)
+        if m:
+            field, op, value = m.groups()
+            if field in NAME_FIELDS and op == ":":
+                return self._prefix(field, value)
+            if field == "sexe" and op in (":", "="):
+                return _ids(self._buckets["sexe"].get(value, _EMPTY)).copy()
+            if field in NUMERIC_FIELDS and value.isdigit():
+                n = int(value)
+                return self._union(ids for v, ids in self._buckets[field].items() if _COMPARE[op](v, n))
+        return self._free(term)
+
+    def _prefix(self, field: str, prefix: str) -> np.ndarray:
+        node = self._tries[field]
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return _ids(_EMPTY)
+        return _ids(node.ids).copy()
+
+    def _free(self, term: str) -> np.ndarray:
+        matches = [ids for v, ids in self._buckets["sexe"].items() if term in v]
+        for field in NUMERIC_FIELDS:
+            matches.extend(ids for v, ids in self._buckets[field].items() if term in str(v))
+        if len(term) <= NGRAM:
+            found = _ids(self._grams.get(term, _EMPTY)).copy()
+        else:
+            postings = sorted((self._grams.get(term[i : i + NGRAM], _EMPTY) for i in range(len(term) - NGRAM + 1)), key=len)
+            found = _ids(postings[0]).copy()
+            for ids in postings[1:]:
+                if not len(found):
+                    break
+                found = _intersect(found, _ids(ids))
+            # Les n-grammes donnent des candidats ; le terme entier doit figurer dans le nom ou le prenom.
+            found = self._contains(found, term.encode())
+        if not matches:
+            return found
+        return self._union([*matches, found])
+
+    def _contains(self, rows: np.ndarray, needle: bytes) -> np.ndarray:
+        """Lignes de `rows` dont le texte contient `needle` ; les positions candidates sont
+        filtrees octet par octet, en tableaux (aucune boucle Python par ligne)."""
+        text = np.frombuffer(self._text, dtype=np.uint8)
+        offsets = np.frombuffer(self._offsets, dtype=np.int64)
+        starts = offsets[rows]
+        counts = np.maximum(offsets[rows + 1] - starts - len(needle) + 1, 0)
+        pos = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        for k, byte in enumerate(needle):
+            pos = pos[text[pos + k] == byte]
+        hits = (np.searchsorted(offsets, pos, side="right") - 1).astype(np.int32)
+        # Positions croissantes : les doublons d'une meme ligne sont adjacents.
+        return hits[np.r_[True, hits[1:] != hits[:-1]]] if len(hits) else hits
+
+    def _union(self, postings: Iterable[Any]) -> np.ndarray:
+        """Union triee de listes de lignes, par un masque sur toutes les lignes (aucun tri)."""
+        mask = np.zeros(self._size, dtype=bool)
+        for ids in postings:
+            mask[_ids(ids)] = True
+        return np.flatnonzero(mask).astype(np.int32)
+
+
+_EMPTY = array("i")
+
+
+def _grams(name: str) -> Set[str]:
+    """Sous-chaines de 1 a NGRAM caracteres."""
+    return {name[i : i + size] for size in range(1, NGRAM + 1) for i in range(len(name) - size + 1)}
+
+
+def _postings(rows: np.ndarray, *sources: Tuple[np.ndarray, List[List[int]]]) -> Iterator[Tuple[int, np.ndarray]]:
+    """(element, lignes croissantes) : pour chaque source `(keys, items)`, la ligne `rows[i]`
+    va dans chaque element de `items[keys[i]]`.
+
+    Tout le lot est deplie en couples (element, ligne), tries (et dedoublonnes entre
+    sources) sur une cle entiere unique, sans boucle Python par ligne.
+    """
+    n = len(rows)
+    pairs = []
+    for keys, items in sources:
+        lengths = np.array([len(x) for x in items], dtype=np.int64)
+        flat = np.fromiter(chain.from_iterable(items), dtype=np.int64, count=int(lengths.sum()))
+        counts = lengths[keys]
+        pos = np.repeat(np.cumsum(lengths)[keys] - lengths[keys] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        pairs.append(flat[pos] * n + np.repeat(np.arange(n), counts))
+    pairs = np.sort(np.concatenate(pairs))
+    if len(sources) > 1:
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+    element, ids = np.divmod(pairs, n)
+    ids = rows[ids]
+    bounds = np.flatnonzero(np.r_[True, element[1:] != element[:-1], True])
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        yield int(element[lo]), ids[lo:hi]
+
+
+def _ids(postings: Any) -> np.ndarray:
+    """Vue numpy d'une liste `array("i")` (a copier avant de la garder : l'array ne peut plus grandir tant qu'elle vit)."""
+    return postings if isinstance(postings, np.ndarray) else np.frombuffer(postings, dtype=np.int32)
+
+
+def _intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersection de deux listes croissantes sans doublon : la plus courte est cherchee
+    par dichotomie dans l'autre, O(k log n) au lieu du tri de la concatenation."""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    at = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[at] == a]
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/sorting.py
+# Ordres de tri tenus a jour a chaque ajout, pour paginer sans retrier.
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import numpy as np
+
+
+class SortIndex:
+    """Identifiants de ligne tries par une cle, fusionnes au fil des ajouts.
+
+    Un ajout de k lignes trie ces k cles puis les insere par `searchsorted` : cout
+    O(k log k + n) en copie memoire, jamais un tri complet. A cle egale, l'ordre est
+    celui d'insertion (identifiant de ligne croissant). Les lignes sont en int32 ; des
+    cles `np.bytes_` s'elargissent a la plus longue cle ajoutee.
+    """
+
+    def __init__(self, dtype: Any) -> None:
+        self._keys = np.empty(0, dtype=dtype)
+        self._rows = np.empty(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, start: int, keys: np.ndarray) -> None:
+        """Ajoute les lignes `start`, `start + 1`, ... de cles `keys`."""
+        if self._keys.dtype.kind == "S":
+            keys = np.asarray(keys, dtype=np.bytes_)
+            if keys.dtype.itemsize > self._keys.dtype.itemsize:
+                self._keys = self._keys.astype(keys.dtype)
+        keys = np.asarray(keys, dtype=self._keys.dtype)
+        local = np.argsort(keys, kind="stable")
+        keys = keys[local]
+        at = np.searchsorted(self._keys, keys, side="right")
+        self._keys = np.insert(self._keys, at, keys)
+        self._rows = np.insert(self._rows, at, (local + start).astype(np.int32))
+
+    def find(self, key: Any) -> np.ndarray:
+        """Lignes de cle `key`, par recherche dichotomique."""
+        key = np.asarray(key, dtype=self._keys.dtype)
+        lo, hi = np.searchsorted(self._keys, key, side="left"), np.searchsorted(self._keys, key, side="right")
+        return self._rows[lo:hi]
+
+    def between(self, low: Any, high: Any) -> np.ndarray:
+        """Lignes de cle comprise dans [low, high], par cle croissante."""
+        lo = np.searchsorted(self._keys, np.asarray(low, dtype=self._keys.dtype), side="left")
+        hi = np.searchsorted(self._keys, np.asarray(high, dtype=self._keys.dtype), side="right")
+        return self._rows[lo:hi]
+
+    def order(self, ids: Optional[np.ndarray] = None, descending: bool = False, last: Any = None) -> np.ndarray:
+        """Lignes dans l'ordre de la cle, restreintes a `ids` si fourni (filtrage en O(n), sans tri).
+
+        Les lignes de cle `last` (ex. non note) viennent apres les autres dans les deux sens.
+        """
+        rows = self._rows
+        if last is not None:
+            key = np.asarray(last, dtype=self._keys.dtype)
+            lo, hi = np.searchsorted(self._keys, key, side="left"), np.searchsorted(self._keys, key, side="right")
+            rest, tail = np.concatenate([rows[:lo], rows[hi:]]), rows[lo:hi]
+            if descending:
+                rest, tail = rest[::-1], tail[::-1]
+            rows, descending = np.concatenate([rest, tail]), False
+        if ids is not None:
+            keep = np.zeros(len(rows), dtype=bool)
+            keep[ids] = True
+            rows = rows[keep[rows]]
+        return rows[::-1] if descending else rows
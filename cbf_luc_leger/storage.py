@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/storage.py
+# Stockage durable des resultats (SQLite local, mode WAL).
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import uuid
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from cbf_luc_leger.models import ATHLETE_COLUMNS, RESULT_COLUMNS, Athlete, to_epoch
+from cbf_luc_leger.search import fold
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas n'est importe que par les methodes qui renvoient un DataFrame.
+
+DEFAULT_DB_PATH = "cbf_luc_leger.db"
+
+# `athletes` contient un resultat par ligne ; `tireurs` regroupe les resultats d'une meme
+# personne (meme nom, prenom et sexe, sans tenir compte des accents ni de la casse).
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS athletes (
+    id TEXT PRIMARY KEY,
+    nom TEXT NOT NULL,
+    prenom TEXT NOT NULL,
+    date_saisie TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    sexe TEXT NOT NULL,
+    palier INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tireurs (
+    tireur_id TEXT PRIMARY KEY,
+    cle TEXT NOT NULL UNIQUE,
+    nom TEXT NOT NULL,
+    prenom TEXT NOT NULL,
+    sexe TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_athletes_nom_prenom ON athletes (nom, prenom);
+CREATE INDEX IF NOT EXISTS idx_athletes_date_saisie ON athletes (date_saisie);
+CREATE INDEX IF NOT EXISTS idx_athletes_sexe ON athletes (sexe);
+CREATE INDEX IF NOT EXISTS idx_athletes_palier ON athletes (palier);
+"""
+
+_HISTORY_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_athletes_tireur_date ON athletes (tireur_id, date_test);
+CREATE INDEX IF NOT EXISTS idx_athletes_date_test ON athletes (date_test);
+"""
+
+_INSERT = f"INSERT INTO athletes ({', '.join(RESULT_COLUMNS)}) VALUES ({', '.join('?' * len(RESULT_COLUMNS))})"
+
+
+def tireur_key(nom: str, prenom: str, sexe: str) -> str:
+    return "|".join((" ".join(fold(nom).split()), " ".join(fold(prenom).split()), sexe))
+
+
+class AthleteRepository:
+    """Acces aux resultats. Une seule connexion partagee entre les sessions, protegee par un verrou.
+
+    Plusieurs processus peuvent ouvrir la meme base : les ecritures prennent le verrou
+    d'ecriture SQLite des le debut de la transaction (BEGIN IMMEDIATE) et attendent
+    jusqu'a `timeout` secondes qu'il se libere.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, timeout: float = 30.0) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate_history()
+
+    def _migrate_history(self) -> None:
+        """Ajoute tireur_id / date_test aux bases creees avant l'historique et les renseigne."""
+        cols = {row[1] for row in self._conn.execute("PRAGMA table_info(athletes)")}
+        with self._conn:
+            if "tireur_id" not in cols:
+                self._conn.execute("ALTER TABLE athletes ADD COLUMN tireur_id TEXT")
+            if "date_test" not in cols:
+                self._conn.execute("ALTER TABLE athletes ADD COLUMN date_test INTEGER")
+            self._conn.executescript(_HISTORY_INDEXES)
+            pending = self._conn.execute(
+                "SELECT rowid, nom, prenom, sexe, date_saisie FROM athletes WHERE tireur_id IS NULL OR date_test IS NULL"
+            ).fetchall()
+            cache: Dict[str, str] = {}
+            self._conn.executemany(
+                "UPDATE athletes SET tireur_id = ?, date_test = ? WHERE rowid = ?",
+                [(self._tireur_id(nom, prenom, sexe, cache), to_epoch(date_saisie), rowid) for rowid, nom, prenom, sexe, date_saisie in pending],
+            )
+
+    def _tireur_id(self, nom: str, prenom: str, sexe: str, cache: Dict[str, str]) -> str:
+        """Identifiant du tireur, cree au besoin (a appeler dans une transaction ouverte)."""
+        key = tireur_key(nom, prenom, sexe)
+        tireur_id = cache.get(key)
+        if tireur_id is None:
+            row = self._conn.execute("SELECT tireur_id FROM tireurs WHERE cle = ?", (key,)).fetchone()
+            if row:
+                tireur_id = row[0]
+            else:
+                tireur_id = str(uuid.uuid4())
+                self._conn.execute(
+                    "INSERT INTO tireurs (tireur_id, cle, nom, prenom, sexe) VALUES (?, ?, ?, ?, ?)",
+                    (tireur_id, key, nom, prenom, sexe),
+                )
+            cache[key] = tireur_id
+        return tireur_id
+
+    def _with_history(self, rows: Iterable[Sequence], cache: Dict[str, str]) -> Iterator[tuple]:
+        for row in rows:
+            _, nom, prenom, date_saisie, _, sexe, _ = row
+            yield (*row, self._tireur_id(nom, prenom, sexe, cache), to_epoch(date_saisie))
+
+    def add(self, athlete: Athlete) -> None:
+        self.add_many([tuple(getattr(athlete, name) for name in ATHLETE_COLUMNS)])
+
+    def add_many(self, rows: Iterable[Sequence]) -> int:
+        """Insere des tuples (dans l'ordre de ATHLETE_COLUMNS) en une seule transaction.
+
+        `rows` peut etre un generateur : il est consomme au fil de l'insertion.
+        """
+        with self._lock, self._conn:
+            # Verrou d'ecriture pris avant la lecture des tireurs : pas de doublon de cle
+            # entre deux processus qui creent le meme tireur en meme temps.
+            self._conn.execute("BEGIN IMMEDIATE")
+            return self._conn.executemany(_INSERT, self._with_history(rows, {})).rowcount
+
+    def get(self, athlete_id: str) -> Optional[Athlete]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(ATHLETE_COLUMNS)} FROM athletes WHERE id = ?", (athlete_id,)
+            ).fetchone()
+        return Athlete(*row) if row else None
+
+    def kpis(self) -> Tuple[int, int, int, Optional[float]]:
+        """(total, masculin, feminin, palier moyen) en une seule requete d'agregat."""
+        with self._lock:
+            total, nb_m, nb_f, avg_palier = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(sexe = 'M'), 0), COALESCE(SUM(sexe = 'F'), 0), AVG(palier) FROM athletes"
+            ).fetchone()
+        return int(total), int(nb_m), int(nb_f), avg_palier
+
+    def frame(self, columns: Sequence[str] = ATHLETE_COLUMNS, limit: Optional[int] = None) -> pd.DataFrame:
+        """Resultats les plus recents en premier, limites aux colonnes demandees."""
+        import pandas as pd
+
+        self._check_columns(columns)
+        sql = f"SELECT {', '.join(columns)} FROM athletes ORDER BY rowid DESC"
+        params: Tuple = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (int(limit),)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return pd.DataFrame.from_records(rows, columns=list(columns))
+
+    def frame_since(self, rowid: int, columns: Sequence[str] = RESULT_COLUMNS) -> pd.DataFrame:
+        """Lignes inserees apres `rowid`, les plus anciennes en premier, avec leur colonne `rowid`."""
+        import pandas as pd
+
+        self._check_columns(columns)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT rowid, {', '.join(columns)} FROM athletes WHERE rowid > ? ORDER BY rowid", (int(rowid),)
+            ).fetchall()
+        return pd.DataFrame.from_records(rows, columns=["rowid", *columns])
+
+    @staticmethod
+    def _check_columns(columns: Sequence[str]) -> None:
+        unknown = set(columns) - set(RESULT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Colonnes inconnues: {sorted(unknown)}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# cbf_luc_leger/tabular.py
+# Export des resultats en table : CSV par blocs, Parquet et Arrow IPC (colonnes typees, compressees).
+
+from __future__ import annotations
+
+import io
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Union
+
+from cbf_luc_leger.columns import SEXES
+from cbf_luc_leger.physio import METRIC_COLUMNS
+from cbf_luc_leger.scoring import AGE_MAX, AGE_MIN, LEVEL5_ORDER, age_band
+
+CHUNK_ROWS = 50_000
+
+# Format -> (extension, type MIME).
+TABLE_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "arrow": (".arrow", "application/vnd.apache.arrow.file"),
+}
+
+# Colonnes des exports typés (Parquet / Arrow) : noms bruts, types conserves.
+EXPORT_COLUMNS = ["id", "tireur_id", "nom", "prenom", "date_test", "age", "sexe", "palier", "niveau", "delta_palier", "delta_niveau", *METRIC_COLUMNS]
+
+# Type Arrow de chaque colonne exportable (exports de l'application et de la CLI). Le schema
+# des fichiers en derive : il ne depend pas du premier bloc, qui peut etre vide.
+COLUMN_TYPES: Dict[str, str] = {
+    "ligne": "int64",
+    "id": "string",
+    "tireur_id": "string",
+    "nom": "string",
+    "prenom": "string",
+    "date_saisie": "string",
+    "date_test": "timestamp",
+    "age": "int8",
+    "sexe": "category",
+    "palier": "int8",
+    "tranche": "category",
+    "niveau": "category",
+    "delta_palier": "int16",
+    "delta_niveau": "int16",
+    **{name: "float64" for name in METRIC_COLUMNS},
+}
+
+# Valeurs des colonnes "category" : un seul dictionnaire par colonne pour tout le fichier
+# (Arrow IPC refuse qu'il change d'un bloc a l'autre).
+CATEGORIES: Dict[str, List[str]] = {
+    "sexe": SEXES,
+    "tranche": [age_band(a) for a in range(AGE_MIN, AGE_MAX + 1, 5)],
+    "niveau": LEVEL5_ORDER,
+}
+
+
+def arrow_schema(columns: Sequence[str]):
+    """Schema Arrow des colonnes `columns` (noms de COLUMN_TYPES) ; leve ValueError pour une colonne inconnue."""
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "timestamp": pa.timestamp("s"),
+        "category": pa.dictionary(pa.int8(), pa.string()),
+        "int8": pa.int8(),
+        "int16": pa.int16(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+    }
+    unknown = [c for c in columns if c not in COLUMN_TYPES]
+    if unknown:
+        raise ValueError(f"Colonnes sans type d'export: {', '.join(unknown)}")
+    return pa.schema([(c, types[COLUMN_TYPES[c]]) for c in columns])
+
+
+class TableWriter:
+    """Ecrit une table de colonnes `columns` bloc par bloc dans `out` (chemin ou fichier binaire) au format `fmt`.
+
+    L'en-tete CSV et le schema Arrow (arrow_schema) sont ecrits une fois, meme si des
+    blocs (ou tous) sont vides. Parquet et Arrow sont compresses en zstd.
+    """
+
+    def __init__(self, out: Union[str, BinaryIO], fmt: str, columns: Sequence[str] = EXPORT_COLUMNS) -> None:
+        if fmt not in TABLE_FORMATS:
+            raise ValueError(f"Format inconnu: {fmt} ({', '.join(TABLE_FORMATS)})")
+        if fmt != "csv":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError("Les exports Parquet et Arrow necessitent le paquet pyarrow (pip install pyarrow).") from e
+        self.fmt = fmt
+        self.columns = list(columns)
+        self._out = out
+        self._file: Optional[BinaryIO] = None
+        self._writer: Any = None
+        self._schema: Any = arrow_schema(self.columns) if fmt != "csv" else None
+        self._header_written = False
+        self.rows = 0
+
+    def _open(self) -> None:
+        if self.fmt == "csv":
+            self._file = open(self._out, "wb") if isinstance(self._out, str) else self._out
+        elif self.fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self._out, self._schema, compression="zstd")
+        else:
+            import pyarrow as pa
+
+            self._writer = pa.ipc.new_file(self._out, self._schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+    def write(self, chunk) -> None:
+        if self._file is None and self._writer is None:
+            self._open()
+        chunk = chunk[self.columns]
+        if self.fmt == "csv":
+            self._file.write(chunk.to_csv(index=False, header=not self._header_written).encode("utf-8"))
+            self._header_written = True
+        elif len(chunk):
+            import pandas as pd
+            import pyarrow as pa
+
+            fixed = {c: pd.Categorical(chunk[c], categories=CATEGORIES[c]) for c in self.columns if c in CATEGORIES}
+            table = pa.Table.from_pandas(chunk.assign(**fixed), preserve_index=False).cast(self._schema)
+            self._writer.write_table(table)
+        self.rows += len(chunk)
+
+    def close(self) -> None:
+        if self._file is None and self._writer is None:
+            # Aucun bloc : fichier vide mais valide (en-tete CSV, schema Parquet / Arrow).
+            self._open()
+            if self.fmt == "csv":
+                self._file.write(",".join(self.columns).encode("utf-8") + b"\n")
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None and isinstance(self._out, str):
+            self._file.close()
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def write_table(frame, out: Union[str, BinaryIO], fmt: str, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Ecrit `frame` par tranches de `chunk_rows` lignes (la table texte complete n'est jamais en memoire)."""
+    with TableWriter(out, fmt, columns=list(frame.columns)) as writer:
+        for start in range(0, len(frame), chunk_rows):
+            writer.write(frame.iloc[start : start + chunk_rows])
+    return len(frame)
+
+
+def table_bytes(frame, fmt: str, chunk_rows: int = CHUNK_ROWS) -> bytes:
+    buf = io.BytesIO()
+    write_table(frame, buf, fmt, chunk_rows)
+    return buf.getvalue()
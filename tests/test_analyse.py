@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# tests/test_analyse.py
+
+import itertools
+import os
+
+import pytest
+
+from cbf_luc_leger.analyse import ReportMatrix, analysis_for, build_analysis, interpret_for_assaut, report_matrix
+from cbf_luc_leger.baremes import BUILTIN, BaremeStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASES = list(itertools.product(("M", "F"), range(15, 61), range(7, 16)))
+
+
+@pytest.mark.parametrize("club", [False, True])
+def test_matrix_matches_direct_analysis(club):
+    bareme = BaremeStore().load(os.path.join(ROOT, "baremes", "club.toml")) if club else BUILTIN
+    matrix = ReportMatrix(bareme)
+    assert len(matrix) == len(CASES) == 828
+    for sexe, age, palier in CASES:
+        analysis = matrix.get(sexe, age, palier)
+        assert analysis == build_analysis(sexe, age, palier, bareme), (sexe, age, palier)
+        assert analysis.niveau == bareme.level_for(sexe, age, palier)
+        assert analysis.interpretation == interpret_for_assaut(analysis.niveau)
+
+
+def test_outside_the_matrix_is_computed_directly():
+    assert report_matrix().get("M", 61, 10) is None and report_matrix().blocks("F", 22, 16) is None
+    for case in (("M", 61, 10), ("F", 14, 7), ("F", 22, 16)):
+        assert analysis_for(*case) == build_analysis(*case)
+
+
+def test_blocks_are_computed_once_per_case():
+    pytest.importorskip("reportlab")
+    from cbf_luc_leger.fiche import layout_blocks
+
+    matrix = ReportMatrix()
+    blocks = matrix.blocks("F", 22, 10)
+    a = matrix.get("F", 22, 10)
+    assert blocks == layout_blocks(a.interpretation, a.age_note, a.travail)
+    assert matrix.blocks("F", 22, 10) is blocks
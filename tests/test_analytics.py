@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# tests/test_analytics.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cbf_luc_leger.analytics import ClubAnalytics
+from cbf_luc_leger.baremes import BUILTIN, BaremeStore
+from cbf_luc_leger.scoring import age_band
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def results():
+    rng = np.random.default_rng(7)
+    n = 3000
+    return pd.DataFrame(
+        {
+            "sexe": rng.choice(["M", "F"], n),
+            "age": rng.integers(15, 61, n),
+            "palier": rng.integers(7, 16, n),
+        }
+    ).assign(tranche=lambda df: [age_band(a) for a in df["age"]])
+
+
+@pytest.fixture(scope="module")
+def analytics(results):
+    club = ClubAnalytics()
+    # Par lots, comme les refresh successifs du jeu de donnees.
+    for lo in range(0, len(results), 700):
+        chunk = results.iloc[lo : lo + 700]
+        club.add(chunk["sexe"].to_numpy(), chunk["age"].to_numpy(), chunk["palier"].to_numpy())
+    return club
+
+
+def _counts(table, key):
+    table = table[table["effectif"] > 0]
+    return table.set_index(["sexe", "tranche", key])["effectif"].sort_index()
+
+
+def test_palier_histogram_matches_groupby(results, analytics):
+    expected = results.groupby(["sexe", "tranche", "palier"]).size().sort_index()
+    assert _counts(analytics.palier_table(), "palier").to_dict() == expected.to_dict()
+
+
+@pytest.mark.parametrize("club", [False, True])
+def test_level_histogram_matches_groupby(results, analytics, club):
+    bareme = BaremeStore().load(os.path.join(ROOT, "baremes", "club.toml")) if club else BUILTIN
+    levels = [bareme.level_for(s, a, p) for s, a, p in zip(results["sexe"], results["age"], results["palier"])]
+    expected = results.assign(niveau=levels).groupby(["sexe", "tranche", "niveau"]).size().sort_index()
+    assert _counts(analytics.level_table(bareme), "niveau").to_dict() == expected.to_dict()
+
+
+def test_kpis_and_percentiles(results, analytics):
+    total, nb_m, nb_f, mean = analytics.kpis()
+    assert (total, nb_m, nb_f) == (len(results), (results["sexe"] == "M").sum(), (results["sexe"] == "F").sum())
+    assert mean == pytest.approx(results["palier"].mean())
+
+    # Rang moyen des ex aequo dans la cohorte sexe x tranche, en pourcentage.
+    cohort = results.groupby(["sexe", "tranche"])["palier"]
+    below = cohort.rank(method="min") - 1
+    equal = cohort.rank(method="max") - below
+    expected = 100 * (below + equal / 2) / cohort.transform("size")
+    got = analytics.percentiles(results["sexe"].to_numpy(), results["age"].to_numpy(), results["palier"].to_numpy())
+    np.testing.assert_allclose(got, expected.to_numpy())
+    assert analytics.cohort_size("F", 22) == ((results["sexe"] == "F") & (results["tranche"] == "20-24")).sum()
+
+
+def test_remove_undoes_add(results):
+    club = ClubAnalytics()
+    club.add(results["sexe"], results["age"], results["palier"])
+    club.remove(results["sexe"][:100], results["age"][:100], results["palier"][:100])
+    rest = ClubAnalytics()
+    rest.add(results["sexe"][100:], results["age"][100:], results["palier"][100:])
+    assert (club.counts == rest.counts).all() and len(club) == len(results) - 100
+    assert np.isnan(ClubAnalytics().percentiles(["M"], [22], [10])).all()
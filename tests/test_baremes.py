@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# tests/test_baremes.py
+
+import os
+
+import pytest
+
+from cbf_luc_leger.baremes import BUILTIN, BaremeStore, compile_bareme
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BANDS = ["15-19", "20-24", "25-29", "30-34", "35-39", "40-44", "45-49", "50-54", "55-60"]
+
+
+def _data(**changes):
+    """Bareme complet et valide (tout "Bon"), modifie par `changes`."""
+    grid = {sex: {band: {str(p): "Bon" for p in range(7, 16)} for band in BANDS} for sex in ("M", "F")}
+    data = {"nom": "test", "version": "1", "bareme": grid}
+    data.update(changes)
+    return data
+
+
+def _errors(data):
+    with pytest.raises(ValueError) as info:
+        compile_bareme(data, source="test.toml")
+    assert str(info.value).startswith("test.toml: bareme invalide : ")
+    return str(info.value)
+
+
+def test_valid_bareme_compiles():
+    bareme = compile_bareme(_data())
+    assert bareme.label == "test (1)"
+    assert bareme.level_for("F", 60, 15) == "Bon"
+
+
+def test_club_file_matches_builtin_below_55():
+    # Difference documentee dans club.toml : le bareme integre ne note pas les 55-60 ans.
+    club = BaremeStore().load(os.path.join(ROOT, "baremes", "club.toml"))
+    for sex in ("M", "F"):
+        for palier in range(7, 16):
+            for age in range(15, 55):
+                assert club.level_for(sex, age, palier) == BUILTIN.level_for(sex, age, palier), (sex, age, palier)
+            for age in range(55, 61):
+                assert BUILTIN.level_for(sex, age, palier) == "-"
+                assert club.level_for(sex, age, palier) != "-"
+
+
+def test_missing_name_and_table():
+    message = _errors({"version": "1"})
+    assert "champ 'nom' manquant" in message and "table 'bareme' manquante" in message
+
+
+def test_unknown_sex_and_missing_sex():
+    data = _data()
+    data["bareme"]["X"] = data["bareme"].pop("F")
+    message = _errors(data)
+    assert "bareme.X: sexe inconnu" in message and "bareme.F manquant" in message
+
+
+@pytest.mark.parametrize(
+    "band, expected",
+    [
+        ("15_19", "tranche illisible"),
+        ("16-20", "tranche non alignee"),
+        ("15-22", "tranche non alignee"),
+        ("15-24", "chevauche la tranche"),
+    ],
+)
+def test_band_errors(band, expected):
+    data = _data()
+    data["bareme"]["M"][band] = {str(p): "Bon" for p in range(7, 16)}
+    assert expected in _errors(data)
+
+
+def test_uncovered_ages():
+    data = _data()
+    del data["bareme"]["F"]["35-39"]
+    assert "bareme.F: ages non couverts a partir de [35]" in _errors(data)
+
+
+def test_palier_errors():
+    data = _data()
+    paliers = data["bareme"]["M"]["20-24"]
+    del paliers["12"]
+    paliers["16"] = "Bon"
+    paliers["9"] = "Super"
+    message = _errors(data)
+    assert "bareme.M.20-24: paliers manquants [12]" in message
+    assert "bareme.M.20-24.16: palier hors 7-15" in message
+    assert "bareme.M.20-24.9: libelle inconnu 'Super'" in message
+
+
+def test_niveaux_must_map_to_the_five_levels():
+    assert "niveaux.Top: 'Parfait' n'est pas un des niveaux" in _errors(_data(niveaux={"Top": "Parfait"}))
+
+
+@pytest.mark.parametrize("data", [[], "bareme", None])
+def test_top_level_must_be_a_table(data):
+    assert "table attendue" in _errors(data)
+
+
+def test_wrong_types_are_reported():
+    data = _data(version=["1"], niveaux=["Bon"])
+    paliers = data["bareme"]["F"]["15-19"]
+    paliers["8"] = ["Bon"]
+    paliers["x"] = "Bon"
+    message = _errors(data)
+    assert "champ 'version' : texte ou nombre attendu" in message
+    assert "niveaux : table libelle -> niveau attendue" in message
+    assert "bareme.F.15-19.8: libelle inconnu '['Bon']'" in message
+    assert "bareme.F.15-19: paliers illisibles ['x']" in message
+
+
+def test_store_reports_invalid_files_by_name(tmp_path):
+    (tmp_path / "liste.json").write_text("[1, 2]", encoding="utf-8")
+    (tmp_path / "casse.json").write_text("{", encoding="utf-8")
+    store = BaremeStore(str(tmp_path))
+    assert list(store.available()) == [BUILTIN.label]
+    assert sorted(store.errors) == ["casse.json", "liste.json"]
+    assert store.errors["liste.json"].startswith(str(tmp_path / "liste.json") + ": bareme invalide : table attendue")
+    assert store.errors["casse.json"].startswith(str(tmp_path / "casse.json") + ": fichier illisible")
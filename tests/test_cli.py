@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# tests/test_cli.py
+
+import pandas as pd
+import pytest
+
+from cbf_luc_leger.cli import OUTPUT_COLUMNS, evaluate, main
+from cbf_luc_leger.scoring import level_for
+
+HEADER = "nom,prenom,age,sexe,palier,date_saisie\n"
+# Cinq lignes invalides (age, sexe, palier) puis deux valides.
+REJECTED_FIRST = HEADER + "".join(f"X{i},Y,5,Q,99,2026-01-01\n" for i in range(5)) + (
+    "Dupont,Lina,22,F,10,2026-01-02\nMartin,Eric,41,M,12,2026-01-03\n"
+)
+
+
+def _read(path, fmt):
+    if fmt == "csv":
+        return pd.read_csv(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    import pyarrow as pa
+
+    return pa.ipc.open_file(path).read_all().to_pandas()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "arrow"])
+def test_first_chunk_entirely_rejected(tmp_path, fmt):
+    if fmt != "csv":
+        pytest.importorskip("pyarrow")
+    source = tmp_path / "resultats.csv"
+    source.write_text(REJECTED_FIRST, encoding="utf-8")
+    stats = evaluate(str(source), str(tmp_path / "out"), fmt=fmt, chunksize=5)
+    assert (stats["lignes"], stats["valides"], stats["rejetees"]) == (7, 2, 5)
+    table = _read(tmp_path / "out" / f"resultats.{'arrow' if fmt == 'arrow' else fmt}", fmt)
+    assert list(table.columns) == OUTPUT_COLUMNS
+    assert list(table["nom"]) == ["Dupont", "Martin"]
+
+
+VALID = HEADER + "Dupont,Lina,22,F,10,2026-01-02\nMartin,Eric,41,M,12,2026-01-03\n"
+
+
+def _run(tmp_path, text, *args):
+    source = tmp_path / "resultats.csv"
+    source.write_text(text, encoding="utf-8")
+    return main(["evaluate", str(source), "--out", str(tmp_path / "out"), *args])
+
+
+def test_all_valid_exits_0(tmp_path, capsys):
+    assert _run(tmp_path, VALID) == 0
+    assert capsys.readouterr().out.startswith("2 lignes lues, 2 valides, 0 rejetees en ")
+    table = pd.read_csv(tmp_path / "out" / "resultats.csv")
+    assert list(table["ligne"]) == [2, 3]
+    assert list(table["tranche"]) == ["20-24", "40-44"]
+    assert list(table["niveau"]) == [level_for("F", 22, 10), level_for("M", 41, 12)]
+    assert not (tmp_path / "out" / "rejets.csv").exists()
+
+
+def test_rejected_rows_exit_1_with_report(tmp_path, capsys):
+    assert _run(tmp_path, REJECTED_FIRST) == 1
+    assert capsys.readouterr().out.startswith("7 lignes lues, 2 valides, 5 rejetees en ")
+    rejets = pd.read_csv(tmp_path / "out" / "rejets.csv")
+    assert list(rejets["ligne"]) == [2, 3, 4, 5, 6]
+    assert rejets["erreur"][0] == "âge hors 15-60, palier hors 7-15, sexe différent de M/F"
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("nom,prenom,age,sexe\nA,B,20,M\n", "Colonnes manquantes: palier"),
+        (None, "No such file"),
+    ],
+)
+def test_unreadable_input_exits_2(tmp_path, capsys, text, message):
+    if text is None:
+        code = main(["evaluate", str(tmp_path / "absent.csv"), "--out", str(tmp_path / "out")])
+    else:
+        code = _run(tmp_path, text)
+    assert code == 2
+    err = capsys.readouterr().err
+    assert err.startswith("Erreur : ") and message in err
+
+
+def test_invalid_bareme_exits_2(tmp_path, capsys):
+    bareme = tmp_path / "vide.json"
+    bareme.write_text("{}", encoding="utf-8")
+    assert _run(tmp_path, VALID, "--bareme", str(bareme)) == 2
+    assert "bareme invalide" in capsys.readouterr().err
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# tests/test_columns.py
+
+import uuid
+
+import numpy as np
+import pytest
+
+from cbf_luc_leger.columns import StringPool, date_strings, uuid_bytes, uuid_key, uuid_string, uuid_strings
+from cbf_luc_leger.models import from_epoch, to_epoch
+
+
+def test_uuid_round_trip():
+    ids = [str(uuid.uuid4()) for _ in range(500)] + [str(uuid.UUID(int=0)), str(uuid.UUID(int=2**128 - 1))]
+    raw = uuid_bytes(np.array(ids, dtype=object))
+    assert [r.tobytes() for r in raw] == [uuid.UUID(i).bytes for i in ids]
+    assert list(uuid_strings(raw)) == ids
+    assert uuid_string(raw[3]) == ids[3]
+    assert uuid_key(raw).tolist() == [int.from_bytes(uuid.UUID(i).bytes[:8], "big") for i in ids]
+
+
+def test_other_uuid_forms_are_normalised():
+    u = uuid.uuid4()
+    forms = [str(u).upper(), u.hex, "{%s}" % u, f"urn:uuid:{u}"]
+    assert list(uuid_strings(uuid_bytes(forms))) == [str(u)] * len(forms)
+
+
+@pytest.mark.parametrize("bad", ["a1", "S36" * 12, str(uuid.UUID(int=7))[:-1] + "g", str(uuid.UUID(int=7)) + "0", "é" * 36, None])
+def test_non_uuid_ids_are_rejected(bad):
+    with pytest.raises(ValueError, match="identifiant de resultat invalide"):
+        uuid_bytes([str(uuid.UUID(int=1)), bad])
+
+
+def test_string_pool_codes_are_shared():
+    pool = StringPool()
+    codes = pool.encode(np.array(["Dupont", "Lina", "Dupont"], dtype=object))
+    assert codes.tolist() == [0, 1, 0] and pool.encode(np.array(["Lina"], dtype=object)).tolist() == [1]
+    assert list(pool.decode(codes)) == ["Dupont", "Lina", "Dupont"]
+    assert pool.code("Lina") == 1 and pool.code("Zoé") is None
+
+
+def test_date_strings_match_from_epoch():
+    epochs = np.array([to_epoch(d) for d in ("2026-09-15 18:30", "2025-01-01 00:00", "2026-09-15 18:30")], dtype=np.int64)
+    assert list(date_strings(epochs)) == [from_epoch(e) for e in epochs.tolist()]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# tests/test_dataset.py
+
+import threading
+import uuid
+
+import pandas as pd
+import pytest
+
+from cbf_luc_leger import Athlete, AthleteDataset, AthleteRepository
+
+# (nom, age, palier) : deux resultats hors bareme (60 ans) parmi des niveaux varies.
+ROWS = [("A", 22, 10), ("B", 60, 12), ("C", 22, 15), ("D", 22, 7), ("E", 60, 8), ("F", 15, 10)]
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    repo = AthleteRepository(str(tmp_path / "club.db"))
+    repo.add_many(
+        (str(uuid.UUID(int=i + 1)), nom, "X", f"2026-01-0{i + 1} 10:00", age, "M", palier)
+        for i, (nom, age, palier) in enumerate(ROWS)
+    )
+    return AthleteDataset(repo)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_unscored_rows_sort_last_both_ways(dataset, descending):
+    page, total = dataset.page(sort="niveau", descending=descending)
+    levels = list(page["niveau"])
+    assert total == len(ROWS)
+    assert levels[-2:] == ["-", "-"] and "-" not in levels[:-2]
+    scored = [dataset.frame().loc[i, "niveau"] for i in page.index[:-2]]
+    order = ["Insuffisant", "Moyen", "Bon", "Très Bon", "Excellent"]
+    ranks = [order.index(level) for level in scored]
+    assert ranks == sorted(ranks, reverse=descending)
+
+
+def test_unscored_last_within_a_selection(dataset):
+    ids = dataset.select("age:60")
+    page, total = dataset.page(ids=dataset.select("x"), sort="niveau", descending=False)
+    assert total == len(ROWS) and set(page.index[-2:]) == set(ids.tolist())
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("DataFrame complet reconstruit")
+
+
+def test_history_of_after_append_builds_only_the_tireur(dataset, monkeypatch):
+    dataset.append(Athlete(str(uuid.UUID(int=99)), "A", "X", "2026-02-01 10:00", 22, "M", 12))
+    monkeypatch.setattr(dataset, "_current_frame", _fail)
+    tireur = dataset.record(str(uuid.UUID(int=99)))["tireur_id"]
+    history = dataset.history_of(tireur)
+    assert list(history.index) == [0, len(ROWS)]
+    assert list(history["palier"]) == [10, 12]
+    assert history["delta_palier"].iloc[0] is pd.NA and history["delta_palier"].iloc[1] == 2
+    assert dataset.history_of("inconnu").empty
+
+
+def test_refresh_picks_up_rows_written_by_another_repository(dataset, tmp_path):
+    other = AthleteDataset(AthleteRepository(str(tmp_path / "club.db")))
+    other.append(Athlete(str(uuid.UUID(int=99)), "A", "X", "2026-02-01 10:00", 22, "F", 12))
+    version = dataset.version
+    assert dataset.refresh() == 1 and dataset.refresh() == 0
+    assert dataset.version == version + 1 and len(dataset) == len(ROWS) + 1
+    assert dataset.kpis() == other.kpis() == dataset.repository.kpis() == (len(ROWS) + 1, len(ROWS), 1, (sum(r[2] for r in ROWS) + 12) / (len(ROWS) + 1))
+    assert dataset.select("sexe:F").tolist() == [len(ROWS)]
+    page, _ = dataset.page(sort="date")
+    assert page.index[0] == len(ROWS)
+    tireur = dataset.record(str(uuid.UUID(int=99)))["tireur_id"]
+    assert list(dataset.history_of(tireur).index) == [len(ROWS)]
+
+
+def test_selection_lookups(dataset):
+    selected = str(uuid.UUID(int=3))
+    row = dataset.row_of(selected)
+    assert row == 2 and dataset.frame().loc[row, "id"] == selected
+    rec = dataset.record(selected)
+    assert (rec["nom"], rec["age"], rec["palier"], rec["date_saisie"]) == ("C", 22, 15, "2026-01-03 10:00")
+    assert dataset.analysis(selected).niveau == dataset.frame().loc[row, "niveau"]
+    centile, size = dataset.cohort(selected)
+    assert size == 3 and 0 <= centile <= 100
+    for unknown in (None, "", "pas-un-uuid", str(uuid.UUID(int=404))):
+        assert dataset.row_of(unknown) is None and dataset.record(unknown) is None
+        assert dataset.analysis(unknown) is None and dataset.cohort(unknown) is None
+
+
+def test_lookups_while_another_session_appends(dataset):
+    errors = []
+
+    def read():
+        try:
+            for _ in range(200):
+                assert dataset.record(str(uuid.UUID(int=1)))["nom"] == "A"
+                assert dataset.cohort(str(uuid.UUID(int=1))) is not None
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for t in readers:
+        t.start()
+    for i in range(50):
+        dataset.append(Athlete(str(uuid.UUID(int=1000 + i)), "G", "X", "2026-03-01 10:00", 30, "F", 9))
+    for t in readers:
+        t.join(timeout=30)
+    assert not any(t.is_alive() for t in readers) and errors == []
+    assert dataset.record(str(uuid.UUID(int=1049)))["nom"] == "G"
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# tests/test_export.py
+
+import io
+import os
+import tempfile
+import zipfile
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from cbf_luc_leger import export
+
+ROWS = [
+    {"nom": "Dupont", "prenom": "Lina", "date_saisie": "2026-01-02 10:00", "age": 22, "sexe": "F", "palier": 10, "id": "x"},
+    {"nom": "Le Gall", "prenom": "Marc", "date_saisie": "2026-01-03 18:30", "age": 35, "sexe": "M", "palier": 12, "id": "y"},
+    {"nom": "Martin", "prenom": "Zoé", "date_saisie": "2026-01-04 09:15", "age": 61, "sexe": "F", "palier": 6, "id": "z"},
+]
+
+
+def test_zip_has_one_fiche_per_row_in_order():
+    out, calls = io.BytesIO(), []
+    assert export.write_zip(ROWS, out, max_workers=1, progress=lambda done, n: calls.append((done, n))) == len(ROWS)
+    with zipfile.ZipFile(out) as zf:
+        assert zf.namelist() == [
+            "0001_fiche_luc_leger_Dupont_Lina_2026-01-02.pdf",
+            "0002_fiche_luc_leger_Le_Gall_Marc_2026-01-03.pdf",
+            "0003_fiche_luc_leger_Martin_Zoé_2026-01-04.pdf",
+        ]
+        for name, row in zip(zf.namelist(), ROWS):
+            pdf = zf.read(name)
+            assert pdf.startswith(b"%PDF") and pdf.rstrip().endswith(b"%%EOF")
+            assert len(pdf) == len(export.build_pdf_fiche(**export.fiche_fields(row)))
+    assert calls == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_export_file_returns_the_finished_archive(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    path = export.export_file(ROWS[:1], max_workers=1)
+    assert os.path.dirname(path) == str(tmp_path) and path.endswith(".zip")
+    with zipfile.ZipFile(path) as zf:
+        assert len(zf.namelist()) == 1
+
+
+@pytest.mark.parametrize("merged", [False, True])
+def test_failed_export_leaves_no_temp_file(monkeypatch, tmp_path, merged):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    def progress(done, n):
+        if done == 2:
+            raise RuntimeError("rendu interrompu")
+
+    with pytest.raises(RuntimeError):
+        export.export_file(ROWS, merged=merged, max_workers=1, progress=progress)
+    assert os.listdir(tmp_path) == []
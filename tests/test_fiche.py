@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# tests/test_fiche.py
+
+import base64
+import re
+import zlib
+from collections import Counter
+from io import BytesIO
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from PIL import Image
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from cbf_luc_leger import fiche
+from cbf_luc_leger.export import fiche_fields
+
+LOGO = "Logo Rond.png"
+ROW = {"nom": "Dupont", "prenom": "Lina", "date_saisie": "2026-01-02 10:00", "age": 22, "sexe": "F", "palier": 10}
+
+# Objets flux dont le dictionnaire n'en contient pas d'autre (cas des images).
+_STREAM = re.compile(rb"(\d+) 0 obj\s*<<((?:(?!>>).)*)>>\s*stream\r?\n", re.S)
+
+
+def _streams(pdf):
+    """Flux du PDF : (numero d'objet, dictionnaire, octets decodes)."""
+    for m in _STREAM.finditer(pdf):
+        head = m.group(2)
+        length = int(re.search(rb"/Length (\d+)", head).group(1))
+        data = pdf[m.end() : m.end() + length]
+        if b"/ASCII85Decode" in head:
+            data = base64.a85decode(data.strip().removesuffix(b"~>"))
+        yield int(m.group(1)), head, zlib.decompress(data) if b"/FlateDecode" in head else data
+
+
+def _images(pdf):
+    """Images du PDF : numero d'objet -> (dictionnaire, octets decodes)."""
+    return {num: (head, data) for num, head, data in _streams(pdf) if b"/Subtype /Image" in head}
+
+
+def _check_logo(pdf):
+    reader = ImageReader(LOGO)
+    width, height = reader.getSize()
+    images = _images(pdf)
+    (head, rgb), = [img for img in images.values() if b"/SMask" in img[0]]
+    assert re.search(rb"/Width %d\b" % width, head) and re.search(rb"/Height %d\b" % height, head)
+    assert rgb == reader.getRGBData()
+    smask = int(re.search(rb"/SMask (\d+) 0 R", head).group(1))
+    with Image.open(LOGO) as im:
+        assert images[smask][1] == im.getchannel("A").tobytes()
+    return images
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_header_logo_decodes_to_the_png(monkeypatch, fast):
+    monkeypatch.setattr(fiche, "_fast_logo", lambda: fast)
+    pdf = fiche.build_pdf_fiche(**fiche_fields(ROW, LOGO))
+    assert pdf.startswith(b"%PDF") and pdf.rstrip().endswith(b"%%EOF")
+    assert len(_check_logo(pdf)) == 2
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_header_written_once_per_document(monkeypatch, fast):
+    monkeypatch.setattr(fiche, "_fast_logo", lambda: fast)
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4)
+    for _ in range(3):
+        fiche.draw_fiche(c, **fiche_fields(ROW, LOGO))
+    c.save()
+    assert len(_check_logo(buf.getvalue())) == 2
+
+
+def test_fast_path_falls_back_to_draw_image(monkeypatch):
+    def changed_internals(c, logo):
+        raise AttributeError("_doc")
+
+    monkeypatch.setattr(fiche, "_fast_logo", lambda: True)
+    monkeypatch.setattr(fiche, "_register_logo", changed_internals)
+    pdf = fiche.build_pdf_fiche(**fiche_fields(ROW, LOGO))
+    assert len(_check_logo(pdf)) == 2
+
+
+def test_body_written_once_per_analysis():
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4)
+    for _ in range(3):
+        fiche.draw_fiche(c, **fiche_fields(ROW, LOGO))
+    # Meme niveau (meme analyse), autres mesures : le corps est partage.
+    fiche.draw_fiche(c, **fiche_fields({**ROW, "palier": 11}, LOGO))
+    fiche.draw_fiche(c, **fiche_fields({**ROW, "palier": 7}, LOGO))
+    c.save()
+    pdf = buf.getvalue()
+    calls = Counter(name for _, _, data in _streams(pdf) for name in re.findall(rb"/FormXob\.(corps_\w+) Do", data))
+    # Chaque page de corps ("corps_<empreinte>_<page>") : 4 appels pour Excellent, 1 pour Moyen.
+    assert len({name.rsplit(b"_", 1)[0] for name in calls}) == 2 and set(calls.values()) == {1, 4}
+    assert pdf.count(b"/Subtype /Form") == 1 + len(calls)
+
+
+def test_missing_logo_renders_without_image(tmp_path):
+    pdf = fiche.build_pdf_fiche(**fiche_fields(ROW, str(tmp_path / "absent.png")))
+    assert _images(pdf) == {}
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# tests/test_importer.py
+
+from io import BytesIO
+
+import pytest
+
+from cbf_luc_leger.importer import ImportReport, read_chunks, validate_chunk
+
+
+def _validate(text, chunksize=1000):
+    report = ImportReport()
+    valid = [validate_chunk(chunk, line, report) for line, chunk in read_chunks(BytesIO(text.encode("utf-8")), "x.csv", chunksize)]
+    return valid, report
+
+
+def test_rejection_rules_and_line_numbers():
+    text = (
+        "Nom;Prénom;Âge;Sexe;Palier;Date de saisie\n"
+        "Dupont;Lina;17;f;10;2026-09-15 18:30\n"  # 2 : valide (sexe en minuscule)
+        "Dupont;;17;F;10;\n"  # 3 : prenom manquant
+        "Martin;Eric;14;M;10;\n"  # 4 : age trop bas
+        "Martin;Eric;22.5;M;10;\n"  # 5 : age non entier
+        "Martin;Eric;22;M;16;\n"  # 6 : palier trop haut
+        "Martin;Eric;22;X;abc;\n"  # 7 : sexe et palier
+        "Martin;Eric;22;M;10;demain\n"  # 8 : date illisible
+        "Martin;Eric;60;M;7;15/09/2026 18:30\n"  # 9 : valide (bornes, date francaise)
+    )
+    (valid,), report = _validate(text)
+    assert list(valid.index) == [2, 9]
+    assert list(valid["sexe"]) == ["F", "M"]
+    assert list(valid["date_saisie"]) == ["2026-09-15 18:30", "2026-09-15 18:30"]
+    assert report.rejected == 6
+    assert report.errors == [
+        (3, "prénom manquant"),
+        (4, "âge hors 15-60"),
+        (5, "âge hors 15-60"),
+        (6, "palier hors 7-15"),
+        (7, "palier hors 7-15, sexe différent de M/F"),
+        (8, "date de saisie illisible"),
+    ]
+
+
+def test_line_numbers_follow_the_chunks():
+    text = "nom,prenom,age,sexe,palier\n" + "A,B,20,M,10\n" * 3 + "A,,20,M,10\n"
+    valid, report = _validate(text, chunksize=2)
+    assert [list(v.index) for v in valid] == [[2, 3], [4]]
+    assert report.errors == [(5, "prénom manquant")]
+
+
+def test_missing_columns_are_refused():
+    with pytest.raises(ValueError, match="palier"):
+        _validate("nom,prenom,age,sexe\nA,B,20,M\n")
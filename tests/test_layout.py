@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# tests/test_layout.py
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from cbf_luc_leger.analyse import report_matrix
+from cbf_luc_leger.layout import wrap_lines
+
+
+def _wrap(text, font, size, max_width):
+    """Coupure d'origine : largeur de chaque ligne candidate mesuree en entier, sans memoire."""
+    lines, line = [], ""
+    for w in text.split():
+        test = (line + " " + w).strip()
+        if stringWidth(test, font, size) <= max_width or not line:
+            line = test
+        else:
+            lines.append(line)
+            line = w
+    if line:
+        lines.append(line)
+    return tuple(lines)
+
+
+def _texts():
+    texts = set()
+    for a in report_matrix()._analyses:
+        texts.update(a.interpretation.values())
+        texts.update(a.age_note.values())
+        texts.update(str(row.get("Detail", "")) for row in a.travail)
+    return sorted(texts)
+
+
+@pytest.mark.parametrize("max_width", [60, 150, 300, 498.9])
+def test_memoized_wrap_matches_full_line_widths(max_width):
+    for text in _texts():
+        assert wrap_lines(text, "Helvetica", 10, max_width) == _wrap(text, "Helvetica", 10, max_width), text
+
+
+def test_long_word_takes_its_own_line():
+    word = "anticonstitutionnellement"
+    assert wrap_lines(f"un {word} mot", "Helvetica", 10, 40) == ("un", word, "mot")
+    assert wrap_lines("", "Helvetica", 10, 40) == ()
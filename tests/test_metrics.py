@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# tests/test_metrics.py
+
+import json
+
+from cbf_luc_leger.metrics import Histogram, MetricsExporter, MetricsRegistry, RerunProfile
+
+
+def test_histogram_window_and_quantiles():
+    hist = Histogram(window=4)
+    for s in (5.0, 1.0, 2.0, 3.0, 4.0):
+        hist.observe(s)
+    assert list(hist.samples) == [1.0, 2.0, 3.0, 4.0]
+    assert (hist.count, hist.total) == (5, 15.0)
+    assert (hist.quantile(0.5), hist.quantile(0.99)) == (3.0, 4.0)
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_profile_records_phases_into_the_registry():
+    registry = MetricsRegistry()
+    profile = RerunProfile(registry)
+    with profile.phase("search") as p:
+        p.rows = 12
+    profile.record("page", 0.25, 50)
+    profile.finish()
+    assert [(name, rows) for name, _, rows in profile.phases] == [("search", 12), ("page", 50), ("rerun", None)]
+    snap = registry.snapshot()
+    assert list(snap) == ["page", "rerun", "search"]
+    assert snap["page"] == {"count": 1, "sum": 0.25, "max": 0.25, "p50": 0.25, "p95": 0.25, "p99": 0.25}
+    fragment = profile.scope()
+    assert fragment is not profile and fragment.registry is registry and not fragment.finished
+
+
+def test_disabled_profile_records_nothing():
+    registry = MetricsRegistry()
+    profile = RerunProfile(registry, enabled=False)
+    with profile.phase("search") as p:
+        p.rows = 3
+    profile.finish()
+    assert profile.phases == [] and registry.snapshot() == {} and p.rows is None
+
+
+def test_write_json_and_prometheus(tmp_path):
+    registry = MetricsRegistry()
+    registry.observe("search", 0.5)
+    registry.write(str(tmp_path / "m.json"))
+    registry.write(str(tmp_path / "m.prom"))
+    assert json.loads((tmp_path / "m.json").read_text())["phases"]["search"]["count"] == 1
+    prom = (tmp_path / "m.prom").read_text().splitlines()
+    assert 'cbf_phase_seconds{phase="search",quantile="0.95"} 0.500000' in prom
+    assert 'cbf_phase_seconds_count{phase="search"} 1' in prom
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["m.json", "m.prom"]
+
+
+def test_exporter_writes_at_most_once_per_interval(tmp_path):
+    exporter = MetricsExporter(MetricsRegistry(), str(tmp_path / "m.json"), interval=3600)
+    assert exporter.maybe_write() and not exporter.maybe_write()
+    assert not MetricsExporter(MetricsRegistry(), str(tmp_path / "absent" / "m.json")).maybe_write()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# tests/test_pdfcache.py
+
+import os
+
+from cbf_luc_leger.pdfcache import FicheCache, fiche_key
+
+FIELDS = {"nom": "Dupont", "prenom": "Lina", "age": 22, "sexe": "F", "palier": 10}
+
+
+def test_key_changes_with_logo_mtime(tmp_path):
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"png")
+    os.utime(logo, ns=(1_000_000_000, 1_000_000_000))
+    fields = {**FIELDS, "logo_path": str(logo)}
+    before = fiche_key(fields)
+    assert fiche_key(dict(fields)) == before
+
+    os.utime(logo, ns=(2_000_000_000, 2_000_000_000))
+    after = fiche_key(fields)
+    assert after != before
+
+    logo.unlink()
+    assert fiche_key(fields) not in (before, after)
+
+
+def test_key_ignores_blocks_but_not_fields():
+    key = fiche_key({**FIELDS, "logo_path": None})
+    assert fiche_key({**FIELDS, "logo_path": None, "blocks": ("deja", "coupes")}) == key
+    assert fiche_key({**FIELDS, "logo_path": None, "palier": 11}) != key
+
+
+def test_stale_fiche_is_not_served_after_logo_change(tmp_path):
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"png")
+    os.utime(logo, ns=(1_000_000_000, 1_000_000_000))
+    fields = {**FIELDS, "logo_path": str(logo)}
+    cache = FicheCache(str(tmp_path / "fiches"))
+    assert cache.get_or_render(lambda **f: b"v1", **fields) == b"v1"
+
+    os.utime(logo, ns=(2_000_000_000, 2_000_000_000))
+    assert cache.get_or_render(lambda **f: b"v2", **fields) == b"v2"
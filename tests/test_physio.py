@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# tests/test_physio.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cbf_luc_leger.physio import METRIC_COLUMNS, add_metrics, mesures_for, metrics_arrays
+
+
+def test_stage_speed_follows_the_protocol():
+    # 8,5 km/h au palier 1, +0,5 km/h par palier.
+    assert [mesures_for(22, p).vitesse for p in (1, 7, 10, 15)] == [8.5, 11.5, 13.0, 15.5]
+
+
+def test_adult_equation():
+    # VO2max = -24,4 + 6,0 x V (V = 13 km/h au palier 10).
+    m = mesures_for(22, 10)
+    assert m.vo2max == pytest.approx(-24.4 + 6.0 * 13.0)
+    assert m.vma == round(53.6 / 3.5, 1) == 15.3
+    assert m.allures == {"30/30": 15.3, "15/15": 16.8}
+    # 15,3 km/h pendant 30 s = 127,5 m, arrondi a 5 m.
+    assert (m.distance("30/30"), m.distance("15/15")) == (130, 70)
+
+
+def test_young_equation_below_18():
+    # VO2max = 31,025 + 3,238 V - 3,248 A + 0,1536 A V (A = 12 ans, V = 10,5 km/h).
+    expected = 31.025 + 3.238 * 10.5 - 3.248 * 12 + 0.1536 * 12 * 10.5
+    assert mesures_for(12, 5).vo2max == round(expected, 1) == 45.4
+    assert mesures_for(17, 7).vo2max == 43.1 and mesures_for(18, 7).vo2max == 44.6
+
+
+def test_vectorized_columns_match_scalar():
+    ages, paliers = np.meshgrid(np.arange(10, 61), np.arange(1, 16))
+    ages, paliers = ages.ravel(), paliers.ravel()
+    arrays = metrics_arrays(ages, paliers)
+    assert list(arrays) == METRIC_COLUMNS
+    for i, (age, palier) in enumerate(zip(ages.tolist(), paliers.tolist())):
+        m = mesures_for(age, palier)
+        expected = [m.vitesse, m.vo2max, m.vma, m.allures["30/30"], m.allures["15/15"]]
+        assert [arrays[name][i] for name in METRIC_COLUMNS] == expected
+
+
+def test_add_metrics_keeps_the_frame():
+    frame = pd.DataFrame({"age": [22, 12], "palier": [10, 5]})
+    out = add_metrics(frame)
+    assert list(frame.columns) == ["age", "palier"]
+    assert out["vo2max"].tolist() == [53.6, 45.4]
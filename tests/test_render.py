@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# tests/test_render.py
+
+import threading
+import time
+
+import pytest
+
+from cbf_luc_leger.pdfcache import FicheCache, fiche_key
+from cbf_luc_leger.render import DONE, FAILED, RenderService
+
+FIELDS = {"nom": "Dupont", "prenom": "Lina", "age": 22, "sexe": "F", "palier": 10}
+
+
+class Gate:
+    """Rendu factice bloque jusqu'a `release()`, compte ses appels."""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self._open = threading.Event()
+
+    def release(self):
+        self._open.set()
+
+    def __call__(self, **fields):
+        self.calls += 1
+        assert self._open.wait(10)
+        if self.error:
+            raise self.error
+        return repr(sorted(fields.items())).encode()
+
+
+def _drained(service, timeout=10):
+    """Attend que le rappel de fin ait retire les rendus de la table en vol."""
+    deadline = time.monotonic() + timeout
+    while service.in_flight() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return service.in_flight() == 0
+
+
+@pytest.fixture
+def gate():
+    return Gate()
+
+
+def test_identical_requests_share_one_render(gate, tmp_path):
+    cache = FicheCache(str(tmp_path))
+    service = RenderService(cache, max_workers=2, render=gate)
+    try:
+        jobs = [service.submit(**FIELDS) for _ in range(5)]
+        assert all(job is jobs[0] for job in jobs) and service.find(**FIELDS) is jobs[0]
+        assert service.in_flight() == 1 and not jobs[0].done()
+        other = service.submit(**{**FIELDS, "palier": 11})
+        assert other is not jobs[0] and service.in_flight() == 2
+        gate.release()
+        pdf = jobs[0].result(10)
+        assert other.result(10) != pdf and gate.calls == 2
+        assert jobs[0].wait(10) and jobs[0].status == DONE and jobs[0].error is None
+    finally:
+        service.shutdown()
+    assert service.in_flight() == 0
+    assert cache.get(fiche_key(FIELDS)) == pdf
+    # Deja en cache : servie sans nouveau rendu.
+    again = RenderService(cache, render=gate)
+    try:
+        assert again.submit(**FIELDS).result(10) == pdf and gate.calls == 2
+    finally:
+        again.shutdown()
+
+
+def test_failed_render_is_reported_and_retried(tmp_path):
+    gate = Gate(ValueError("logo illisible"))
+    cache = FicheCache(str(tmp_path))
+    service = RenderService(cache, render=gate)
+    try:
+        job = service.submit(**FIELDS)
+        assert service.submit(**FIELDS) is job
+        gate.release()
+        assert job.wait(10) and job.status == FAILED
+        assert isinstance(job.error, ValueError)
+        with pytest.raises(ValueError, match="logo illisible"):
+            job.result(10)
+        assert gate.calls == 1 and cache.get(fiche_key(FIELDS)) is None
+        # L'echec n'est pas retenu : une nouvelle demande relance le rendu.
+        gate.error = None
+        assert _drained(service)
+        retry = service.submit(**FIELDS)
+        assert retry is not job and retry.result(10) and gate.calls == 2
+    finally:
+        service.shutdown()
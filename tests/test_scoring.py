@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# tests/test_scoring.py
+
+import itertools
+
+import numpy as np
+
+from cbf_luc_leger.scoring import LEVEL5_ORDER, level_codes, level_for, level_raw, levels_for, to_level5
+
+# Au-dela des bornes du bareme pour verifier le bornage (age et palier).
+CASES = list(itertools.product(("M", "F"), range(10, 71), range(4, 19)))
+
+
+def test_dense_table_matches_the_bareme_lookup():
+    expected = [to_level5(level_raw(sex, age, palier)) for sex, age, palier in CASES]
+    assert [level_for(*case) for case in CASES] == expected
+    sexes, ages, paliers = (np.array(col) for col in zip(*CASES))
+    assert list(levels_for(sexes, ages, paliers)) == expected
+    assert [LEVEL5_ORDER[c] for c in level_codes(sexes, ages, paliers)] == expected
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# tests/test_search.py
+
+import numpy as np
+import pytest
+
+from cbf_luc_leger.columns import StringPool
+from cbf_luc_leger.search import SearchIndex
+
+# (nom, prenom, age, sexe, palier)
+ROWS = [
+    ("Martin", "Lina", 22, "F", 12),
+    ("Dupont", "Marc", 30, "M", 9),
+    ("Le Marchand", "Éloïse", 17, "F", 14),
+    ("Martinez", "Jean Paul", 45, "M", 12),
+    ("Dupont", "Marc", 31, "M", 10),
+    ("Smart", "Ana", 22, "F", 8),
+]
+
+
+def _index(batches):
+    pool, index = StringPool(), SearchIndex()
+    for lo, hi in batches:
+        cols = [np.array([row[i] for row in ROWS[lo:hi]], dtype=object) for i in range(5)]
+        index.add_many(pool.encode(cols[0]), pool.encode(cols[1]), cols[2].astype(int), cols[3], cols[4].astype(int), pool)
+    return index
+
+
+@pytest.fixture(params=[[(0, 6)], [(0, 2), (2, 2), (2, 5), (5, 6)]], ids=["one_batch", "batches"])
+def index(request):
+    return _index(request.param)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("mar", [0, 1, 2, 3, 4, 5]),
+        ("arti", [0, 3]),
+        ("eloise", [2]),
+        ("ÉLOÏSE", [2]),
+        ("l", [0, 2, 3]),
+        ("nom:mar", [0, 2, 3]),
+        ("prenom:pa", [3]),
+        ("nom:art", []),
+        ("palier>=12 sexe:F", [0, 2]),
+        ("age<25 palier<=8", [5]),
+        ("dupont 31", [4]),
+        ("zzz", []),
+    ],
+)
+def test_queries(index, query, expected):
+    ids = index.search(query)
+    assert ids.dtype == np.int64 and ids.tolist() == expected
+
+
+def test_empty_query_returns_every_row(index):
+    assert len(index) == len(ROWS) and index.search("  ").tolist() == list(range(len(ROWS)))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# tests/test_storage.py
+
+import sqlite3
+import uuid
+
+from cbf_luc_leger import AthleteDataset
+from cbf_luc_leger.models import to_epoch
+from cbf_luc_leger.storage import AthleteRepository, tireur_key
+
+# Schema des bases creees avant l'historique (une table, sans tireur_id ni date_test).
+_BASELINE_SCHEMA = """
+CREATE TABLE athletes (
+    id TEXT PRIMARY KEY,
+    nom TEXT NOT NULL,
+    prenom TEXT NOT NULL,
+    date_saisie TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    sexe TEXT NOT NULL,
+    palier INTEGER NOT NULL
+);
+"""
+
+BASELINE_ROWS = [
+    (str(uuid.UUID(int=1)), "Lefèvre", "Éloïse", "2025-09-15 18:30", 17, "F", 9),
+    (str(uuid.UUID(int=2)), "LEFEVRE", "eloise ", "2026-03-02 18:45", 17, "F", 10),
+    (str(uuid.UUID(int=3)), "Martin", "Eric", "2025-09-15 18:40", 22, "M", 11),
+]
+
+
+def _baseline_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(_BASELINE_SCHEMA)
+    conn.executemany("INSERT INTO athletes VALUES (?, ?, ?, ?, ?, ?, ?)", BASELINE_ROWS)
+    conn.commit()
+    conn.close()
+
+
+def _rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT id, tireur_id, date_test FROM athletes ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+
+
+def test_baseline_database_gets_tireurs_and_dates(tmp_path):
+    path = str(tmp_path / "club.db")
+    _baseline_db(path)
+    repo = AthleteRepository(path)
+
+    rows = _rows(path)
+    assert [date_test for _, _, date_test in rows] == [to_epoch(r[3]) for r in BASELINE_ROWS]
+    # Meme personne malgre les accents, la casse et les espaces ; un tireur par personne.
+    assert rows[0][1] == rows[1][1] != rows[2][1]
+    conn = sqlite3.connect(path)
+    tireurs = dict(conn.execute("SELECT cle, tireur_id FROM tireurs").fetchall())
+    conn.close()
+    assert tireurs == {tireur_key("Lefèvre", "Éloïse", "F"): rows[0][1], tireur_key("Martin", "Eric", "M"): rows[2][1]}
+
+    # Un nouveau resultat de la meme personne rejoint le tireur migre.
+    repo.add_many([(str(uuid.UUID(int=4)), "lefevre", "Eloise", "2026-09-01 18:00", 18, "F", 11)])
+    assert _rows(path)[-1][1] == rows[0][1]
+
+
+def test_migration_runs_once(tmp_path):
+    path = str(tmp_path / "club.db")
+    _baseline_db(path)
+    AthleteRepository(path)
+    first = _rows(path)
+    AthleteRepository(path)
+    assert _rows(path) == first
+
+
+def test_migrated_database_loads_into_the_dataset(tmp_path):
+    path = str(tmp_path / "club.db")
+    _baseline_db(path)
+    dataset = AthleteDataset(AthleteRepository(path))
+    first = dataset.record(BASELINE_ROWS[0][0])
+    assert first["nom"] == "Lefèvre" and first["date_test"] == to_epoch(BASELINE_ROWS[0][3])
+    history = dataset.history_of(first["tireur_id"])
+    assert list(history["id"]) == [r[0] for r in BASELINE_ROWS[:2]] and list(history["delta_palier"])[1] == 1
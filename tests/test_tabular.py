@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# tests/test_tabular.py
+
+import io
+
+import pandas as pd
+import pytest
+
+from cbf_luc_leger.tabular import TableWriter, arrow_schema
+
+COLUMNS = ["nom", "age", "sexe", "palier", "niveau", "vma"]
+
+
+def _chunk(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+# Premier bloc entierement rejete (vide), puis des blocs aux valeurs de categories differentes.
+CHUNKS = [
+    _chunk([]),
+    _chunk([("Dupont", 22, "F", 10, "Excellent", 15.3)]),
+    _chunk([("Martin", 41, "M", 8, "Moyen", 11.1)]),
+]
+
+
+def test_csv_header_written_once_after_empty_first_chunk():
+    buf = io.BytesIO()
+    with TableWriter(buf, "csv", columns=COLUMNS) as writer:
+        for chunk in CHUNKS:
+            writer.write(chunk)
+    lines = buf.getvalue().decode("utf-8").splitlines()
+    assert lines == ["nom,age,sexe,palier,niveau,vma", "Dupont,22,F,10,Excellent,15.3", "Martin,41,M,8,Moyen,11.1"]
+    assert writer.rows == 2
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_typed_formats_use_declared_schema_after_empty_first_chunk(fmt):
+    pa = pytest.importorskip("pyarrow")
+    buf = io.BytesIO()
+    with TableWriter(buf, fmt, columns=COLUMNS) as writer:
+        for chunk in CHUNKS:
+            writer.write(chunk)
+    buf.seek(0)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(buf)
+    else:
+        table = pa.ipc.open_file(buf).read_all()
+    assert table.schema.equals(arrow_schema(COLUMNS))
+    assert table.column("nom").to_pylist() == ["Dupont", "Martin"]
+    assert table.column("sexe").to_pylist() == ["F", "M"]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_no_rows_still_writes_a_readable_file(fmt):
+    if fmt != "csv":
+        pytest.importorskip("pyarrow")
+    buf = io.BytesIO()
+    with TableWriter(buf, fmt, columns=COLUMNS):
+        pass
+    buf.seek(0)
+    frame = pd.read_csv(buf) if fmt == "csv" else pd.read_parquet(buf)
+    assert list(frame.columns) == COLUMNS and frame.empty
+
+
+def test_unknown_column_is_rejected_for_typed_formats():
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        TableWriter(io.BytesIO(), "parquet", columns=["nom", "inconnue"])